@@ -13,6 +13,7 @@ from airflow.utils.session import provide_session
 from docker.types import Mount
 
 from instagram_brand_factory import load_brand_configs
+from utils import db as util
 
 
 def build_brand_etl_deps() -> list[tuple[str, str, tuple[int, int]]]:
@@ -87,6 +88,26 @@ def _latest_dagrun_state(dag_id: str, session=None) -> str | None:
     return dag_run.state if dag_run else None
 
 
+def build_consolidated_load_plan(logical_date, data_dir: str) -> dict[tuple[str, str, str], list[tuple[str, str]]]:
+    """
+    이번 transform 실행이 적재할 브랜드 파일을 (schema, table, KST 날짜)별로 묶어 반환합니다.
+    값은 [(brand_key, 파일 경로)]이고 브랜드 스케줄 순서라, 여러 브랜드에 같은 게시물이 있으면
+    브랜드별 순차 적재 때처럼 먼저 도는 브랜드로 INSERT 됩니다.
+    """
+    plan: dict[tuple[str, str, str], list[tuple[str, str]]] = {}
+    configs = sorted(
+        (config for config in load_brand_configs().values() if config.enabled),
+        key=lambda config: (config.utc_schedule, config.brand_key),
+    )
+    for config in configs:
+        # 센서가 기다린 브랜드 실행과 같은 logical_date → 브랜드 DAG의 get_date_window와 같은 KST 날짜
+        brand_logical = match_utc_time(*config.utc_schedule)(logical_date)
+        day           = brand_logical.in_timezone("Asia/Seoul").strftime("%Y-%m-%d")
+        file_path     = util.get_day_file_path(data_dir, config.brand_key, day)
+        plan.setdefault((config.schema, config.table, day), []).append((config.brand_key, file_path))
+    return plan
+
+
 DUCKDB_ENV = {
     "DUCKDB_PATH": os.getenv("DUCKDB_PATH", "/data/insta_pipeline.duckdb"),
 }
@@ -125,7 +146,7 @@ with DAG(
     def gate_for_manual():
         """
         수동 실행(manual trigger)일 때는 모든 브랜드가 이미 성공 상태면
-        센서 대기를 건너뛰고 바로 dbt_run으로 분기합니다.
+        센서 대기를 건너뛰고 바로 load_all_brands → dbt_run으로 분기합니다.
         스케줄 실행이거나 아직 성공하지 않은 브랜드가 있으면 센서 대기로 이동합니다.
         """
         from airflow.operators.python import get_current_context
@@ -142,7 +163,56 @@ with DAG(
             if state != "success":
                 return [sensor.task_id for sensor in wait_sensors]
 
-        return "dbt_run"
+        return "load_all_brands"
+
+    # 통합 적재 모드에서는 브랜드 하나가 실패해도 나머지 브랜드 파일은 적재하도록 센서가 끝나기만 기다림
+    @task(
+        task_id="load_all_brands",
+        trigger_rule="all_done" if util.CONSOLIDATED_LOAD else "none_failed_min_one_success",
+        execution_timeout=timedelta(minutes=30),
+    )
+    def load_all_brands():
+        """
+        CONSOLIDATED_LOAD=true일 때 모든 브랜드의 하루치 Parquet를 날짜마다 한 번에 읽어
+        함께 검증하고 MERGE 한 번으로 적재합니다. 검증에 걸린 브랜드 파일만 빠지고 나머지는 적재된 뒤,
+        실패한 브랜드 파일을 모아 태스크를 실패시킵니다 (dbt는 돌지 않음).
+        """
+        from airflow.models import Variable
+        from airflow.operators.python import get_current_context
+
+        if not util.CONSOLIDATED_LOAD:
+            print("CONSOLIDATED_LOAD=false → 브랜드 DAG가 각자 적재했으므로 건너뜁니다.")
+            return
+
+        context  = get_current_context()
+        data_dir = Variable.get("data_dir", "/tmp/")
+        plan     = build_consolidated_load_plan(context["logical_date"], data_dir)
+        failures = []
+
+        conn = util.get_conn()
+        try:
+            for (schema, table, day), brand_files in plan.items():
+                brand_of = {file_path: brand_key for brand_key, file_path in brand_files}
+                try:
+                    conn.execute("BEGIN;")
+                    loaded, failed = util.merge_posts_day(conn, schema, table, list(brand_of))
+                    conn.execute("COMMIT;")
+                except Exception as exc:
+                    conn.execute("ROLLBACK;")
+                    print(f"[LOAD 실패] {schema}.{table} {day} 전체: {exc}")
+                    failures.extend(f"{brand_key}({day}): {exc}" for brand_key in brand_of.values())
+                    continue
+
+                for file_path, row_count in loaded.items():
+                    print(f"[LOAD 완료] {schema}.{table} ← {brand_of[file_path]} {file_path} ({row_count}행)")
+                for file_path, reason in failed.items():
+                    print(f"[LOAD 실패] {brand_of[file_path]} {file_path}: {reason}")
+                    failures.append(f"{brand_of[file_path]}({day}): {reason}")
+        finally:
+            conn.close()
+
+        if failures:
+            raise ValueError("적재하지 못한 브랜드 파일이 있습니다:\n  " + "\n  ".join(failures))
 
     host_project_root = os.getenv("HOST_PROJECT_ROOT", "/Users/jeehun/Desktop/insta_pipeline")
 
@@ -184,7 +254,9 @@ with DAG(
     end = EmptyOperator(task_id="end")
     gate = gate_for_manual()
 
+    load_all = load_all_brands()
+
     start >> start_marker() >> gate
-    gate >> wait_sensors >> dbt_run
-    gate >> dbt_run
-    dbt_run >> dbt_test >> end
+    gate >> wait_sensors >> load_all
+    gate >> load_all
+    load_all >> dbt_run >> dbt_test >> end
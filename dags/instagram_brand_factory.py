@@ -1,10 +1,11 @@
 from __future__ import annotations
 
+import os
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from pathlib import Path
 
-import pandas as pd
+import duckdb
 from airflow import DAG
 from airflow.decorators import task
 from airflow.models import Variable
@@ -16,7 +17,7 @@ from utils import db as util
 # 브랜드 설정 파일 경로 (dags/ 기준으로 한 단계 위 → 프로젝트 루트/configs/brands.yaml)
 CONFIG_PATH = Path(__file__).resolve().parents[1] / "configs" / "brands.yaml"
 
-# 인스타그램 수집 데이터의 컬럼 순서 (CSV 저장 및 DataFrame 생성 시 기준)
+# 인스타그램 수집 데이터의 컬럼 순서 (스크래퍼 튜플·하루치 Parquet 파일 기준, 타입은 util.POST_FILE_SCHEMA)
 POST_COLUMNS = [
     "post_id",
     "insta_id",
@@ -90,13 +91,19 @@ def load_brand_records(config_path: Path) -> list[dict[str, object]]:
 
 @dataclass(frozen=True)
 class BrandDagConfig:
-    brand_key:    str
-    instagram_id: str
-    dag_id:       str
-    schedule:     str
-    enabled:      bool
-    schema:       str = "RAW_DATA"
-    table:        str = "INSTAGRAM_POSTS"
+    brand_key:         str
+    instagram_id:      str
+    dag_id:            str
+    schedule:          str
+    enabled:           bool
+    schema:            str = "RAW_DATA"
+    table:             str = "INSTAGRAM_POSTS"
+    detail_tabs:       int = 1
+    harvest_network:   bool = False
+    http_detail:       bool = False
+    known_stop_streak: int = 0
+    resource_policy:   str | None = None
+    extract_workers:   int = 0
 
     @property
     def utc_schedule(self) -> tuple[int, int]:
@@ -125,12 +132,41 @@ def load_brand_configs(config_path: Path = CONFIG_PATH) -> dict[str, BrandDagCon
             enabled=bool(item.get("enabled", True)),
             schema=item.get("schema", "RAW_DATA"),
             table=item.get("table", "INSTAGRAM_POSTS"),
+            detail_tabs=int(item.get("detail_tabs", 1)),
+            harvest_network=bool(item.get("harvest_network", False)),
+            http_detail=bool(item.get("http_detail", False)),
+            known_stop_streak=int(item.get("known_stop_streak", 0)),
+            resource_policy=item.get("resource_policy"),
+            extract_workers=int(item.get("extract_workers", 0)),
         )
         configs[config.brand_key] = config
 
     return configs
 
 
+# ──────────────────────────────────────────
+# 수집 기간
+# ──────────────────────────────────────────
+
+def get_date_window(context) -> tuple[str, str]:
+    """
+    이번 실행의 수집 기간 (date_from, date_to)을 KST 'YYYY-MM-DD'로 반환합니다.
+
+    기본은 logical_date(KST) 하루입니다. 백필할 때는 dag_run.conf로 기간을 넘기면
+    한 번의 스크롤로 여러 날짜를 모으고, 파일은 날짜별로 따로 저장합니다.
+      예) airflow dags trigger <dag_id> --conf '{"date_from": "2026-03-01", "date_to": "2026-03-07"}'
+    """
+    logical_day = context["logical_date"].in_timezone("Asia/Seoul").strftime("%Y-%m-%d")
+    dag_run     = context.get("dag_run")
+    conf        = (dag_run.conf if dag_run else None) or {}
+
+    date_from = conf.get("date_from") or logical_day
+    date_to   = conf.get("date_to") or date_from
+    if date_from > date_to:
+        raise ValueError(f"date_from({date_from})이 date_to({date_to})보다 늦습니다")
+    return date_from, date_to
+
+
 # ──────────────────────────────────────────
 # DAG 생성 팩토리
 # ──────────────────────────────────────────
@@ -164,152 +200,190 @@ def create_instagram_brand_dag(config: BrandDagConfig) -> DAG | None:
         print("END   KST        :", data_interval_end.in_timezone("Asia/Seoul"))
         print("DATE_TO_PROCESS  :", logical_date_kst.strftime("%Y-%m-%d"))
 
-    # ── 태스크 2: 인스타그램 데이터 수집 → CSV 저장 ──────────────
+    # ── 태스크 2: 인스타그램 데이터 수집 → Parquet 저장 ──────────
 
     @task(
         task_id="extract_instagram_data",
         pool="instagram_extract_pool",
-        pool_slots=1,
+        pool_slots=max(1, config.extract_workers),  # 병렬 수집은 워커 프로세스 수만큼 슬롯 사용
         execution_timeout=timedelta(minutes=40),
+        retries=1,
+        retry_delay=timedelta(minutes=3),
     )
-    def extract_instagram_data(debug: bool = True) -> str:
+    def extract_instagram_data(debug: bool = True) -> list[str]:
+        from extractors.checkpoint import ScrapeCheckpoint
         from extractors.instagram_scraper import run
+        from extractors.parallel_extract import run_parallel
+        from extractors.work_queue import WorkQueue
 
-        context          = get_current_context()
-        logical_date_kst = context["logical_date"].in_timezone("Asia/Seoul")
-        date_to_process  = logical_date_kst.strftime("%Y-%m-%d")
+        context            = get_current_context()
+        date_from, date_to = get_date_window(context)
 
         if debug:
-            print(f"수집 대상 날짜: {date_to_process}")
+            print(f"수집 대상 날짜: {date_from}" + (f" ~ {date_to}" if date_to != date_from else ""))
 
-        posts = run(
-            brand_id=config.instagram_id,
-            brand_name=config.brand_key,
-            headless=True,
-            target_day=date_to_process,
+        # 이미 적재된 이전 날짜 게시물은 상세 페이지를 다시 열지 않도록 미리 조회
+        # (읽기 전용 + 최선 노력: 적재·dbt가 파일을 잡고 있으면 기다리지 않고 조회 없이 수집)
+        try:
+            conn = duckdb.connect(util.DUCKDB_PATH, read_only=True)
+            try:
+                known_posts = util.fetch_known_post_dates(
+                    conn, config.schema, config.table, config.instagram_id, before_date=date_from
+                )
+            finally:
+                conn.close()
+        except (duckdb.IOException, duckdb.CatalogException) as exc:
+            print(f"⚠️ 기존 적재 게시물 조회 건너뜀 → 전부 새로 판단: {exc}")
+            known_posts = {}
+        print(f"기존 적재 게시물: {len(known_posts)}건")
+
+        # 타임아웃·크래시로 재시도되면 같은 체크포인트에서 이어서 수집
+        # 단계별 시간 프로필은 하루치 파일 옆에 같은 접두어로 저장
+        tmp_dir         = Variable.get("data_dir", default_var="/tmp/")
+        checkpoint_path = os.path.join(
+            tmp_dir, f"{config.brand_key}_{date_from.replace('-', '')}_{date_to.replace('-', '')}"
         )
 
-        dataframe = pd.DataFrame(posts, columns=POST_COLUMNS)
-        tmp_dir   = Variable.get("data_dir", default_var="/tmp/")
-        file_path = util.get_file_path(tmp_dir, config.brand_key, context)
-
-        dataframe.to_csv(file_path, index=False, encoding="utf-8-sig")
-        print(
-            f"\n[EXTRACT 완료]"
-            f"\n  brand   : {config.brand_key}"
-            f"\n  date    : {date_to_process}"
-            f"\n  rows    : {len(posts)}"
-            f"\n  saved   : {file_path}"
-        )
-        return file_path
+        if config.extract_workers > 1:
+            # 상세 조회를 워커 프로세스로 나눔 — 재시도 시 이어서 수집은 작업 큐 파일이 대신함
+            posts = run_parallel(
+                brand_id=config.instagram_id,
+                brand_name=config.brand_key,
+                headless=True,
+                date_from=date_from,
+                date_to=date_to,
+                workers=config.extract_workers,
+                detail_tabs=config.detail_tabs,
+                known_posts=known_posts,
+                known_stop_streak=config.known_stop_streak,
+                queue_path=f"{checkpoint_path}.queue.sqlite",
+                resource_policy=config.resource_policy,
+            )
+        else:
+            posts = run(
+                brand_id=config.instagram_id,
+                brand_name=config.brand_key,
+                headless=True,
+                date_from=date_from,
+                date_to=date_to,
+                detail_tabs=config.detail_tabs,
+                harvest_network=config.harvest_network,
+                http_detail=config.http_detail,
+                known_posts=known_posts,
+                known_stop_streak=config.known_stop_streak,
+                checkpoint_path=checkpoint_path,
+                profile_path=f"{checkpoint_path}.profile.json",
+                resource_policy=config.resource_policy,
+            )
 
-    # ── 태스크 3: CSV → DuckDB UPSERT ────────────────────────────
+        # 날짜별로 파일을 나눠 저장 → load_to_duckdb가 하루치 파일을 단독으로 읽을 수 있음
+        post_index = POST_COLUMNS.index("post_date")
+        file_paths = []
+
+        for day in util.get_days_between(date_from, date_to):
+            day_posts = [post for post in posts if post[post_index] == day]
+            file_path = util.get_day_file_path(tmp_dir, config.brand_key, day)
+
+            util.write_posts_parquet(file_path, day_posts)
+            file_paths.append(file_path)
+            print(
+                f"\n[EXTRACT 완료]"
+                f"\n  brand   : {config.brand_key}"
+                f"\n  date    : {day}"
+                f"\n  rows    : {len(day_posts)}"
+                f"\n  saved   : {file_path}"
+            )
 
-    @task(task_id="load_to_duckdb")
-    def load_to_duckdb(brand_key: str) -> None:
-        # brand_key + 실행 날짜로 파일 경로를 재구성합니다.
-        # (XCom 의존 없이 load 태스크가 단독으로 재실행 가능하게 설계)
-        staging_table   = f"temp_{config.table}"
+        # 파일로 옮겼으므로 다음 실행이 이어받지 않도록 정리
+        ScrapeCheckpoint(checkpoint_path).clear()
+        if config.extract_workers > 1:
+            WorkQueue(f"{checkpoint_path}.queue.sqlite").clear()
+        return file_paths
+
+    # ── 태스크 3: Parquet → DuckDB UPSERT ────────────────────────
+
+    def load_posts_files(file_paths: list[str], allow_empty: bool = False) -> None:
+        """하루치 Parquet 파일을 날짜마다 스테이징 → 검증 → MERGE 합니다. (적재 서비스가 없을 때)"""
         qualified_table = f"{config.schema}.{config.table}"
         conn            = util.get_conn()
-        tmp_dir         = Variable.get("data_dir", "/tmp/")
-        file_path       = util.get_file_path(tmp_dir, brand_key, get_current_context())
 
         try:
-            # 테이블이 없으면 생성
-            util.ensure_instagram_posts_table(conn, config.schema, config.table)
-
-            # 임시 스테이징 테이블에 CSV를 먼저 올린 뒤 검증 후 본 테이블에 MERGE
-            conn.execute(
-                f"""
-                CREATE TEMP TABLE {staging_table} (
-                    post_id             VARCHAR,
-                    insta_id            VARCHAR,
-                    insta_name          VARCHAR,
-                    brand_name          VARCHAR,
-                    brand_id            VARCHAR,
-                    full_link           VARCHAR,
-                    img_src             VARCHAR,
-                    post_date           VARCHAR,
-                    tagged_insta_id     VARCHAR,
-                    tagged_insta_id_cnt INTEGER
-                );
-                """
-            )
+            for file_path in file_paths:
+                try:
+                    conn.execute("BEGIN;")
+                    row_count = util.merge_posts_file(conn, config.schema, config.table, file_path, allow_empty)
+                    conn.execute("COMMIT;")
+                except Exception as exc:
+                    conn.execute("ROLLBACK;")
+                    print(f"[LOAD 실패] {exc}")
+                    raise
+                print(f"[LOAD 완료] {qualified_table} ← {file_path} ({row_count}행)")
+        finally:
+            conn.close()
+
+    @task(task_id="load_to_duckdb")
+    def load_to_duckdb(brand_key: str) -> None:
+        from utils import load_service
+
+        # brand_key + 수집 기간으로 날짜별 파일 경로를 재구성합니다.
+        # (XCom 의존 없이 load 태스크가 단독으로 재실행 가능하게 설계)
+        context            = get_current_context()
+        date_from, date_to = get_date_window(context)
+        tmp_dir            = Variable.get("data_dir", "/tmp/")
+        is_window          = date_from != date_to
+        file_paths         = [
+            util.get_day_file_path(tmp_dir, brand_key, day)
+            for day in util.get_days_between(date_from, date_to)
+        ]
+
+        # 통합 적재 모드의 정기 실행은 transform DAG의 load_all_brands가 모든 브랜드 파일을 한 번에 MERGE
+        # (conf로 기간을 넘긴 백필은 transform DAG가 모르는 날짜이므로 여기서 바로 적재)
+        if util.CONSOLIDATED_LOAD and not (context["dag_run"].conf or {}):
+            print(f"[LOAD 위임] CONSOLIDATED_LOAD=true → transform DAG에서 통합 적재: {file_paths}")
+            return
+
+        # 적재 서비스가 떠 있으면 쓰기를 넘기고, 없으면 이 태스크가 직접 파일 잠금을 잡고 적재
+        if load_service.DEFAULT_SOCKET_PATH:
+            try:
+                reply = load_service.submit_load(file_paths, config.schema, config.table, allow_empty=is_window)
+            except load_service.LoadServiceUnavailable as exc:
+                print(f"⚠️ {exc} → 직접 적재")
+            else:
+                for file_path, row_count in zip(file_paths, reply["rows"]):
+                    print(f"[LOAD 완료] {config.schema}.{config.table} ← {file_path} ({row_count}행)")
+                print(
+                    f"[적재 서비스] 큐 대기 {reply['queue_ms']:.0f}ms / 적용 {reply['apply_ms']:.0f}ms"
+                    f" (배치 {reply['batch']}건) / 전체 대기 {reply['wait_ms']:.0f}ms"
+                )
+                return
+
+        load_posts_files(file_paths, allow_empty=is_window)
+
+    # ── 태스크 4: 게시물 썸네일 캐시 (적재와 병렬) ───────────────
 
-            util.load_csv_to_table(conn, staging_table, file_path)
-
-            # ── 검증 ──────────────────────────────────────────────
-
-            row_count = conn.execute(f"SELECT COUNT(*) FROM {staging_table}").fetchone()[0]
-            if row_count == 0:
-                raise ValueError("스테이징에 적재된 데이터가 없습니다")
-
-            duplicate_rows = conn.execute(
-                f"""
-                SELECT post_id, COUNT(*) AS cnt
-                FROM {staging_table}
-                GROUP BY post_id
-                HAVING COUNT(*) > 1;
-                """
-            ).fetchall()
-            if duplicate_rows:
-                sample = ", ".join(f"{r[0]}({r[1]})" for r in duplicate_rows[:5])
-                raise ValueError(f"post_id 중복 발견: {sample} (총 {len(duplicate_rows)}건)")
-
-            invalid_count = conn.execute(
-                f"""
-                SELECT COUNT(*)
-                FROM {staging_table}
-                WHERE post_id IS NULL OR TRIM(post_id) = '';
-                """
-            ).fetchone()[0]
-            if invalid_count > 0:
-                raise ValueError(f"비어있는 post_id가 {invalid_count}건 존재합니다.")
-
-            # ── MERGE (UPSERT) ────────────────────────────────────
-            # 기존 post_id 있으면 UPDATE, 없으면 INSERT
-
-            upsert_sql = f"""
-                MERGE INTO {qualified_table} AS target
-                USING {staging_table} AS stage
-                ON target.post_id = stage.post_id
-                WHEN MATCHED THEN
-                    UPDATE SET
-                        insta_id            = stage.insta_id,
-                        insta_name          = stage.insta_name,
-                        last_seen_at        = CURRENT_TIMESTAMP,
-                        active              = TRUE,
-                        tagged_insta_id     = stage.tagged_insta_id,
-                        tagged_insta_id_cnt = stage.tagged_insta_id_cnt
-                WHEN NOT MATCHED THEN
-                    INSERT (
-                        post_id, insta_id, insta_name, brand_name, brand_id,
-                        full_link, img_src, post_date,
-                        first_seen_at, last_seen_at, active,
-                        tagged_insta_id, tagged_insta_id_cnt
-                    )
-                    VALUES (
-                        stage.post_id, stage.insta_id, stage.insta_name,
-                        stage.brand_name, stage.brand_id,
-                        stage.full_link, stage.img_src, stage.post_date,
-                        CURRENT_TIMESTAMP, CURRENT_TIMESTAMP, TRUE,
-                        stage.tagged_insta_id, stage.tagged_insta_id_cnt
-                    );
-            """
-
-            conn.execute("BEGIN;")
-            conn.execute(upsert_sql)
-            conn.execute("COMMIT;")
-            print(f"[LOAD 완료] {qualified_table} ← {file_path} ({row_count}행)")
-
-        except Exception as exc:
-            conn.execute("ROLLBACK;")
-            print(f"[LOAD 실패] {exc}")
-            raise
+    @task(
+        task_id="cache_thumbnails",
+        execution_timeout=timedelta(minutes=15),
+    )
+    def cache_thumbnails(file_paths: list[str]) -> None:
+        """extract가 만든 Parquet의 img_src를 리사이즈해 TagScope가 서빙할 썸네일 캐시에 채웁니다."""
+        from extractors.thumbnail_cache import ThumbnailCache
+
+        items = []
+        for file_path in file_paths:
+            items.extend(
+                duckdb.execute(
+                    "SELECT post_id, img_src FROM read_parquet(?) WHERE post_id IS NOT NULL AND img_src IS NOT NULL",
+                    [file_path],
+                ).fetchall()
+            )
 
+        # 이미지 하나하나의 실패는 캐시 안에서 건너뜀 (CDN URL 만료 등)
+        cache = ThumbnailCache()
+        try:
+            cache.fetch(items)
         finally:
-            conn.close()
+            cache.close()
 
     # ── DAG 정의 ─────────────────────────────────────────────────
 
@@ -321,6 +395,8 @@ def create_instagram_brand_dag(config: BrandDagConfig) -> DAG | None:
         tags=["ETL", "Instagram", "DuckDB", "incremental"],
         schedule=config.schedule,
     ) as dag:
-        print_run_date() >> extract_instagram_data(debug=True) >> load_to_duckdb(config.brand_key)
+        file_paths = extract_instagram_data(debug=True)
+        print_run_date() >> file_paths >> load_to_duckdb(config.brand_key)
+        cache_thumbnails(file_paths)
 
     return dag
@@ -0,0 +1,152 @@
+"""
+bench_handoff.py
+
+extract → load 사이 하루치 파일을 CSV로 넘길 때와 Parquet로 넘길 때의 크기·저장·적재 시간을 비교합니다.
+
+  csv     : pandas DataFrame → utf-8-sig CSV → 전부 VARCHAR인 임시 테이블에 COPY → MERGE 때 DATE 캐스팅 (이전 방식)
+  parquet : 스크래퍼 튜플 → write_posts_parquet (타입 있는 zstd Parquet) → read_parquet 뷰로 바로 MERGE
+
+적재는 load_posts_file과 같은 순서(스테이징 → 행 수·중복·빈 post_id 검증 → MERGE)를
+메모리 DuckDB의 빈 INSTAGRAM_POSTS에 반복 실행합니다. 게시물은 실제 수집 결과와 비슷한 길이로 만든 가짜 데이터입니다.
+
+실행 (dags/ 에서):
+  python -m utils.bench_handoff [--rows 300 1000 10000] [--repeat 5]
+"""
+
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+import duckdb
+import pandas as pd
+
+from utils import db as util
+
+
+SCHEMA = "RAW_DATA"
+TABLE  = "INSTAGRAM_POSTS"
+
+MERGE_SQL = f"""
+    MERGE INTO {SCHEMA}.{TABLE} AS target
+    USING stage
+    ON target.post_id = stage.post_id
+    WHEN MATCHED THEN
+        UPDATE SET insta_id = stage.insta_id, last_seen_at = CURRENT_TIMESTAMP
+    WHEN NOT MATCHED THEN
+        INSERT (
+            post_id, insta_id, insta_name, brand_name, brand_id,
+            full_link, img_src, post_date,
+            first_seen_at, last_seen_at, active,
+            tagged_insta_id, tagged_insta_id_cnt
+        )
+        VALUES (
+            stage.post_id, stage.insta_id, stage.insta_name,
+            stage.brand_name, stage.brand_id,
+            stage.full_link, stage.img_src, CAST(stage.post_date AS DATE),
+            CURRENT_TIMESTAMP, CURRENT_TIMESTAMP, TRUE,
+            stage.tagged_insta_id, stage.tagged_insta_id_cnt
+        );
+"""
+
+
+def fake_posts(count, day="2026-01-08"):
+    """POST_COLUMNS 순서 튜플 (img_src는 서명 쿼리가 붙은 CDN URL 길이로)."""
+    rows = []
+    for index in range(count):
+        post_id = f"C{index:010d}x"
+        tags    = [f"user_{index % 97}", f"friend.{index % 13}", "amomento.co"][: 1 + index % 3]
+        rows.append((
+            post_id, f"user_{index % 211}", f"사용자 {index % 211}",
+            "amomento", "amomento.co",
+            f"https://www.instagram.com/p/{post_id}/",
+            f"https://scontent-ssn1-1.cdninstagram.com/v/t51.29350-15/{index}_n.jpg"
+            f"?stp=dst-jpg_e35&_nc_ht=scontent&_nc_ohc={index:08x}&oh=00_{'a' * 40}&oe=65A1B2C3",
+            day, ",".join(tags), len(tags),
+        ))
+    return rows
+
+
+def _timed(func):
+    started = time.perf_counter()
+    func()
+    return (time.perf_counter() - started) * 1000
+
+
+def write_csv(path, rows):
+    columns = [name for name, _ in util.POST_FILE_SCHEMA]
+    pd.DataFrame(rows, columns=columns).to_csv(path, index=False, encoding="utf-8-sig")
+
+
+def load(conn, stage_sql):
+    """스테이징 → 검증 3회 → MERGE (load_posts_file과 같은 순서)."""
+    util.ensure_instagram_posts_table(conn, SCHEMA, TABLE)
+    for statement in stage_sql:
+        conn.execute(statement)
+    conn.execute("SELECT COUNT(*) FROM stage").fetchone()
+    conn.execute("SELECT post_id FROM stage GROUP BY post_id HAVING COUNT(*) > 1").fetchall()
+    conn.execute("SELECT COUNT(*) FROM stage WHERE post_id IS NULL OR TRIM(post_id) = ''").fetchone()
+    conn.execute("BEGIN")
+    conn.execute(MERGE_SQL)
+    conn.execute("COMMIT")
+
+
+def csv_stage_sql(path):
+    columns = ", ".join(
+        f"{name} {'INTEGER' if column_type == 'INTEGER' else 'VARCHAR'}" for name, column_type in util.POST_FILE_SCHEMA
+    )
+    return [f"CREATE TEMP TABLE stage ({columns})", f"COPY stage FROM '{path}' (FORMAT CSV, HEADER true)"]
+
+
+def parquet_stage_sql(path):
+    return [f"CREATE TEMP VIEW stage AS SELECT * FROM read_parquet('{path}')"]
+
+
+def bench(rows, repeat, work_dir):
+    csv_path     = os.path.join(work_dir, "posts.csv")
+    parquet_path = os.path.join(work_dir, "posts.parquet")
+
+    result = {}
+    for name, path, writer, stage_sql in (
+        ("csv",     csv_path,     write_csv,                 csv_stage_sql),
+        ("parquet", parquet_path, util.write_posts_parquet,  parquet_stage_sql),
+    ):
+        write_ms, load_ms = [], []
+        for _ in range(repeat):
+            write_ms.append(_timed(lambda: writer(path, rows)))
+            conn = duckdb.connect()
+            try:
+                load_ms.append(_timed(lambda: load(conn, stage_sql(path))))
+                loaded = conn.execute(f"SELECT COUNT(*) FROM {SCHEMA}.{TABLE}").fetchone()[0]
+            finally:
+                conn.close()
+            if loaded != len(rows):
+                raise SystemExit(f"{name}: 적재 행 수 불일치 {loaded} != {len(rows)}")
+        result[name] = (os.path.getsize(path), statistics.median(write_ms), statistics.median(load_ms))
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="CSV vs Parquet 하루치 파일 크기·적재 시간 벤치마크")
+    parser.add_argument("--rows", type=int, nargs="+", default=[300, 3000, 30000], help="파일당 게시물 수")
+    parser.add_argument("--repeat", type=int, default=5, help="크기별 반복 횟수 (중앙값)")
+    args = parser.parse_args()
+
+    print(f"{'rows':>7} {'형식':<8} {'크기(KB)':>9} {'저장(ms)':>9} {'적재(ms)':>9}")
+    with tempfile.TemporaryDirectory() as work_dir:
+        for count in args.rows:
+            result = bench(fake_posts(count), args.repeat, work_dir)
+            for name, (size, write_ms, load_ms) in result.items():
+                print(f"{count:>7} {name:<8} {size / 1024:>9.1f} {write_ms:>9.1f} {load_ms:>9.1f}")
+
+            csv_size, _, csv_load         = result["csv"]
+            parquet_size, _, parquet_load = result["parquet"]
+            print(
+                f"{'':>7} → 크기 {csv_size / max(parquet_size, 1):.1f}x 작음"
+                f" / 적재 {csv_load / max(parquet_load, 1e-6):.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
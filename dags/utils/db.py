@@ -1,4 +1,5 @@
 import os
+import tempfile
 import time
 from datetime import datetime, timedelta
 
@@ -8,6 +9,23 @@ import duckdb
 # DuckDB 파일 위치. 환경변수로 덮어쓸 수 있습니다.
 DUCKDB_PATH = os.getenv("DUCKDB_PATH", "/opt/airflow/data/insta_pipeline.duckdb")
 
+# true면 브랜드 DAG의 하루치 적재를 건너뛰고 transform DAG가 날짜별로 모든 브랜드 파일을 한 번에 MERGE
+CONSOLIDATED_LOAD = os.getenv("CONSOLIDATED_LOAD", "false").lower() == "true"
+
+# extract → load 사이 하루치 파일의 컬럼과 타입 (스크래퍼 튜플 순서 = POST_COLUMNS)
+POST_FILE_SCHEMA = [
+    ("post_id",             "VARCHAR"),
+    ("insta_id",            "VARCHAR"),
+    ("insta_name",          "VARCHAR"),
+    ("brand_name",          "VARCHAR"),
+    ("brand_id",            "VARCHAR"),
+    ("full_link",           "VARCHAR"),
+    ("img_src",             "VARCHAR"),
+    ("post_date",           "DATE"),
+    ("tagged_insta_id",     "VARCHAR"),
+    ("tagged_insta_id_cnt", "INTEGER"),
+]
+
 
 # ──────────────────────────────────────────
 # 1. 연결
@@ -29,17 +47,43 @@ def get_conn() -> duckdb.DuckDBPyConnection:
 # 2. 파일 경로
 # ──────────────────────────────────────────
 
-def get_file_path(tmp_dir: str, file_name: str, context) -> str:
-    date = context["logical_date"].strftime("%Y%m%d")
-    return os.path.join(tmp_dir, f"{file_name}_{date}.csv")
+def get_day_file_path(tmp_dir: str, file_name: str, date_str: str) -> str:
+    # 'YYYY-MM-DD' 하루치 파티션 파일 경로 ({file_name}_{YYYYMMDD}.parquet)
+    date = datetime.strptime(date_str, "%Y-%m-%d").strftime("%Y%m%d")
+    return os.path.join(tmp_dir, f"{file_name}_{date}.parquet")
 
 
 # ──────────────────────────────────────────
-# 3. CSV 적재
+# 3. 파일 저장 / 적재
 # ──────────────────────────────────────────
 
-def load_csv_to_table(conn: duckdb.DuckDBPyConnection, table: str, file_path: str) -> None:
-    conn.execute(f"COPY {table} FROM '{file_path}' (FORMAT CSV, HEADER true)")
+def write_posts_parquet(file_path: str, rows: list[tuple]) -> None:
+    # 스크래퍼 튜플을 POST_FILE_SCHEMA 타입 그대로 zstd 압축 Parquet로 저장합니다. (pandas 없이 메모리 DuckDB로)
+    # 임시 파일에 쓴 뒤 rename해서 load 태스크가 반쯤 쓴 파일을 읽는 일이 없게 합니다.
+    columns = ", ".join(f"{name} {column_type}" for name, column_type in POST_FILE_SCHEMA)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(file_path) or ".", suffix=".parquet.tmp")
+    os.close(fd)
+
+    conn = duckdb.connect()
+    try:
+        conn.execute(f"CREATE TABLE posts ({columns})")
+        if rows:
+            # executemany는 행마다 INSERT라 느려서 컬럼별 리스트를 UNNEST로 한 번에 넣음
+            unnest = ", ".join(f"UNNEST(?::{column_type}[])" for _, column_type in POST_FILE_SCHEMA)
+            conn.execute(f"INSERT INTO posts SELECT {unnest}", [list(column) for column in zip(*rows)])
+        conn.execute(f"COPY posts TO '{tmp_path}' (FORMAT PARQUET, COMPRESSION ZSTD)")
+    finally:
+        conn.close()
+    os.replace(tmp_path, file_path)
+
+
+def posts_parquet_relation(conn: duckdb.DuckDBPyConnection, file_path: str) -> str:
+    # 하루치 Parquet 파일을 복사 없이 그대로 읽는 SQL 식을 돌려줍니다. 스키마가 다르면 ValueError.
+    source = f"read_parquet('{file_path}')"
+    actual = [(row[0], row[1]) for row in conn.execute(f"DESCRIBE SELECT * FROM {source}").fetchall()]
+    if actual != POST_FILE_SCHEMA:
+        raise ValueError(f"Parquet 스키마 불일치: {file_path} — {actual}")
+    return source
 
 
 # ──────────────────────────────────────────
@@ -81,3 +125,237 @@ def get_next_day(date_str: str) -> str:
 def get_last_day(date_str: str) -> str:
     date_obj = datetime.strptime(date_str, "%Y-%m-%d")
     return (date_obj - timedelta(days=1)).strftime("%Y-%m-%d")
+
+
+def get_days_between(date_from: str, date_to: str) -> list[str]:
+    # date_from ~ date_to (양 끝 포함) 날짜 문자열 목록
+    days = []
+    day  = date_from
+    while day <= date_to:
+        days.append(day)
+        day = get_next_day(day)
+    return days
+
+
+# ──────────────────────────────────────────
+# 6. 기존 적재 게시물 조회
+# ──────────────────────────────────────────
+
+def fetch_known_post_dates(
+    conn: duckdb.DuckDBPyConnection,
+    schema: str,
+    table: str,
+    brand_id: str,
+    before_date: str | None = None,
+) -> dict[str, str]:
+    # 스크래퍼가 이미 적재된 게시물의 상세 페이지를 다시 열지 않도록
+    # {post_id: 'YYYY-MM-DD'}를 돌려줍니다. before_date가 있으면 그 이전 날짜만 조회합니다.
+    table_exists = conn.execute(
+        """
+        SELECT COUNT(*)
+        FROM information_schema.tables
+        WHERE LOWER(table_schema) = LOWER(?) AND LOWER(table_name) = LOWER(?)
+        """,
+        [schema, table],
+    ).fetchone()[0]
+    if not table_exists:
+        return {}
+
+    sql    = f"SELECT post_id, CAST(post_date AS VARCHAR) FROM {schema}.{table} WHERE brand_id = ?"
+    params = [brand_id]
+    if before_date is not None:
+        sql += " AND post_date < CAST(? AS DATE)"
+        params.append(before_date)
+
+    return {post_id: post_date for post_id, post_date in conn.execute(sql, params).fetchall()}
+
+
+# ──────────────────────────────────────────
+# 7. 하루치 파일 적재 (스테이징 → 검증 → MERGE)
+# ──────────────────────────────────────────
+
+def _merge_posts_sql(qualified_table: str, source: str) -> str:
+    # 기존 post_id 있으면 UPDATE, 없으면 INSERT (source는 POST_FILE_SCHEMA 컬럼을 가진 테이블·뷰·서브쿼리)
+    return f"""
+        MERGE INTO {qualified_table} AS target
+        USING {source} AS stage
+        ON target.post_id = stage.post_id
+        WHEN MATCHED THEN
+            UPDATE SET
+                insta_id            = stage.insta_id,
+                insta_name          = stage.insta_name,
+                last_seen_at        = CURRENT_TIMESTAMP,
+                active              = TRUE,
+                tagged_insta_id     = stage.tagged_insta_id,
+                tagged_insta_id_cnt = stage.tagged_insta_id_cnt
+        WHEN NOT MATCHED THEN
+            INSERT (
+                post_id, insta_id, insta_name, brand_name, brand_id,
+                full_link, img_src, post_date,
+                first_seen_at, last_seen_at, active,
+                tagged_insta_id, tagged_insta_id_cnt
+            )
+            VALUES (
+                stage.post_id, stage.insta_id, stage.insta_name,
+                stage.brand_name, stage.brand_id,
+                stage.full_link, stage.img_src, stage.post_date,
+                CURRENT_TIMESTAMP, CURRENT_TIMESTAMP, TRUE,
+                stage.tagged_insta_id, stage.tagged_insta_id_cnt
+            );
+    """
+
+
+def merge_posts_file(
+    conn: duckdb.DuckDBPyConnection,
+    schema: str,
+    table: str,
+    file_path: str,
+    allow_empty: bool = False,
+) -> int:
+    # 하루치 Parquet 하나를 스테이징 → 검증 → MERGE 하고 적재한 행 수를 돌려줍니다. 검증 실패는 ValueError.
+    # 트랜잭션은 호출하는 쪽에서 겁니다 (load 태스크는 파일마다, 적재 서비스는 배치마다).
+    staging_table   = f"temp_{table}"
+    qualified_table = f"{schema}.{table}"
+
+    # 테이블이 없으면 생성
+    ensure_instagram_posts_table(conn, schema, table)
+
+    # 타입이 있는 Parquet 파일을 복사 없이 스테이징 뷰로 읽은 뒤 검증 후 본 테이블에 MERGE
+    source = posts_parquet_relation(conn, file_path)
+    conn.execute(f"CREATE OR REPLACE TEMP VIEW {staging_table} AS SELECT * FROM {source};")
+
+    # ── 검증 ──────────────────────────────────────────────
+
+    row_count = conn.execute(f"SELECT COUNT(*) FROM {staging_table}").fetchone()[0]
+    if row_count == 0:
+        if allow_empty:
+            # 기간 수집에서는 게시물이 없는 날도 정상
+            return 0
+        raise ValueError(f"스테이징에 적재된 데이터가 없습니다: {file_path}")
+
+    duplicate_rows = conn.execute(
+        f"""
+        SELECT post_id, COUNT(*) AS cnt
+        FROM {staging_table}
+        GROUP BY post_id
+        HAVING COUNT(*) > 1;
+        """
+    ).fetchall()
+    if duplicate_rows:
+        sample = ", ".join(f"{r[0]}({r[1]})" for r in duplicate_rows[:5])
+        raise ValueError(f"post_id 중복 발견: {sample} (총 {len(duplicate_rows)}건) — {file_path}")
+
+    invalid_count = conn.execute(
+        f"""
+        SELECT COUNT(*)
+        FROM {staging_table}
+        WHERE post_id IS NULL OR TRIM(post_id) = '';
+        """
+    ).fetchone()[0]
+    if invalid_count > 0:
+        raise ValueError(f"비어있는 post_id가 {invalid_count}건 존재합니다. — {file_path}")
+
+    # ── MERGE (UPSERT) ────────────────────────────────────
+    conn.execute(_merge_posts_sql(qualified_table, staging_table))
+    return row_count
+
+
+# ──────────────────────────────────────────
+# 8. 날짜별 통합 적재 (모든 브랜드 파일 → MERGE 한 번)
+# ──────────────────────────────────────────
+
+def merge_posts_day(
+    conn: duckdb.DuckDBPyConnection,
+    schema: str,
+    table: str,
+    file_paths: list[str],
+    allow_empty: bool = False,
+) -> tuple[dict[str, int], dict[str, str]]:
+    # 같은 날짜의 브랜드별 Parquet 파일을 한 번에 읽어 함께 검증하고, 통과한 파일만 MERGE 한 번으로 적재합니다.
+    # 반환 ({파일: 적재 행 수}, {파일: 실패 사유}) — 실패는 파일(브랜드) 단위로만 빠지고 나머지는 적재됩니다.
+    # 여러 브랜드 파일에 같은 게시물이 있으면 file_paths 앞쪽 브랜드로 INSERT (브랜드별 순차 적재와 같은 결과).
+    # 트랜잭션은 호출하는 쪽에서 겁니다.
+    qualified_table = f"{schema}.{table}"
+    failed          = {}
+    present         = []
+
+    ensure_instagram_posts_table(conn, schema, table)
+
+    # 스키마는 파일 메타데이터만 보고 파일별로 확인 (본문은 아래에서 한 번만 읽음)
+    for file_path in file_paths:
+        if not os.path.exists(file_path):
+            failed[file_path] = "파일 없음 (extract 실패 또는 미실행)"
+            continue
+        try:
+            posts_parquet_relation(conn, file_path)
+        except ValueError as exc:
+            failed[file_path] = str(exc)
+            continue
+        present.append(file_path)
+
+    if not present:
+        return {}, failed
+
+    conn.execute(
+        "CREATE OR REPLACE TEMP TABLE stage_day AS SELECT * FROM read_parquet($files, filename = true);",
+        {"files": present},
+    )
+
+    # ── 검증 (전체 파일을 한 번에, 결과는 파일별) ─────────────
+
+    checks = {
+        file_path: (row_count, duplicate_count, empty_count)
+        for file_path, row_count, duplicate_count, empty_count in conn.execute(
+            """
+            SELECT
+                filename,
+                COUNT(*),
+                COUNT(post_id) - COUNT(DISTINCT post_id),
+                COUNT(*) FILTER (WHERE post_id IS NULL OR TRIM(post_id) = '')
+            FROM stage_day
+            GROUP BY filename;
+            """
+        ).fetchall()
+    }
+
+    loaded = {}
+    for file_path in present:
+        row_count, duplicate_count, empty_count = checks.get(file_path, (0, 0, 0))
+        if row_count == 0:
+            if allow_empty:
+                loaded[file_path] = 0
+            else:
+                failed[file_path] = "스테이징에 적재된 데이터가 없습니다"
+        elif duplicate_count > 0:
+            failed[file_path] = f"post_id 중복 {duplicate_count}건"
+        elif empty_count > 0:
+            failed[file_path] = f"비어있는 post_id가 {empty_count}건 존재합니다."
+        else:
+            loaded[file_path] = row_count
+
+    merge_files = [file_path for file_path in present if loaded.get(file_path)]
+    if not merge_files:
+        return loaded, failed
+
+    # ── MERGE (통과한 파일, post_id마다 우선순위가 가장 앞선 브랜드 행 하나) ──
+
+    conn.execute(
+        """
+        CREATE OR REPLACE TEMP TABLE stage_day_files AS
+        SELECT file.filename, file.priority
+        FROM UNNEST($files) WITH ORDINALITY AS file(filename, priority);
+        """,
+        {"files": merge_files},
+    )
+    conn.execute(
+        _merge_posts_sql(
+            qualified_table,
+            """(
+                SELECT stage_day.* EXCLUDE (filename)
+                FROM stage_day
+                JOIN stage_day_files USING (filename)
+                QUALIFY ROW_NUMBER() OVER (PARTITION BY post_id ORDER BY stage_day_files.priority) = 1
+            )""",
+        )
+    )
+    return loaded, failed
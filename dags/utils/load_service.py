@@ -0,0 +1,325 @@
+"""
+load_service.py
+
+DuckDB 파일 쓰기를 한 프로세스로 모으는 적재 서비스와, load 태스크가 쓰는 클라이언트입니다.
+
+여러 브랜드 DAG의 load_to_duckdb가 각자 duckdb.connect로 파일 잠금을 잡으려다 보니
+get_conn의 재시도(3초 × 10번) 대기가 생깁니다. 서비스가 쓰기 연결을 혼자 가지면
+태스크는 Unix 소켓으로 하루치 파일 목록을 넘기고 결과를 기다리기만 합니다.
+
+  - 수신 : 연결마다 스레드 하나가 JSON 한 줄 요청을 받아 큐에 넣고 결과를 기다림
+  - 적용 : writer 스레드 하나가 받은 순서대로 처리. batch_ms 동안 모인 요청(최대 max_batch개)을
+           트랜잭션 하나로 적용하고, 실패하면 롤백한 뒤 요청마다 따로 적용해 실패한 요청만 실패로 돌려줌
+  - 연결 : 쓰기 연결은 일이 있을 때 열고 idle_close_sec 동안 요청이 없으면 닫음
+           (DuckDB 잠금은 프로세스 단위라 계속 잡고 있으면 dbt·TagScope 백엔드가 파일을 열 수 없음.
+            그쪽이 잡고 있으면 서비스가 기다리고, 태스크는 큐 대기 시간으로만 봄)
+  - 지표 : 응답에 요청별 큐 대기(queue_ms)·적용 시간(apply_ms)·배치 크기, stats 요청으로 분포 조회
+
+프로토콜 (요청 하나당 연결 하나, 줄 단위 JSON):
+  → {"op": "load", "schema": ..., "table": ..., "files": [...], "allow_empty": bool}
+  ← {"ok": true, "rows": [...], "queue_ms": ..., "apply_ms": ..., "batch": n}
+  ← {"ok": false, "error": "..."}
+  → {"op": "stats"}
+
+실행 (Airflow 컨테이너 안, docker-compose의 LOAD_SERVICE=true):
+  python -m utils.load_service [--socket /tmp/duckdb_writer.sock] [--batch-ms 200]
+"""
+
+import argparse
+import json
+import os
+import queue
+import socket
+import threading
+import time
+from collections import Counter, deque
+
+import duckdb
+
+from utils import db as util
+
+
+DEFAULT_SOCKET_PATH = os.getenv("LOAD_SERVICE_SOCKET")  # 예: /tmp/duckdb_writer.sock (없으면 태스크가 직접 적재)
+
+
+class LoadServiceUnavailable(ConnectionError):
+    """서비스 소켓에 연결할 수 없음 (요청을 보내기 전이므로 직접 적재로 넘어가도 안전)."""
+
+
+def _percentile(values, ratio):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * ratio))]
+
+
+# ── 태스크 쪽: 클라이언트 ─────────────────────────────────────────
+
+def _request(payload, socket_path, timeout):
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    client.settimeout(timeout)
+    try:
+        try:
+            client.connect(socket_path)
+        except OSError as exc:
+            raise LoadServiceUnavailable(f"적재 서비스 연결 실패: {socket_path} ({exc})") from exc
+        client.sendall(json.dumps(payload, ensure_ascii=False).encode("utf-8") + b"\n")
+        with client.makefile("r", encoding="utf-8") as reader:
+            line = reader.readline()
+    finally:
+        client.close()
+
+    if not line:
+        raise RuntimeError("적재 서비스가 응답 없이 연결을 닫았습니다")
+    return json.loads(line)
+
+
+def submit_load(files, schema, table, allow_empty=False, socket_path=DEFAULT_SOCKET_PATH, timeout=1800) -> dict:
+    """
+    하루치 파일 목록을 서비스에 넘기고 적용이 끝날 때까지 기다립니다.
+    파일 목록은 한 트랜잭션 안에서 순서대로 적용됩니다. 실패하면 RuntimeError (서비스 쪽 메시지 포함).
+    """
+    started = time.monotonic()
+    reply   = _request(
+        {"op": "load", "schema": schema, "table": table, "files": list(files), "allow_empty": allow_empty},
+        socket_path,
+        timeout,
+    )
+    reply["wait_ms"] = (time.monotonic() - started) * 1000
+    if not reply.get("ok"):
+        raise RuntimeError(f"적재 서비스 실패: {reply.get('error')}")
+    return reply
+
+
+def fetch_stats(socket_path=DEFAULT_SOCKET_PATH, timeout=10) -> dict:
+    return _request({"op": "stats"}, socket_path, timeout)
+
+
+# ── 서버 쪽: 단일 writer ─────────────────────────────────────────
+
+class LoadRequest:
+    """큐에 들어간 적재 요청 하나와, writer가 채워 주는 응답."""
+
+    def __init__(self, payload):
+        self.schema      = payload["schema"]
+        self.table       = payload["table"]
+        self.files       = payload["files"]
+        self.allow_empty = bool(payload.get("allow_empty", False))
+        self.received_at = time.monotonic()
+        self.reply       = None
+        self.done        = threading.Event()
+
+
+class LoadService:
+    """Unix 소켓으로 적재 요청을 받아 writer 스레드 하나가 순서대로 배치 적용합니다."""
+
+    def __init__(
+        self,
+        socket_path,
+        db_path=util.DUCKDB_PATH,
+        batch_ms=200,
+        max_batch=16,
+        idle_close_sec=2,
+        lock_timeout_sec=600,
+    ):
+        self.socket_path      = socket_path
+        self.db_path          = db_path
+        self.batch_ms         = batch_ms
+        self.max_batch        = max_batch
+        self.idle_close_sec   = idle_close_sec
+        self.lock_timeout_sec = lock_timeout_sec
+        self.requests         = queue.Queue()
+        self.conn             = None
+        self.stats            = Counter()
+        self.queue_ms         = deque(maxlen=1000)  # 최근 요청 큐 대기 시간
+        self.apply_ms         = deque(maxlen=1000)  # 최근 배치 적용 시간
+        self.lock_wait_ms     = deque(maxlen=1000)  # 최근 파일 잠금 대기 시간 (dbt·백엔드와 경합)
+
+    # ── 쓰기 연결 ────────────────────────────────────────────────
+
+    def _connection(self):
+        """쓰기 연결을 엽니다. 다른 프로세스가 잡고 있으면 lock_timeout_sec까지 기다립니다."""
+        if self.conn is not None:
+            return self.conn
+
+        started = time.monotonic()
+        while True:
+            try:
+                self.conn = duckdb.connect(self.db_path)
+                break
+            except duckdb.IOException:
+                if time.monotonic() - started >= self.lock_timeout_sec:
+                    raise
+                time.sleep(1)
+
+        waited_ms = (time.monotonic() - started) * 1000
+        self.lock_wait_ms.append(waited_ms)
+        if waited_ms >= 1000:
+            print(f"[적재 서비스] 파일 잠금 대기 {waited_ms / 1000:.1f}s (다른 프로세스가 사용 중)")
+        return self.conn
+
+    def _close_connection(self):
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
+    # ── 적용 ─────────────────────────────────────────────────────
+
+    def _apply_one(self, conn, request):
+        return [
+            util.merge_posts_file(conn, request.schema, request.table, file_path, request.allow_empty)
+            for file_path in request.files
+        ]
+
+    def _apply(self, batch):
+        """배치를 트랜잭션 하나로 적용하고, 실패하면 요청마다 따로 적용해 실패를 해당 요청에만 돌려줍니다."""
+        started = time.monotonic()
+        conn    = self._connection()
+        results = {}
+
+        try:
+            conn.execute("BEGIN;")
+            for request in batch:
+                results[request] = {"ok": True, "rows": self._apply_one(conn, request)}
+            conn.execute("COMMIT;")
+        except Exception as exc:
+            conn.execute("ROLLBACK;")
+            if len(batch) == 1:
+                results = {batch[0]: {"ok": False, "error": str(exc)}}
+            else:
+                print(f"⚠️ [적재 서비스] 배치 {len(batch)}건 실패 → 요청별로 다시 적용 ({exc})")
+                self.stats["batch_split"] += 1
+                results = {}
+                for request in batch:
+                    try:
+                        conn.execute("BEGIN;")
+                        rows = self._apply_one(conn, request)
+                        conn.execute("COMMIT;")
+                        results[request] = {"ok": True, "rows": rows}
+                    except Exception as request_exc:
+                        conn.execute("ROLLBACK;")
+                        results[request] = {"ok": False, "error": str(request_exc)}
+
+        apply_ms = (time.monotonic() - started) * 1000
+        self.apply_ms.append(apply_ms)
+        self.stats["batches"] += 1
+
+        for request in batch:
+            reply = results[request]
+            reply.update(
+                queue_ms=round((started - request.received_at) * 1000, 1),
+                apply_ms=round(apply_ms, 1),
+                batch=len(batch),
+            )
+            self.queue_ms.append(reply["queue_ms"])
+            self.stats["requests"] += 1
+            self.stats["files"]    += len(request.files)
+            self.stats["rows"]     += sum(reply.get("rows", []))
+            self.stats["failed"]   += not reply["ok"]
+            request.reply = reply
+            request.done.set()
+
+        print(
+            f"[적재 서비스] 배치 {len(batch)}건 / 파일 {sum(len(r.files) for r in batch)}개"
+            f" / {sum(sum(r.reply.get('rows', [])) for r in batch)}행 / 적용 {apply_ms:.0f}ms"
+            f" / 큐 대기 최대 {max(r.reply['queue_ms'] for r in batch):.0f}ms"
+            f" / 실패 {sum(not r.reply['ok'] for r in batch)}건"
+        )
+
+    def _writer(self):
+        while True:
+            try:
+                first = self.requests.get(timeout=self.idle_close_sec)
+            except queue.Empty:
+                self._close_connection()  # 한가할 때는 dbt·백엔드가 파일을 열 수 있게 잠금 해제
+                continue
+
+            # batch_ms 동안 뒤이어 들어온 요청을 같은 트랜잭션에 묶음
+            batch    = [first]
+            deadline = time.monotonic() + self.batch_ms / 1000
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self.requests.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            try:
+                self._apply(batch)
+            except Exception as exc:
+                # 연결 자체 실패 (잠금 대기 시간 초과 등) — 연결을 버리고 배치 전체를 실패로 돌려줌
+                print(f"❌ [적재 서비스] 배치 적용 실패: {exc}")
+                self._close_connection()
+                for request in batch:
+                    if not request.done.is_set():
+                        request.reply = {"ok": False, "error": str(exc)}
+                        request.done.set()
+
+    # ── 수신 ─────────────────────────────────────────────────────
+
+    def stats_reply(self) -> dict:
+        return {
+            "ok":           True,
+            **self.stats,
+            "pending":      self.requests.qsize(),
+            "queue_ms_p50": _percentile(self.queue_ms, 0.5),
+            "queue_ms_p95": _percentile(self.queue_ms, 0.95),
+            "apply_ms_p50": _percentile(self.apply_ms, 0.5),
+            "apply_ms_p95": _percentile(self.apply_ms, 0.95),
+            "lock_wait_ms_p95": _percentile(self.lock_wait_ms, 0.95),
+        }
+
+    def _handle(self, client):
+        with client, client.makefile("rwb") as stream:
+            try:
+                payload = json.loads(stream.readline())
+                if payload.get("op") == "stats":
+                    reply = self.stats_reply()
+                elif payload.get("op") == "load":
+                    request = LoadRequest(payload)
+                    self.requests.put(request)
+                    request.done.wait()
+                    reply = request.reply
+                else:
+                    reply = {"ok": False, "error": f"알 수 없는 요청: {payload.get('op')}"}
+            except (ValueError, KeyError) as exc:
+                reply = {"ok": False, "error": f"잘못된 요청: {exc}"}
+
+            stream.write(json.dumps(reply, ensure_ascii=False).encode("utf-8") + b"\n")
+            stream.flush()
+
+    def serve(self):
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)  # 이전 실행이 남긴 소켓 파일
+
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        server.bind(self.socket_path)
+        server.listen()
+        threading.Thread(target=self._writer, name="duckdb-writer", daemon=True).start()
+        print(f"[적재 서비스] {self.socket_path} 대기 중 → {self.db_path} (배치 {self.batch_ms}ms / 최대 {self.max_batch}건)")
+
+        while True:
+            client, _ = server.accept()
+            threading.Thread(target=self._handle, args=(client,), daemon=True).start()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="DuckDB 단일 writer 적재 서비스")
+    parser.add_argument("--socket", default=DEFAULT_SOCKET_PATH or "/tmp/duckdb_writer.sock", help="Unix 소켓 경로")
+    parser.add_argument("--db-path", default=util.DUCKDB_PATH, help="DuckDB 파일 경로")
+    parser.add_argument("--batch-ms", type=int, default=200, help="요청을 한 트랜잭션으로 묶어 기다리는 시간")
+    parser.add_argument("--max-batch", type=int, default=16, help="배치 하나에 묶을 최대 요청 수")
+    parser.add_argument("--stats", action="store_true", help="실행 중인 서비스의 지표만 출력")
+    args = parser.parse_args()
+
+    if args.stats:
+        print(json.dumps(fetch_stats(args.socket), ensure_ascii=False, indent=2))
+        return
+
+    LoadService(args.socket, args.db_path, batch_ms=args.batch_ms, max_batch=args.max_batch).serve()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+bench_detail_extract.py
+
+저장해 둔 상세 페이지 HTML로 게시물 추출 시간을 오프라인에서 비교합니다.
+
+  before : parse_post_date_kst + extract_post_data (요소별 evaluate/locator 여러 번)
+  after  : read_detail_snapshot 한 번 + snapshot_post_date / snapshot_post_data
+
+fixture는 상세 페이지의 렌더링된 DOM(page.content())을 <shortcode>.html로 저장한 파일입니다.
+네트워크는 모두 차단하고 페이지 스크립트도 끈 상태에서 set_content로 띄우므로 Instagram에 접속하지 않습니다.
+
+실행:
+  python -m extractors.bench_detail_extract <fixture_dir> [--repeat 5]
+"""
+
+import argparse
+import statistics
+import time
+from datetime import timedelta, timezone
+from pathlib import Path
+
+from playwright.sync_api import sync_playwright
+
+from extractors.instagram_scraper import (
+    extract_post_data,
+    parse_post_date_kst,
+    read_detail_snapshot,
+    snapshot_post_data,
+    snapshot_post_date,
+)
+
+
+def _time_ms(func):
+    started = time.perf_counter()
+    result  = func()
+    return (time.perf_counter() - started) * 1000, result
+
+
+def bench_fixture(page, html, href, kst, repeat):
+    """
+    fixture 하나를 띄워 before/after 추출을 repeat번씩 돌립니다.
+    반환: (before ms 리스트, after ms 리스트, 두 경로 결과 일치 여부)
+    """
+    page.set_content(html, wait_until="domcontentloaded")
+
+    before_ms, after_ms = [], []
+    before_result = after_result = None
+
+    for _ in range(repeat):
+        elapsed, before_result = _time_ms(
+            lambda: (parse_post_date_kst(page, kst), extract_post_data(page, href))
+        )
+        before_ms.append(elapsed)
+
+        def after():
+            snapshot = read_detail_snapshot(page)
+            return snapshot_post_date(snapshot, kst), snapshot_post_data(snapshot, href)
+
+        elapsed, after_result = _time_ms(after)
+        after_ms.append(elapsed)
+
+    return before_ms, after_ms, before_result == after_result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="상세 페이지 추출 before/after 오프라인 벤치마크")
+    parser.add_argument("fixture_dir", help="<shortcode>.html 파일이 있는 디렉터리")
+    parser.add_argument("--repeat", type=int, default=5, help="fixture별 반복 횟수")
+    args = parser.parse_args()
+
+    fixtures = sorted(Path(args.fixture_dir).glob("*.html"))
+    if not fixtures:
+        raise SystemExit(f"fixture 없음: {args.fixture_dir}/*.html")
+
+    kst = timezone(timedelta(hours=9))
+    all_before, all_after = [], []
+
+    with sync_playwright() as playwright:
+        browser = playwright.chromium.launch(headless=True)
+        context = browser.new_context(java_script_enabled=False)
+        context.route("**/*", lambda route: route.abort())  # 오프라인 고정
+        page    = context.new_page()
+
+        print(f"{'fixture':<24} {'before(ms)':>11} {'after(ms)':>10} {'x':>6}  일치")
+        for fixture in fixtures:
+            href = f"/p/{fixture.stem}/"
+            before_ms, after_ms, same = bench_fixture(
+                page, fixture.read_text(encoding="utf-8"), href, kst, args.repeat
+            )
+            all_before.extend(before_ms)
+            all_after.extend(after_ms)
+
+            before_med = statistics.median(before_ms)
+            after_med  = statistics.median(after_ms)
+            print(
+                f"{fixture.stem:<24} {before_med:>11.1f} {after_med:>10.1f}"
+                f" {before_med / max(after_med, 1e-6):>5.1f}x  {'OK' if same else 'DIFF'}"
+            )
+
+        browser.close()
+
+    before_med = statistics.median(all_before)
+    after_med  = statistics.median(all_after)
+    print(
+        f"\n[게시물당 추출 시간 중앙값] before {before_med:.1f}ms → after {after_med:.1f}ms"
+        f" ({before_med / max(after_med, 1e-6):.1f}x, fixture {len(fixtures)}개 × {args.repeat}회)"
+    )
+
+
+if __name__ == "__main__":
+    main()
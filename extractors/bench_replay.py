@@ -0,0 +1,108 @@
+"""
+bench_replay.py
+
+HAR 번들(har_bundle.py)을 재생해 run() → collect_posts_with_scroll 전체 경로의 처리량을 오프라인에서 잽니다.
+
+  - 분당 처리 게시물 수 : 판단까지 끝난 게시물(수집·필터·날짜 제외 포함) / 실행 시간
+  - 상세 페이지 지연     : 브라우저 경로 게시물의 detail_ready + detail_settle p50 / p95
+  - 필터 결과          : 게시물별 최종 결과(collected, business, past ...) 건수
+
+같은 번들로 --detail-tabs 값을 바꿔 가며 돌리면 변경 전후를 같은 입력으로 비교할 수 있습니다.
+--resource-policy off block 으로 돌리면 리소스 차단을 켜도 결과 분포·수집 수가 같은지 확인합니다
+(다르면 마지막에 ⚠️로 표시하고 종료 코드 1).
+
+번들 녹화:
+  run(..., har_record_dir="fixtures/amomento")   # 평소처럼 한 번 수집
+
+실행:
+  python -m extractors.bench_replay <bundle_dir> [--detail-tabs 1 4] [--repeat 3] [--resource-policy off block]
+"""
+
+import argparse
+import statistics
+import sys
+from collections import Counter
+
+from extractors.har_bundle import read_bundle_meta
+from extractors.instagram_scraper import run
+from extractors.profiler import PROFILE
+from extractors.readiness import percentile
+
+
+def bench_once(bundle_dir, meta, detail_tabs, resource_policy=None):
+    """번들을 한 번 재생하고 (분당 처리 수, 상세 지연 ms 리스트, 결과 Counter, 수집 수)를 반환합니다."""
+    posts = run(
+        brand_id=meta["brand_id"],
+        brand_name=meta.get("brand_name"),
+        target_day=meta.get("target_day"),
+        date_from=meta.get("date_from"),
+        date_to=meta.get("date_to"),
+        scroll_y=meta.get("scroll_y", 700),
+        max_scrolls=meta.get("max_scrolls", 50),
+        wait_ms=meta.get("wait_ms", 5000),
+        detail_tabs=detail_tabs,
+        debug_dir=None,
+        har_replay_dir=bundle_dir,
+        resource_policy=resource_policy,
+    )
+
+    profile    = PROFILE.to_dict()
+    rows       = profile["posts"]
+    wall_min   = profile["wall_ms"] / 60000
+    latency_ms = [
+        row["phases"].get("detail_ready", 0) + row["phases"].get("detail_settle", 0)
+        for row in rows
+        if row["path"] == "browser"
+    ]
+    outcomes   = Counter(row["outcome"] or "unknown" for row in rows)
+
+    return len(rows) / max(wall_min, 1e-9), latency_ms, outcomes, len(posts)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HAR 번들 재생 스크래퍼 처리량 벤치마크")
+    parser.add_argument("bundle_dir", help="capture.har.zip + meta.json이 있는 디렉터리")
+    parser.add_argument("--detail-tabs", type=int, nargs="+", default=[1], help="비교할 상세 탭 수")
+    parser.add_argument("--repeat", type=int, default=1, help="설정별 반복 횟수")
+    parser.add_argument(
+        "--resource-policy", nargs="+", default=["off"], choices=["off", "block", "measure"],
+        help="비교할 리소스 차단 정책 (off = 사용 안 함)",
+    )
+    args = parser.parse_args()
+
+    meta    = read_bundle_meta(args.bundle_dir)
+    results = []
+
+    for detail_tabs in args.detail_tabs:
+        for policy in args.resource_policy:
+            throughput, latency, outcomes, collected = [], [], Counter(), 0
+            for _ in range(args.repeat):
+                per_min, latency_ms, run_outcomes, collected = bench_once(
+                    args.bundle_dir, meta, detail_tabs, None if policy == "off" else policy
+                )
+                throughput.append(per_min)
+                latency.extend(latency_ms)
+                outcomes = run_outcomes  # 같은 번들이면 결과 분포는 실행마다 같아야 함
+            results.append((detail_tabs, policy, throughput, latency, outcomes, collected))
+
+    print(f"\n[재생 벤치마크] {args.bundle_dir} (brand={meta['brand_id']}, 녹화 {meta.get('recorded_at')})")
+    print(f"{'tabs':>4} {'policy':>7} {'posts/min':>10} {'detail p50':>11} {'detail p95':>11} {'수집':>5}  결과")
+    for detail_tabs, policy, throughput, latency, outcomes, collected in results:
+        summary = " ".join(f"{name}:{count}" for name, count in outcomes.most_common())
+        print(
+            f"{detail_tabs:>4} {policy:>7} {statistics.median(throughput):>10.1f}"
+            f" {percentile(latency, 50):>9.0f}ms {percentile(latency, 95):>9.0f}ms"
+            f" {collected:>5}  {summary}"
+        )
+
+    # 정책·탭 수와 상관없이 같은 번들이면 판단 결과가 같아야 함
+    baseline = (results[0][4], results[0][5])
+    mismatch = [row for row in results if (row[4], row[5]) != baseline]
+    for detail_tabs, policy, *_ in mismatch:
+        print(f"⚠️ 결과 불일치: tabs={detail_tabs} policy={policy} (기준: tabs={results[0][0]} policy={results[0][1]})")
+    if mismatch:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
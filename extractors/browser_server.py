@@ -0,0 +1,161 @@
+"""
+browser_server.py
+
+브랜드 수집 태스크들이 함께 쓰는 상주 Chromium 서버와, run()에서 쓰는 연결 함수입니다.
+
+브랜드 태스크마다 chromium.launch()로 브라우저를 띄웠다가 닫으면 매번 수 초의 콜드 스타트와
+수백 MB 메모리 변동이 생깁니다. 서버가 Chromium 하나를 CDP 포트로 띄워 두면 태스크는
+connect_over_cdp로 붙어서 자기 전용 컨텍스트만 새로 만들고, 끝나면 컨텍스트만 닫습니다.
+
+  - 서버 : 주기적으로 /json/version 헬스 체크, 응답이 없거나 프로세스가 죽으면 다시 띄움
+           실행 상태(엔드포인트, 콜드 스타트 시간, 재시작 횟수)를 status 파일에 기록
+  - 태스크: BROWSER_CDP_URL이 있고 헬스 체크를 통과하면 연결, 아니면 기존처럼 직접 launch
+           연결 시간과 서버 콜드 스타트 시간을 비교해 절약한 시간을 출력
+
+Chrome은 /json 요청의 Host가 localhost나 IP일 때만 응답하므로, 서버는 태스크가 도는
+Airflow 컨테이너 안에서 같이 띄웁니다 (docker-compose의 BROWSER_SERVER=true).
+
+실행:
+  python -m extractors.browser_server [--port 9222] [--check-interval 30]
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+import requests
+from playwright.sync_api import sync_playwright
+
+
+DEFAULT_CDP_PORT    = 9222
+DEFAULT_CDP_URL     = os.getenv("BROWSER_CDP_URL")  # 예: http://127.0.0.1:9222 (없으면 공유 서버 사용 안 함)
+DEFAULT_STATUS_PATH = os.getenv("BROWSER_SERVER_STATUS", "/opt/airflow/data/browser_server.json")
+
+
+# ── 헬스 체크 / 상태 파일 ────────────────────────────────────────
+
+def cdp_healthy(cdp_url, timeout=2) -> bool:
+    """CDP 엔드포인트가 응답하고 웹소켓 주소를 내주는지 확인합니다."""
+    try:
+        response = requests.get(f"{cdp_url.rstrip('/')}/json/version", timeout=timeout)
+        return response.ok and "webSocketDebuggerUrl" in response.json()
+    except (requests.RequestException, ValueError):
+        return False
+
+
+def read_server_status(status_path=DEFAULT_STATUS_PATH) -> dict:
+    try:
+        return json.loads(Path(status_path).read_text(encoding="utf-8"))
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def _write_server_status(status_path, status):
+    path = Path(status_path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    with os.fdopen(fd, "w", encoding="utf-8") as file:
+        json.dump(status, file, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+# ── 태스크 쪽: 연결 또는 직접 실행 ───────────────────────────────
+
+def connect_or_launch(playwright, headless=True, cdp_url=DEFAULT_CDP_URL, status_path=DEFAULT_STATUS_PATH):
+    """
+    공유 서버에 연결하거나, 없으면 직접 Chromium을 띄웁니다.
+    반환: (browser, shared, elapsed_ms) — shared면 browser.close()는 연결만 끊습니다.
+    """
+    started = time.monotonic()
+
+    if cdp_url and cdp_healthy(cdp_url):
+        try:
+            browser    = playwright.chromium.connect_over_cdp(cdp_url)
+            elapsed_ms = (time.monotonic() - started) * 1000
+            launch_ms  = read_server_status(status_path).get("launch_ms")
+            saved      = f" → 콜드 스타트 {launch_ms:.0f}ms 대비 {launch_ms - elapsed_ms:.0f}ms 절약" if launch_ms else ""
+            print(f"[브라우저] 공유 서버 연결 {elapsed_ms:.0f}ms ({cdp_url}){saved}")
+            return browser, True, elapsed_ms
+        except Exception as exc:
+            print(f"⚠️ 공유 브라우저 연결 실패 → 직접 실행: {exc}")
+    elif cdp_url:
+        print(f"⚠️ 공유 브라우저 헬스 체크 실패 → 직접 실행: {cdp_url}")
+
+    started    = time.monotonic()
+    browser    = playwright.chromium.launch(headless=headless)
+    elapsed_ms = (time.monotonic() - started) * 1000
+    print(f"[브라우저] 직접 실행 {elapsed_ms:.0f}ms")
+    return browser, False, elapsed_ms
+
+
+# ── 서버 쪽: 상주 + 헬스 체크 + 재시작 ───────────────────────────
+
+class BrowserServer:
+    """CDP 포트를 연 Chromium 하나를 띄워 두고, 죽으면 다시 띄웁니다."""
+
+    def __init__(self, playwright, port=DEFAULT_CDP_PORT, status_path=DEFAULT_STATUS_PATH):
+        self.playwright  = playwright
+        self.port        = port
+        self.cdp_url     = f"http://127.0.0.1:{port}"
+        self.status_path = status_path
+        self.browser     = None
+        self.relaunches  = 0
+
+    def launch(self):
+        started      = time.monotonic()
+        self.browser = self.playwright.chromium.launch(
+            headless=True,
+            args=[f"--remote-debugging-port={self.port}"],
+        )
+        # 포트가 실제로 응답할 때까지 대기 (최대 10초)
+        deadline = time.monotonic() + 10
+        while not cdp_healthy(self.cdp_url) and time.monotonic() < deadline:
+            time.sleep(0.2)
+        launch_ms = (time.monotonic() - started) * 1000
+
+        _write_server_status(self.status_path, {
+            "cdp_url":    self.cdp_url,
+            "pid":        os.getpid(),
+            "launch_ms":  round(launch_ms, 1),
+            "started_at": datetime.now().isoformat(timespec="seconds"),
+            "relaunches": self.relaunches,
+        })
+        print(f"[브라우저 서버] Chromium 실행 {launch_ms:.0f}ms → {self.cdp_url}")
+
+    def healthy(self) -> bool:
+        return self.browser is not None and self.browser.is_connected() and cdp_healthy(self.cdp_url)
+
+    def relaunch(self):
+        self.relaunches += 1
+        print(f"⚠️ [브라우저 서버] 헬스 체크 실패 → 재시작 ({self.relaunches}회째)")
+        try:
+            self.browser.close()
+        except Exception:
+            pass  # 이미 죽은 프로세스
+        self.launch()
+
+    def serve(self, check_interval=30):
+        self.launch()
+        while True:
+            time.sleep(check_interval)
+            if not self.healthy():
+                self.relaunch()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="브랜드 수집 태스크 공유 Chromium 서버")
+    parser.add_argument("--port", type=int, default=DEFAULT_CDP_PORT, help="CDP 포트")
+    parser.add_argument("--check-interval", type=int, default=30, help="헬스 체크 간격(초)")
+    parser.add_argument("--status-path", default=DEFAULT_STATUS_PATH, help="서버 상태 파일 경로")
+    args = parser.parse_args()
+
+    with sync_playwright() as playwright:
+        BrowserServer(playwright, port=args.port, status_path=args.status_path).serve(args.check_interval)
+
+
+if __name__ == "__main__":
+    main()
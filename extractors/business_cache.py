@@ -0,0 +1,131 @@
+"""
+business_cache.py
+
+비즈니스 계정 판정 결과를 실행·브랜드를 넘어 재사용하기 위한 로컬 파일 저장소입니다.
+
+classify_business_accounts는 처음 보는 계정마다 프로필 페이지를 방문하는데(1.5초+),
+같은 인플루언서가 여러 브랜드 DAG에 매일 반복해서 나옵니다.
+판정 결과를 JSON 파일에 TTL과 함께 남겨 두고 스크래퍼 시작 시 한 번에 읽어 오면,
+최근에 확인한 계정은 다시 방문하지 않습니다.
+
+항목 형식:
+  {insta_id: {"is_business": bool, "status": "ok" | "error", "checked_at": epoch seconds}}
+
+TTL:
+  - status="ok"    : ttl_days 동안 유효 (계정 성격은 자주 바뀌지 않음)
+  - status="error" : negative_ttl_hours 동안 유효 (일시적 실패는 짧게 기억 후 재확인)
+
+동시 저장:
+  여러 브랜드 태스크가 동시에 save()해도 서로의 판정을 덮어쓰지 않도록
+  옆의 잠금 파일({파일}.lock)에 flock을 잡은 채로 다시 읽기 → 합치기 → 교체합니다.
+"""
+
+import fcntl
+import json
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+
+DEFAULT_CACHE_PATH = os.getenv(
+    "BUSINESS_CACHE_PATH", "/opt/airflow/data/business_account_cache.json"
+)
+
+
+class BusinessVerdictStore:
+    """비즈니스 계정 판정 결과를 TTL과 함께 JSON 파일에 보관합니다."""
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, ttl_days=30, negative_ttl_hours=6):
+        self.path             = Path(path)
+        self.ttl_sec          = ttl_days * 86400
+        self.negative_ttl_sec = negative_ttl_hours * 3600
+        self.entries          = {}
+        self.dirty            = set()  # 이번 실행에서 새로 기록한 계정
+
+    def _is_fresh(self, entry, now) -> bool:
+        ttl = self.ttl_sec if entry.get("status") == "ok" else self.negative_ttl_sec
+        return now - entry.get("checked_at", 0) < ttl
+
+    def _read_file(self) -> dict:
+        try:
+            return json.loads(self.path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return {}
+        except ValueError as exc:
+            print(f"⚠️ 비즈니스 캐시 파일 손상 → 무시: {self.path} ({exc})")
+            return {}
+
+    @contextmanager
+    def _locked(self):
+        """잠금 파일에 배타 flock을 잡습니다. (다른 프로세스의 save가 끝날 때까지 대기)"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path.with_name(f"{self.path.name}.lock"), "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def preload(self) -> dict:
+        """
+        파일 전체를 읽고, 아직 유효한 판정만 {insta_id: bool} 딕셔너리로 반환합니다.
+        반환값은 classify_business_accounts의 세션 캐시로 그대로 사용합니다.
+        """
+        now          = time.time()
+        self.entries = self._read_file()
+        verdicts     = {
+            insta_id: bool(entry.get("is_business"))
+            for insta_id, entry in self.entries.items()
+            if self._is_fresh(entry, now)
+        }
+        print(f"[비즈니스 캐시] {len(verdicts)}/{len(self.entries)}개 계정 유효 판정 로드")
+        return verdicts
+
+    def put(self, insta_id, is_business):
+        """프로필 확인에 성공한 판정을 기록합니다."""
+        self.entries[insta_id] = {
+            "is_business": bool(is_business),
+            "status":      "ok",
+            "checked_at":  time.time(),
+        }
+        self.dirty.add(insta_id)
+
+    def put_failure(self, insta_id):
+        """프로필 확인에 실패한 계정을 짧은 TTL로 기록합니다 (그동안은 포함 처리)."""
+        self.entries[insta_id] = {
+            "is_business": False,
+            "status":      "error",
+            "checked_at":  time.time(),
+        }
+        self.dirty.add(insta_id)
+
+    def save(self):
+        """
+        이번 실행에서 기록한 항목을 파일에 합쳐 저장합니다.
+        다른 브랜드 태스크가 그사이 저장했을 수 있으므로 잠금을 잡은 채로 파일을 다시 읽고
+        계정별로 checked_at이 더 최신인 쪽을 남긴 뒤, 임시 파일 → rename으로 교체합니다.
+        """
+        if not self.dirty:
+            return
+
+        with self._locked():
+            merged = self._read_file()
+            for insta_id in self.dirty:
+                entry   = self.entries[insta_id]
+                current = merged.get(insta_id)
+                if current is None or current.get("checked_at", 0) <= entry["checked_at"]:
+                    merged[insta_id] = entry
+
+            # 만료된 지 오래된 항목은 정리
+            now    = time.time()
+            merged = {key: entry for key, entry in merged.items() if self._is_fresh(entry, now)}
+
+            fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, prefix=f".{self.path.name}.")
+            with os.fdopen(fd, "w", encoding="utf-8") as file:
+                json.dump(merged, file, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+
+        print(f"[비즈니스 캐시] {len(self.dirty)}개 계정 갱신 → {self.path} (총 {len(merged)}개)")
+        self.dirty.clear()
@@ -0,0 +1,108 @@
+"""
+checkpoint.py
+
+스크래퍼 진행 상황을 파일로 남겨, 타임아웃·브라우저 크래시 후 재시도가 처음부터 다시 하지 않게 합니다.
+
+파일 두 개를 씁니다 (path_prefix 기준):
+  - {prefix}.records.jsonl : 날짜·자기태그 필터를 통과한 게시물 한 줄씩 (append-only, 쓸 때마다 flush)
+                             비즈니스 계정 필터는 수집 마지막에 다시 적용되므로 여기에는 포함
+  - {prefix}.state.json    : 처리 끝난 URL, 스크롤 횟수, 연속 카운터 (주기적으로 통째로 교체)
+
+재시도 시 load()로 둘 다 읽어 오면, 이미 처리한 URL은 상세 페이지를 다시 열지 않고
+이미 수집한 게시물은 records 파일에서 그대로 복원합니다.
+extract 태스크가 수집 결과를 날짜별 Parquet 파일(util.write_posts_parquet)로 넘긴 뒤에는 clear()로 지웁니다.
+"""
+
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+
+
+class ScrapeCheckpoint:
+    """게시물 스트리밍 저장 + 진행 상태 체크포인트."""
+
+    def __init__(self, path_prefix, save_interval_sec=15):
+        prefix                 = Path(path_prefix)
+        self.records_path      = prefix.with_name(f"{prefix.name}.records.jsonl")
+        self.state_path        = prefix.with_name(f"{prefix.name}.state.json")
+        self.save_interval_sec = save_interval_sec
+        self._records_file     = None
+        self._last_saved       = 0.0
+
+    # ── 복원 ─────────────────────────────────────────────────────
+
+    def load(self):
+        """
+        이전 시도의 결과를 읽어 (posts, state)로 반환합니다. 없으면 ([], {}).
+        records 파일 마지막 줄이 쓰다 만 상태면 그 줄만 버립니다.
+        """
+        posts    = []
+        post_ids = set()
+
+        if self.records_path.exists():
+            for line in self.records_path.read_text(encoding="utf-8").splitlines():
+                try:
+                    post = tuple(json.loads(line))
+                except ValueError:
+                    print(f"⚠️ 체크포인트 레코드 손상 줄 무시: {line[:80]}")
+                    continue
+                if post[0] not in post_ids:
+                    post_ids.add(post[0])
+                    posts.append(post)
+
+        try:
+            state = json.loads(self.state_path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            state = {}
+        except ValueError as exc:
+            print(f"⚠️ 체크포인트 상태 파일 손상 → 무시: {self.state_path} ({exc})")
+            state = {}
+
+        if posts or state:
+            print(
+                f"[체크포인트] 이어서 수집: 게시물 {len(posts)}개"
+                f" / 처리된 URL {len(state.get('done_urls', []))}개"
+                f" / 스크롤 {state.get('scroll_count', 0)}회"
+            )
+        return posts, state
+
+    # ── 기록 ─────────────────────────────────────────────────────
+
+    def append(self, post):
+        """필터를 통과한 게시물 하나를 records 파일 끝에 씁니다."""
+        if self._records_file is None:
+            self.records_path.parent.mkdir(parents=True, exist_ok=True)
+            self._records_file = open(self.records_path, "a", encoding="utf-8")
+        self._records_file.write(json.dumps(list(post), ensure_ascii=False) + "\n")
+        self._records_file.flush()
+
+    def save_state(self, state, force=False):
+        """
+        진행 상태를 임시 파일 → rename으로 교체합니다.
+        force가 아니면 save_interval_sec에 한 번만 씁니다.
+        """
+        now = time.monotonic()
+        if not force and now - self._last_saved < self.save_interval_sec:
+            return
+
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.state_path.parent, prefix=f".{self.state_path.name}.")
+        with os.fdopen(fd, "w", encoding="utf-8") as file:
+            json.dump(state, file, ensure_ascii=False)
+        os.replace(tmp_path, self.state_path)
+        self._last_saved = now
+
+    def close(self):
+        if self._records_file is not None:
+            os.fsync(self._records_file.fileno())
+            self._records_file.close()
+            self._records_file = None
+
+    def clear(self):
+        """결과를 다른 곳에 옮긴 뒤 체크포인트 파일을 지웁니다."""
+        self.close()
+        for path in (self.records_path, self.state_path):
+            path.unlink(missing_ok=True)
+        print(f"[체크포인트] 정리 완료: {self.records_path.parent}")
@@ -0,0 +1,132 @@
+"""
+debug_capture.py
+
+상세 페이지 실패 시 남기는 디버그 아티팩트를 예산·샘플링 안에서만 저장합니다.
+
+예전에는 실패마다 full_page 스크린샷을 동기로 찍었는데, Instagram 쪽 장애로 실패가 몰리면
+수 초짜리 렌더링이 수십 번 반복돼 이미 느려진 실행을 더 느리게 만들었습니다.
+
+  - 예산: 실행당 max_total개, 실패 사유별 max_per_reason개까지만 저장
+  - 샘플링: 같은 사유는 sample_every번째 실패마다 하나씩 저장
+  - 기본 형식은 DOM 스냅샷(page.content() → .html.gz). 스크린샷은 mode="screenshot"일 때 화면 크기만
+  - 압축·파일 쓰기는 백그라운드 스레드에서 처리 (페이지 API 호출은 메인 흐름에서만)
+  - {debug_dir}/index.jsonl에 아티팩트 파일 ↔ 실패 사유·URL 매핑을 한 줄씩 기록
+"""
+
+import gzip
+import json
+import os
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+
+DEFAULT_DEBUG_DIR = os.getenv("INSTA_DEBUG_DIR", "/tmp/insta_debug")
+
+CAPTURE_MODES = ("dom", "screenshot")
+
+
+class DebugCapture:
+    """실패 아티팩트를 예산 안에서 비동기로 저장하고 index.jsonl에 기록합니다."""
+
+    def __init__(
+        self,
+        debug_dir=DEFAULT_DEBUG_DIR,
+        mode="dom",
+        max_total=20,
+        max_per_reason=5,
+        sample_every=1,
+    ):
+        if mode not in CAPTURE_MODES:
+            raise ValueError(f"지원하지 않는 캡처 형식: {mode} (가능: {', '.join(CAPTURE_MODES)})")
+
+        self.debug_dir      = Path(debug_dir)
+        self.index_path     = self.debug_dir / "index.jsonl"
+        self.mode           = mode
+        self.max_total      = max_total
+        self.max_per_reason = max_per_reason
+        self.sample_every   = max(1, sample_every)
+        self.failures       = Counter()  # 사유별 실패 수
+        self.captured       = Counter()  # 사유별 저장 수
+        self.skipped        = 0
+        self.capture_ms     = 0.0        # 메인 흐름에서 쓴 시간 (DOM/스크린샷 읽기)
+        self._executor      = ThreadPoolExecutor(max_workers=1, thread_name_prefix="debug-capture")
+        self._futures       = []
+
+    def _should_capture(self, reason) -> bool:
+        self.failures[reason] += 1
+        if sum(self.captured.values()) >= self.max_total:
+            return False
+        if self.captured[reason] >= self.max_per_reason:
+            return False
+        return (self.failures[reason] - 1) % self.sample_every == 0
+
+    def capture(self, page, url, reason):
+        """
+        실패한 페이지의 아티팩트를 예약합니다. 저장할 파일 경로를, 예산·샘플링에서 빠지면 None을 반환합니다.
+        파일은 백그라운드에서 쓰므로 반환 직후에는 아직 없을 수 있습니다.
+        """
+        if not self._should_capture(reason):
+            self.skipped += 1
+            return None
+
+        post_code = url.strip("/").split("/")[-1] if url else "unknown"
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        suffix    = ".html.gz" if self.mode == "dom" else ".png"
+        path      = self.debug_dir / f"{reason}_{post_code}_{timestamp}{suffix}"
+
+        started = time.monotonic()
+        try:
+            page_url = page.url
+            if self.mode == "dom":
+                data = page.content().encode("utf-8")
+            else:
+                data = page.screenshot(full_page=False)
+        except Exception as exc:
+            print(f"⚠️ 디버그 아티팩트 캡처 실패: {exc}")
+            return None
+        finally:
+            self.capture_ms += (time.monotonic() - started) * 1000
+
+        self.captured[reason] += 1
+        entry = {
+            "file":        path.name,
+            "reason":      reason,
+            "url":         url,
+            "page_url":    page_url,
+            "mode":        self.mode,
+            "captured_at": datetime.now().isoformat(timespec="seconds"),
+        }
+        self._futures.append(self._executor.submit(self._write, path, data, entry))
+        return str(path)
+
+    def _write(self, path, data, entry):
+        # 워커가 하나라 index.jsonl 쓰기 순서가 캡처 순서와 같음
+        self.debug_dir.mkdir(parents=True, exist_ok=True)
+        if self.mode == "dom":
+            data = gzip.compress(data, compresslevel=6)
+        path.write_bytes(data)
+
+        entry["bytes"] = len(data)
+        with open(self.index_path, "a", encoding="utf-8") as file:
+            file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+    def close(self):
+        """남은 쓰기를 마치고 요약을 출력합니다."""
+        self._executor.shutdown(wait=True)
+        write_fail = 0
+        for future in self._futures:
+            if future.exception() is not None:
+                write_fail += 1
+                print(f"⚠️ 디버그 아티팩트 저장 실패: {future.exception()}")
+        self._futures = []
+
+        if self.failures:
+            print(
+                f"[디버그 아티팩트] 실패 {sum(self.failures.values())}건"
+                f" / 저장 {sum(self.captured.values()) - write_fail}건"
+                f" / 예산·샘플링 제외 {self.skipped}건"
+                f" / 캡처 {self.capture_ms:.0f}ms → {self.index_path}"
+            )
@@ -0,0 +1,61 @@
+"""
+har_bundle.py
+
+실제 Instagram 없이 스크래퍼를 재현 가능하게 돌리기 위한 HAR 녹화/재생 번들입니다.
+
+번들 디렉터리 구성:
+  - capture.har.zip : 녹화 중 컨텍스트가 주고받은 www.instagram.com 요청/응답 (본문 포함)
+                      grid_page · 상세 탭 · profile_page가 모두 같은 컨텍스트라 한 파일에 담김
+  - meta.json       : 녹화 당시 brand_id, 수집 기간, 스크롤 설정
+
+녹화 : run(har_record_dir=...)  → 평소처럼 수집하면서 번들 저장
+재생 : run(har_replay_dir=...)  → 컨텍스트의 모든 요청을 번들에서 응답 (없는 요청은 abort)
+
+재생은 별도 서버 프로세스 대신 Playwright의 route_from_har로 컨텍스트 안에서 응답합니다.
+스크래퍼는 https://www.instagram.com URL을 그대로 쓰므로, 같은 URL을 가로채는 쪽이
+코드 수정 없이 collect_posts_with_scroll을 그대로 돌릴 수 있습니다.
+"""
+
+import json
+import re
+from datetime import datetime
+from pathlib import Path
+
+
+HAR_FILE_NAME  = "capture.har.zip"
+META_FILE_NAME = "meta.json"
+
+# 문서·API 응답만 녹화 (이미지 CDN은 번들 크기만 키우고 파싱에는 쓰이지 않음)
+HAR_URL_FILTER = re.compile(r"^https://www\.instagram\.com/")
+
+
+def record_context_options(bundle_dir) -> dict:
+    """녹화용 browser.new_context() 인자. 컨텍스트를 close()해야 파일이 써집니다."""
+    bundle_dir = Path(bundle_dir)
+    bundle_dir.mkdir(parents=True, exist_ok=True)
+    return {
+        "record_har_path":       str(bundle_dir / HAR_FILE_NAME),
+        "record_har_url_filter": HAR_URL_FILTER,
+        "record_har_content":    "attach",
+    }
+
+
+def attach_replay(context, bundle_dir):
+    """컨텍스트의 요청을 번들 HAR에서 응답하도록 연결합니다."""
+    har_path = Path(bundle_dir) / HAR_FILE_NAME
+    if not har_path.exists():
+        raise FileNotFoundError(f"HAR 번들 없음: {har_path}")
+    context.route_from_har(str(har_path), not_found="abort")
+    print(f"[HAR 재생] {har_path}")
+
+
+def write_bundle_meta(bundle_dir, **meta):
+    path = Path(bundle_dir) / META_FILE_NAME
+    meta = {"recorded_at": datetime.now().isoformat(timespec="seconds"), **meta}
+    path.write_text(json.dumps(meta, ensure_ascii=False, indent=2), encoding="utf-8")
+    print(f"[HAR 녹화] {Path(bundle_dir) / HAR_FILE_NAME} (+ {META_FILE_NAME})")
+
+
+def read_bundle_meta(bundle_dir) -> dict:
+    path = Path(bundle_dir) / META_FILE_NAME
+    return json.loads(path.read_text(encoding="utf-8"))
@@ -7,24 +7,59 @@ Playwright로 Instagram 브랜드 태그 페이지를 스크롤하며
 동작 흐름:
   1. 저장된 세션(storage_state.json)으로 로그인 상태 복원
   2. /{brand_id}/tagged/ 페이지로 이동
-  3. 스크롤하며 게시물 URL 수집 → 상세 페이지에서 날짜·태그·이미지 파싱
-  4. 필터 적용 (자기 태그 / 비즈니스 계정 제외)
-  5. target_day와 일치하는 게시물만 반환
+  3. 스크롤하며 게시물 URL 수집 → 상세 탭 풀(N개)에서 날짜·태그·이미지 파싱
+  4. 필터 적용 (자기 태그는 즉시, 비즈니스 계정은 수집 후 작성자별로 프로필 탭 여러 개에서 한 번에)
+  5. target_day(또는 date_from~date_to 기간)에 해당하는 게시물만 반환
 
 수집 필터:
   - 자기 태그 제외: 브랜드 본인이 올린 게시물은 제외
   - 비즈니스 계정 제외: 무신사·29cm 등 플랫폼, 편집샵 계정은 제외
 """
 
+import json
 import os
 import re
+import threading
 import time
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime, timezone, timedelta
 from pathlib import Path
+from types import SimpleNamespace
 
+import requests
+from requests.adapters import HTTPAdapter
+from bs4 import BeautifulSoup
 from dotenv import load_dotenv
 from playwright.sync_api import sync_playwright
 
+from extractors.browser_server import DEFAULT_CDP_URL, connect_or_launch
+from extractors.business_cache import DEFAULT_CACHE_PATH, BusinessVerdictStore
+from extractors.checkpoint import ScrapeCheckpoint
+from extractors.debug_capture import DEFAULT_DEBUG_DIR, DebugCapture
+from extractors.har_bundle import attach_replay, record_context_options, write_bundle_meta
+from extractors.profiler import PROFILE
+from extractors.session_pool import DEFAULT_SESSION_DIR, SessionPool
+from extractors.session_state import SessionState
+from extractors.resource_policy import ResourcePolicy
+from extractors.nav_scheduler import DEFAULT_NAV_PER_MINUTE, DEFAULT_RATE_DB, NavigationScheduler
+from extractors.readiness import (
+    WAIT_STATS,
+    evaluate_ready,
+    percentile,
+    wait_for_locator,
+    wait_for_selector,
+    wait_until,
+)
+from extractors.network_harvest import (
+    NetworkPostHarvester,
+    iter_media_records,
+    missing_fields,
+    record_post_date,
+    record_to_post_data,
+)
+
 
 load_dotenv()
 
@@ -47,6 +82,89 @@ DETAIL_READY_SCRIPT = """
 )
 """
 
+# 상세 페이지 본문까지 렌더링됐다고 볼 수 있는 조건 (날짜 time 요소와 게시물 이미지 alt)
+DETAIL_CONTENT_SCRIPT = """
+() => Boolean(
+    document.querySelector("time") &&
+    document.querySelector("main img[alt]")
+)
+"""
+
+# 프로필 페이지 헤더(카테고리 라벨·버튼 영역)가 그려졌는지
+PROFILE_READY_SCRIPT = """
+() => Boolean(document.querySelector("main header section, main header"))
+"""
+
+# 홈 화면이 뜨거나 로그인 페이지로 리다이렉트됐는지
+HOME_READY_SCRIPT = """
+() => location.pathname.startsWith("/accounts/login") ||
+      Boolean(document.querySelector("nav, [role='navigation'], main [role='main'], main"))
+"""
+
+# 로그인 폼 제출 후 로그인 페이지를 벗어났는지
+LOGIN_LEFT_SCRIPT = """
+() => !location.pathname.startsWith("/accounts/login")
+"""
+
+# 그리드에 새로 붙는 게시물 링크만 모아 두는 MutationObserver 수집기 (한 번만 설치)
+GRID_COLLECTOR_INSTALL_SCRIPT = """
+() => {
+    if (window.__postLinkCollector) return false;
+
+    const collector = { buffer: [], seen: new Set() };
+    const take = (el) => {
+        const raw = el.getAttribute && el.getAttribute("href");
+        if (!raw) return;
+        const href = raw.split("?")[0];
+        // 댓글 링크(/c/) 제외
+        if (!href.includes("/p/") || href.includes("/c/") || collector.seen.has(href)) return;
+        collector.seen.add(href);
+        collector.buffer.push(href);
+    };
+    const scan = (node) => {
+        if (node.nodeType !== 1) return;
+        if (node.matches("a[href*='/p/']")) take(node);
+        node.querySelectorAll("a[href*='/p/']").forEach(take);
+    };
+
+    scan(document.body);
+    collector.observer = new MutationObserver((mutations) => {
+        for (const mutation of mutations) {
+            if (mutation.type === "attributes") take(mutation.target);
+            mutation.addedNodes.forEach(scan);
+        }
+    });
+    collector.observer.observe(document.body, {
+        childList: true, subtree: true, attributes: true, attributeFilter: ["href"],
+    });
+
+    window.__postLinkCollector = collector;
+    return true;
+}
+"""
+
+# 수집기 버퍼를 비우고 새 링크 묶음을 반환 (수집기가 없으면 null)
+GRID_COLLECTOR_DRAIN_SCRIPT = """
+() => {
+    const collector = window.__postLinkCollector;
+    if (!collector) return null;
+    const links      = collector.buffer;
+    collector.buffer = [];
+    return { links, total: collector.seen.size };
+}
+"""
+
+GRID_COLLECTOR_PENDING_SCRIPT = """
+() => Boolean(window.__postLinkCollector && window.__postLinkCollector.buffer.length)
+"""
+
+GRID_AT_BOTTOM_SCRIPT = """
+() => window.innerHeight + window.scrollY >= document.documentElement.scrollHeight - 4
+"""
+
+# 팝업 닫기 버튼 라벨 ('나중에 하기' / 'Not Now')
+DIALOG_BUTTON_RE = re.compile(r"^(나중에 하기|Not Now)$")
+
 
 # ── 비즈니스 계정 필터 설정 ──────────────────────────────────────
 
@@ -95,55 +213,120 @@ def _is_self_tagged(insta_id: str, brand_id: str) -> bool:
     return insta_id.lower() == brand_id.lower()
 
 
-def check_is_business_account(
-    profile_page,
-    insta_id: str,
+def classify_business_accounts(
+    profile_pages,
+    insta_ids,
     cache: dict,
-) -> bool:
+    store: BusinessVerdictStore | None = None,
+    min_interval_ms=500,
+    ready_timeout_ms=5000,
+    scheduler=None,
+    on_login_redirect=None,
+) -> dict:
     """
-    계정이 비즈니스/편집샵 계정인지 확인합니다.
+    계정들이 비즈니스/편집샵 계정인지 한 번에 확인해 cache에 채웁니다.
+    게시물 수집이 끝난 뒤 후보 게시물의 작성자를 모아 한 번만 호출합니다.
 
-    확인 순서:
+    확인 순서 (계정별):
       1. cache에 이미 결과가 있으면 재사용 (같은 계정 반복 방문 없음)
       2. KNOWN_PLATFORM_ACCOUNTS에 포함되면 즉시 True
-      3. 프로필 페이지 방문 → 카테고리 라벨·쇼핑 버튼 키워드 탐지
+      3. 프로필 탭 여러 개에서 동시에 프로필 페이지 방문 → 카테고리 라벨·쇼핑 버튼 키워드 탐지
+
+    프로필 이동은 탭 전체를 통틀어 min_interval_ms 간격 이상으로만 시작합니다 (요청 속도 제한).
+    scheduler가 있으면 프로세스 간 이동 예산 토큰도 받아야 이동합니다.
 
     Args:
-        profile_page : 프로필 확인 전용 브라우저 탭
-        insta_id     : 확인할 계정 ID
-        cache        : {insta_id: bool} 세션 내 캐시 딕셔너리
+        profile_pages    : 프로필 확인 전용 브라우저 탭 목록
+        insta_ids        : 확인할 계정 ID (중복 가능)
+        cache            : {insta_id: bool} 캐시 딕셔너리 (store.preload() 결과로 시작 가능)
+        store            : 프로필 방문 결과를 실행 간에 남길 BusinessVerdictStore (선택)
+        ready_timeout_ms : 프로필 헤더를 기다리는 최대 시간 (넘으면 그때까지 그려진 본문으로 판정)
+        scheduler        : 여러 브랜드 태스크가 공유하는 NavigationScheduler (선택)
+        on_login_redirect: 프로필 탭이 로그인으로 튕겼을 때 사유 문자열로 호출 (세션 풀 격리용, 선택)
+
+    반환: cache (insta_ids 전체의 판정이 채워진 상태)
     """
-    if insta_id == "unknown":
-        return False
-
-    if insta_id in cache:
-        return cache[insta_id]
-
-    # 알려진 플랫폼은 프로필 방문 없이 즉시 처리
-    if insta_id in KNOWN_PLATFORM_ACCOUNTS:
-        cache[insta_id] = True
-        return True
-
-    # 프로필 페이지 방문해서 키워드 탐지
-    try:
-        profile_page.goto(
-            f"https://www.instagram.com/{insta_id}/",
-            wait_until="domcontentloaded",
-        )
-        profile_page.wait_for_timeout(1500)
+    queue = deque()
+    for insta_id in dict.fromkeys(insta_ids):
+        if insta_id == "unknown" or insta_id in cache:
+            continue
+        # 알려진 플랫폼은 프로필 방문 없이 즉시 처리
+        if insta_id in KNOWN_PLATFORM_ACCOUNTS:
+            cache[insta_id] = True
+            continue
+        queue.append(insta_id)
+
+    if not queue:
+        return cache
+
+    print(f"[비즈니스 확인] 프로필 {len(queue)}개 / 탭 {len(profile_pages)}개")
+
+    def judge(slot):
+        insta_id = slot.url
+        try:
+            if slot.error is not None:
+                raise slot.error
+            if "/accounts/login" in slot.page.url:
+                if scheduler is not None:
+                    scheduler.report_login_redirect()
+                if on_login_redirect is not None:
+                    on_login_redirect("프로필 로그인 리다이렉트")
+                raise RuntimeError(f"로그인으로 리다이렉트: {slot.page.url}")
+            if scheduler is not None:
+                scheduler.report_ok()
+
+            body_text = slot.page.evaluate("() => document.body.innerText").lower()
+            is_biz    = any(kw.lower() in body_text for kw in BUSINESS_INDICATOR_KEYWORDS)
+
+            cache[insta_id] = is_biz
+            if store is not None:
+                store.put(insta_id, is_biz)
+            if is_biz:
+                print(f"🏢 비즈니스 계정 감지 → 제외: @{insta_id}")
+
+        except Exception as exc:
+            print(f"⚠️ 프로필 확인 실패 ({insta_id}): {exc}")
+            cache[insta_id] = False  # 확인 못 하면 일단 포함
+            if store is not None:
+                store.put_failure(insta_id)  # 짧은 TTL 동안은 재방문하지 않음
+
+    slots         = [DetailSlot(page=page) for page in profile_pages]
+    last_dispatch = 0.0
+
+    while queue or any(slot.busy for slot in slots):
+        for slot in slots:
+            now = time.monotonic()
+
+            # 빈 탭: 속도 제한 안에서 다음 프로필로 이동 시작
+            if not slot.busy:
+                if (
+                    queue
+                    and (now - last_dispatch) * 1000 >= min_interval_ms
+                    and (scheduler is None or scheduler.try_acquire() <= 0)
+                ):
+                    slot.url, slot.started_at, last_dispatch = queue.popleft(), now, now
+                    try:
+                        slot.page.goto(f"https://www.instagram.com/{slot.url}/", wait_until="commit")
+                    except Exception as exc:
+                        slot.error = exc
+                continue
+
+            # 로드 중인 탭: 헤더가 뜨거나 시간이 다 되면 판정
+            elapsed_ms = (now - slot.started_at) * 1000
+            if slot.error is None:
+                ready = evaluate_ready(slot.page, PROFILE_READY_SCRIPT)
+                if not ready and elapsed_ms < ready_timeout_ms:
+                    continue
+                WAIT_STATS.record("profile_ready", elapsed_ms, met=ready)
 
-        body_text = profile_page.evaluate("() => document.body.innerText").lower()
-        is_biz    = any(kw.lower() in body_text for kw in BUSINESS_INDICATOR_KEYWORDS)
+            judge(slot)
+            PROFILE.add("profile_check", elapsed_ms)
+            slot.url   = None
+            slot.error = None
 
-        cache[insta_id] = is_biz
-        if is_biz:
-            print(f"🏢 비즈니스 계정 감지 → 제외: @{insta_id}")
-        return is_biz
+        slots[0].page.wait_for_timeout(100)
 
-    except Exception as exc:
-        print(f"⚠️ 프로필 확인 실패 ({insta_id}): {exc}")
-        cache[insta_id] = False  # 확인 못 하면 일단 포함
-        return False
+    return cache
 
 
 # ── 로그인 관련 ──────────────────────────────────────────────────
@@ -161,44 +344,58 @@ def assert_logged_in(page):
 
 def wait_for_sessionid(page, timeout=20):
     """sessionid 쿠키가 생길 때까지 최대 timeout초 기다립니다."""
+    started  = time.monotonic()
     deadline = time.time() + timeout
 
     while time.time() < deadline:
         cookies = page.context.cookies()
         if any(cookie["name"] == "sessionid" for cookie in cookies):
+            WAIT_STATS.record("sessionid", (time.monotonic() - started) * 1000, met=True)
             return True
-        page.wait_for_timeout(500)
+        page.wait_for_timeout(200)
 
+    WAIT_STATS.record("sessionid", (time.monotonic() - started) * 1000, met=False)
     return False
 
 
-def dismiss_common_dialogs(page):
-    """'나중에 하기' 등 팝업이 뜨면 닫아줍니다."""
-    for label in ("나중에 하기", "Not Now"):
-        for _ in range(3):
-            try:
-                page.get_by_role("button", name=label).click(timeout=1500)
-                page.wait_for_timeout(500)
-            except Exception:
-                break
+def dismiss_common_dialogs(page, appear_timeout_ms=1500):
+    """
+    '나중에 하기' 등 팝업이 뜨면 닫아줍니다.
+    두 라벨을 한 번에 기다리고(최대 appear_timeout_ms), 클릭 후에는 버튼이 사라질 때까지만 기다립니다.
+    """
+    button = page.get_by_role("button", name=DIALOG_BUTTON_RE).first
 
+    for _ in range(3):
+        if not wait_for_locator(button, "dialog_appear", timeout_ms=appear_timeout_ms):
+            return
+        try:
+            button.click(timeout=1500)
+        except Exception:
+            return
+        wait_for_locator(button, "dialog_close", timeout_ms=1500, state="hidden")
+        appear_timeout_ms = 500  # 연달아 뜨는 팝업은 짧게만 확인
 
-def ensure_logged_in(page, login_url, username, password):
+
+def ensure_logged_in(page, login_url, username, password, scheduler=None):
     """홈에 접근했을 때 로그인 페이지로 튕기면 다시 로그인합니다."""
+    if scheduler is not None:
+        scheduler.wait_page(page)
     page.goto("https://www.instagram.com/", wait_until="domcontentloaded")
-    page.wait_for_timeout(1000)
+    wait_until(page, "home_ready", HOME_READY_SCRIPT, timeout_ms=5000)
 
     if "/accounts/login" in page.url:
         print("홈 접근이 로그인으로 리다이렉트 → 로그인 수행")
-        login(page, login_url, username, password)
+        login(page, login_url, username, password, scheduler)
         return
 
     dismiss_common_dialogs(page)
     assert_logged_in(page)
 
 
-def login(page, login_url, username, password):
+def login(page, login_url, username, password, scheduler=None):
     """Instagram 로그인 폼에 계정 정보를 입력하고 로그인합니다."""
+    if scheduler is not None:
+        scheduler.wait_page(page)
     page.goto(login_url, wait_until="domcontentloaded")
 
     page.wait_for_selector("input[name='username'], input[name='email']")
@@ -213,23 +410,78 @@ def login(page, login_url, username, password):
         page.fill("input[name='password']", password)
         page.click("button[type='submit']")
 
-    page.wait_for_timeout(3000)
+    wait_until(page, "login_submit", LOGIN_LEFT_SCRIPT, timeout_ms=15000)
     dismiss_common_dialogs(page)
-    page.wait_for_timeout(3000)
-
-    assert_logged_in(page)
-    print("✅ 로그인 성공:", page.url)
 
     if not wait_for_sessionid(page, timeout=20):
         cookie_names = sorted({c["name"] for c in page.context.cookies()})
         raise RuntimeError(f"sessionid 발급 실패. url={page.url}, cookies={cookie_names}")
 
+    assert_logged_in(page)
+    print("✅ 로그인 성공:", page.url)
+
 
 # ── 페이지 이동 ──────────────────────────────────────────────────
 
-def goto_tagged(page, brand_id):
+def open_tagged_with_session(page, brand_id, session, login_url, username, password, scheduler=None):
+    """
+    세션을 확인하고 tagged 페이지로 이동합니다. 로그인 단계 소요 시간은 PROFILE의 "login"에 남깁니다.
+
+    storage_state의 sessionid가 충분히 남아 있으면 홈 확인 없이 바로 tagged로 가고(빠른 경로),
+    그래도 로그인으로 튕기면 그때 로그인한 뒤 한 번 더 이동합니다.
+    여기서의 로그인 리다이렉트는 세션 만료라서 이동 예산 백오프 신호로 보내지 않습니다.
+    """
+    fresh, reason = session.check()
+    print(f"[세션] {'빠른 경로' if fresh else '홈 확인'} — {reason}")
+
+    if not fresh:
+        with PROFILE.phase("login"):
+            ensure_logged_in(page, login_url, username, password, scheduler)
+        goto_tagged(page, brand_id, scheduler)
+        return
+
+    try:
+        goto_tagged(page, brand_id, scheduler)
+    except RuntimeError:
+        if "/accounts/login" not in page.url:
+            raise
+        print("빠른 경로에서 로그인으로 리다이렉트 → 로그인 후 재시도")
+        with PROFILE.phase("login"):
+            login(page, login_url, username, password, scheduler)
+        goto_tagged(page, brand_id, scheduler)
+
+
+def open_tagged_with_pool(page, brand_id, session_pool, lease, scheduler=None):
+    """
+    세션 풀에서 빌린 계정으로 tagged 페이지로 이동합니다.
+    로그인으로 튕기면 그 계정을 격리하고, 다음 계정의 쿠키로 바꿔 끼운 뒤 다시 이동합니다.
+    계정마다 비밀번호가 달라 재로그인은 하지 않습니다. 실제로 쓴 대여 (name, state_path, lease_id)를 반환합니다.
+    """
+    tried = set()
+    while True:
+        name, _, lease_id = lease
+        tried.add(name)
+        try:
+            goto_tagged(page, brand_id, scheduler)
+            return lease
+        except RuntimeError:
+            if "/accounts/login" not in page.url:
+                raise
+
+        session_pool.release(name, lease_id)
+        session_pool.quarantine(name, "tagged 로그인 리다이렉트")
+        lease = session_pool.acquire(exclude=tried)  # 남은 계정이 없으면 NoHealthySession
+
+        state = json.loads(Path(lease[1]).read_text(encoding="utf-8"))
+        page.context.clear_cookies()
+        page.context.add_cookies(state.get("cookies", []))
+
+
+def goto_tagged(page, brand_id, scheduler=None):
     """브랜드의 tagged 페이지로 이동하고 게시물 링크가 보일 때까지 기다립니다."""
     tagged_url = f"https://www.instagram.com/{brand_id}/tagged/"
+    if scheduler is not None:
+        scheduler.wait_page(page)
     page.goto(tagged_url, wait_until="domcontentloaded")
     page.wait_for_load_state("domcontentloaded")
     print("tagged 이동 후 URL:", page.url)
@@ -241,18 +493,146 @@ def goto_tagged(page, brand_id):
     page.wait_for_selector("a[href*='/p/']", timeout=10000)
 
 
-def open_post_detail_page(detail_page, url):
-    """상세 페이지로 이동하고 og 메타 또는 time 태그가 로드될 때까지 기다립니다."""
-    detail_url = f"https://www.instagram.com{url}"
-    detail_page.goto(detail_url, wait_until="domcontentloaded")
-    detail_page.wait_for_load_state("domcontentloaded")
+# ── 상세 탭 풀 ───────────────────────────────────────────────────
+
+@dataclass
+class DetailSlot:
+    """상세 탭 하나와 그 탭에서 로드 중인 게시물 정보."""
+    page:       object
+    seq:        int | None = None
+    url:        str | None = None
+    started_at: float = 0.0
+    ready_at:   float | None = None
+    error:      Exception | None = None
+
+    @property
+    def busy(self) -> bool:
+        return self.url is not None
+
 
-    if "/accounts/login" in detail_page.url:
-        raise RuntimeError(f"상세 페이지 접근 실패(로그인으로 리다이렉트): {detail_page.url}")
+class DetailTabPool:
+    """
+    같은 브라우저 컨텍스트 안의 상세 탭 N개를 큐 방식으로 돌려 씁니다.
+
+    submit()으로 들어온 URL은 비어 있는 탭에 바로 이동을 걸어두고(wait_until="commit"),
+    next_ready()가 로드가 끝난 탭부터 꺼내 줍니다. 로드 완료는 두 단계로 봅니다:
+      1. detail_ready  : og 메타 또는 time 요소 등장 (ready_timeout_ms 안에 안 되면 실패)
+      2. detail_settle : time과 게시물 이미지 alt까지 렌더링 (최대 settle_ms, 넘으면 그대로 진행)
 
-    detail_page.wait_for_function(DETAIL_READY_SCRIPT, timeout=10000)
-    detail_page.wait_for_timeout(1500)
-    return detail_page.url
+    탭들이 브라우저 안에서 동시에 로드되므로 게시물마다 기다리던 네비게이션·렌더링 시간이 서로 겹칩니다.
+    결과는 완료 순서대로 나오므로 순서가 필요한 판단은 호출 측에서 seq로 맞춰야 합니다.
+    """
+
+    def __init__(
+        self, context, size, first_page=None, ready_timeout_ms=10000, settle_ms=1500, scheduler=None,
+        on_login_redirect=None,
+    ):
+        self.ready_timeout_ms  = ready_timeout_ms
+        self.settle_ms         = settle_ms
+        self.scheduler         = scheduler
+        self.on_login_redirect = on_login_redirect  # 로그인으로 튕긴 탭이 나오면 사유 문자열로 호출 (세션 풀 격리용)
+        self.queue             = deque()
+        self.slots             = []
+        self._owned_pages      = []  # 풀이 직접 연 탭 (close()에서 정리)
+
+        for index in range(max(1, size)):
+            if index == 0 and first_page is not None:
+                page = first_page
+            else:
+                page = context.new_page()
+                self._owned_pages.append(page)
+            self.slots.append(DetailSlot(page=page))
+
+    def submit(self, seq, url):
+        """URL을 대기열에 넣고, 비어 있는 탭이 있으면 바로 이동을 시작합니다."""
+        self.queue.append((seq, url))
+        self._dispatch()
+
+    def backlog(self) -> int:
+        """아직 탭에 배정되지 않은 URL 수."""
+        return len(self.queue)
+
+    def has_work(self) -> bool:
+        return bool(self.queue) or any(slot.busy for slot in self.slots)
+
+    def next_ready(self) -> DetailSlot:
+        """로드가 끝났거나(또는 실패한) 탭 하나를 반환합니다. 처리 후 release()를 호출해야 합니다."""
+        while True:
+            for slot in self.slots:
+                if slot.busy and self._is_done(slot):
+                    return slot
+            self._dispatch()  # 이동 예산 때문에 미뤄 둔 URL
+            self.slots[0].page.wait_for_timeout(100)
+
+    def release(self, slot):
+        """처리가 끝난 탭을 비우고 대기열의 다음 URL을 배정합니다."""
+        slot.seq      = None
+        slot.url      = None
+        slot.ready_at = None
+        slot.error    = None
+        self._dispatch()
+
+    def close(self):
+        for page in self._owned_pages:
+            page.close()
+
+    def _dispatch(self):
+        for slot in self.slots:
+            if not self.queue:
+                return
+            if slot.busy:
+                continue
+            if self.scheduler is not None and self.scheduler.try_acquire() > 0:
+                return  # 토큰이 없으면 다음 폴링 때 다시 시도
+
+            seq, url        = self.queue.popleft()
+            slot.seq        = seq
+            slot.url        = url
+            slot.started_at = time.monotonic()
+
+            try:
+                slot.page.goto(f"https://www.instagram.com{url}", wait_until="commit")
+            except Exception as exc:
+                slot.error = exc
+
+    def _is_done(self, slot) -> bool:
+        if slot.error is not None:
+            return True
+
+        now = time.monotonic()
+
+        # 2단계: 본문(time + 이미지 alt)이 그려질 때까지, 최대 settle_ms
+        if slot.ready_at is not None:
+            settle_ms = (now - slot.ready_at) * 1000
+            if evaluate_ready(slot.page, DETAIL_CONTENT_SCRIPT):
+                WAIT_STATS.record("detail_settle", settle_ms, met=True)
+                return True
+            if settle_ms >= self.settle_ms:
+                WAIT_STATS.record("detail_settle", settle_ms, met=False)
+                return True
+            return False
+
+        if "/accounts/login" in slot.page.url:
+            if self.scheduler is not None:
+                self.scheduler.report_login_redirect()
+            if self.on_login_redirect is not None:
+                self.on_login_redirect("상세 탭 로그인 리다이렉트")
+            slot.error = RuntimeError(f"상세 페이지 접근 실패(로그인으로 리다이렉트): {slot.page.url}")
+            return True
+
+        # 1단계: og 메타 또는 time 요소 등장
+        elapsed_ms = (now - slot.started_at) * 1000
+        if evaluate_ready(slot.page, DETAIL_READY_SCRIPT):
+            WAIT_STATS.record("detail_ready", elapsed_ms, met=True)
+            slot.ready_at = now
+            if self.scheduler is not None:
+                self.scheduler.report_ok()
+        elif elapsed_ms >= self.ready_timeout_ms:
+            WAIT_STATS.record("detail_ready", elapsed_ms, met=False)
+            slot.error = TimeoutError(f"상세 페이지 로드 시간 초과 ({self.ready_timeout_ms}ms)")
+            return True
+
+        return False
 
 
 # ── 데이터 파싱 ──────────────────────────────────────────────────
@@ -265,7 +645,8 @@ def parse_post_date_kst(page, kst):
     """
     # 1순위: time 태그
     try:
-        page.wait_for_selector("time", state="visible", timeout=8000)
+        if not wait_for_selector(page, "post_time", "time", timeout_ms=8000):
+            raise TimeoutError("time 요소 없음")
         dt_str = page.locator("time").first.get_attribute("datetime")
 
         if dt_str:
@@ -286,19 +667,105 @@ def parse_post_date_kst(page, kst):
         )
         """
     )
-    match = re.search(r"([A-Z][a-z]+ \d{1,2}, \d{4})", meta_desc)
+    post_date_str = parse_meta_date(meta_desc, kst)
+    if post_date_str:
+        print(f"게시물 날짜(메타 폴백): {post_date_str}")
+    return post_date_str
+
+
+def parse_meta_date(meta_desc, kst):
+    """og:description 텍스트의 'Month D, YYYY' 날짜를 'YYYY-MM-DD'로 바꿉니다. 없으면 None."""
+    match = re.search(r"([A-Z][a-z]+ \d{1,2}, \d{4})", meta_desc or "")
     if not match:
         return None
 
-    post_date_str = (
+    return (
         datetime.strptime(match.group(1), "%B %d, %Y")
         .replace(tzinfo=kst)
         .strftime("%Y-%m-%d")
     )
-    print(f"게시물 날짜(메타 폴백): {post_date_str}")
+
+
+# 상세 페이지에서 필요한 값(time, og 메타, 이미지 alt)을 evaluate 한 번으로 모두 읽는 스크립트.
+# 반환 형식을 바꾸면 DETAIL_EXTRACT_VERSION을 올리고 DetailSnapshot도 같이 맞춥니다.
+DETAIL_EXTRACT_VERSION = 1
+DETAIL_EXTRACT_SCRIPT  = """
+() => {
+    const meta = (selector) => document.querySelector(selector)?.getAttribute("content") || "";
+    const time = document.querySelector("time");
+    return {
+        version:    __VERSION__,
+        datetime:   time ? time.getAttribute("datetime") : null,
+        meta_title: meta('meta[property="og:title"]'),
+        meta_desc:  meta('meta[property="og:description"]') || meta('meta[name="description"]'),
+        og_image:   meta('meta[property="og:image"]'),
+        images:     Array.from(document.querySelectorAll("main img"))
+            .map((img) => ({ alt: img.getAttribute("alt") || "", src: img.getAttribute("src") || "" }))
+            .filter((item) => item.alt.startsWith("Photo by ") || item.alt.startsWith("Photo shared by ")),
+    };
+}
+""".replace("__VERSION__", str(DETAIL_EXTRACT_VERSION))
+
+
+@dataclass(frozen=True)
+class DetailSnapshot:
+    """DETAIL_EXTRACT_SCRIPT가 돌려준 상세 페이지 값 묶음."""
+    version:    int
+    datetime:   str | None
+    meta_title: str
+    meta_desc:  str
+    og_image:   str
+    images:     tuple  # ({"alt": str, "src": str}, ...)
+
+    @classmethod
+    def from_payload(cls, payload) -> "DetailSnapshot":
+        if payload.get("version") != DETAIL_EXTRACT_VERSION:
+            raise ValueError(
+                f"추출 스크립트 버전 불일치: {payload.get('version')} != {DETAIL_EXTRACT_VERSION}"
+            )
+        return cls(
+            version=payload["version"],
+            datetime=payload.get("datetime") or None,
+            meta_title=payload.get("meta_title") or "",
+            meta_desc=payload.get("meta_desc") or "",
+            og_image=payload.get("og_image") or "",
+            images=tuple(payload.get("images") or ()),
+        )
+
+
+def read_detail_snapshot(page) -> DetailSnapshot:
+    """상세 페이지 값을 evaluate 한 번으로 읽어 DetailSnapshot으로 반환합니다."""
+    return DetailSnapshot.from_payload(page.evaluate(DETAIL_EXTRACT_SCRIPT))
+
+
+def snapshot_post_date(snapshot, kst):
+    """
+    DetailSnapshot에서 게시물 날짜를 KST 기준 'YYYY-MM-DD'로 꺼냅니다.
+    parse_post_date_kst와 같은 순서: <time datetime> → og:description 날짜
+    """
+    if snapshot.datetime:
+        try:
+            post_dt_utc   = datetime.fromisoformat(snapshot.datetime.replace("Z", "+00:00"))
+            post_date_str = post_dt_utc.astimezone(kst).strftime("%Y-%m-%d")
+            print(f"게시물 날짜: {post_date_str}")
+            return post_date_str
+        except ValueError:
+            pass
+
+    post_date_str = parse_meta_date(snapshot.meta_desc, kst)
+    if post_date_str:
+        print(f"게시물 날짜(메타 폴백): {post_date_str}")
     return post_date_str
 
 
+def snapshot_post_data(snapshot, href):
+    """DetailSnapshot에서 extract_post_data와 같은 게시물 데이터 튜플을 만듭니다."""
+    tags, image_src = tags_from_image_alts(snapshot.images)
+    return build_post_data(
+        href, snapshot.meta_title, snapshot.meta_desc, snapshot.og_image or image_src, tags
+    )
+
+
 def extract_insta_id(href, meta_desc):
     """URL 경로 또는 og:description에서 계정 ID를 추출합니다."""
     path_parts = [part for part in href.split("/") if part] if href else []
@@ -363,15 +830,33 @@ def extract_post_data(page, href):
         """
     )
 
-    tags = []
+    tags, image_src = tags_from_image_alts(image_candidates)
+    return build_post_data(href, meta_title, meta_desc, src or image_src, tags)
+
+
+def tags_from_image_alts(image_candidates):
+    """
+    'Photo by ...' 이미지 alt 목록에서 @멘션 태그를 뽑습니다.
+    반환: (태그 리스트, 첫 번째 이미지 src — og:image가 없을 때 대체용)
+    """
+    tags      = []
+    image_src = ""
     for item in image_candidates:
         found   = MENTION_RE.findall(item["alt"])
         cleaned = [tag.rstrip(".,!?:;") for tag in found]
         tags.extend(cleaned)
 
-        if not src and item["src"]:
-            src = item["src"]
+        if not image_src and item["src"]:
+            image_src = item["src"]
 
+    return tags, image_src
+
+
+def build_post_data(href, meta_title, meta_desc, src, tags):
+    """
+    메타 값과 태그 목록으로 게시물 데이터 튜플을 만듭니다.
+    (브라우저 상세 페이지와 HTTP 상세 조회가 같은 규칙을 쓰도록 공통화)
+    """
     # 중복 태그 제거 (순서 유지)
     seen = set()
     tags = [tag for tag in tags if not (tag in seen or seen.add(tag))]
@@ -385,46 +870,374 @@ def extract_post_data(page, href):
     return post_id, insta_id, insta_name, full_link, src, ",".join(tags), len(tags)
 
 
-def snapshot_post_urls(page):
-    """현재 화면에 보이는 게시물 URL을 중복 없이 반환합니다."""
-    hrefs = page.eval_on_selector_all(
-        "a[href*='/p/']",
-        "elements => elements.map(el => el.getAttribute('href'))",
-    )
+def install_post_link_collector(page):
+    """그리드 페이지에 게시물 링크 수집기(MutationObserver)를 설치합니다. 이미 있으면 그대로 둡니다."""
+    page.evaluate(GRID_COLLECTOR_INSTALL_SCRIPT)
+
+
+def drain_post_links(page):
+    """
+    지난 호출 이후 그리드에 새로 붙은 게시물 URL만 반환합니다.
+    반환: (새 URL 리스트(등장 순서), 지금까지 본 전체 URL 수)
+    """
+    batch = page.evaluate(GRID_COLLECTOR_DRAIN_SCRIPT)
+    if batch is None:
+        # 페이지가 다시 로드돼 수집기가 사라졌으면 다시 설치 (현재 화면 링크부터 다시 수집)
+        install_post_link_collector(page)
+        batch = page.evaluate(GRID_COLLECTOR_DRAIN_SCRIPT)
+
+    return batch["links"], batch["total"]
+
+
+# ── HTTP 상세 조회 (브라우저 렌더링 없이) ────────────────────────
+
+# 브라우저와 같은 HTML을 받기 위한 데스크톱 Chromium User-Agent
+HTTP_USER_AGENT = (
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36"
+)
 
-    seen       = set()
-    full_hrefs = []
 
-    for href in hrefs:
-        href = href.split("?")[0]
-        if "/c/" in href:  # 댓글 링크 제외
+class FetchPathStats:
+    """상세 조회 경로(http / browser)별 성공·실패 횟수와 지연 시간(ms)을 모읍니다."""
+
+    def __init__(self):
+        self.paths = {}  # {path: {"ok": int, "fail": int, "latency_ms": [float]}}
+
+    def record(self, path, ok, elapsed_ms):
+        stats = self.paths.setdefault(path, {"ok": 0, "fail": 0, "latency_ms": []})
+        stats["ok" if ok else "fail"] += 1
+        stats["latency_ms"].append(elapsed_ms)
+
+    def summary_lines(self) -> list[str]:
+        lines = []
+        for path, stats in self.paths.items():
+            total   = stats["ok"] + stats["fail"]
+            latency = stats["latency_ms"]
+            lines.append(
+                f"{path:<8}: 성공 {stats['ok']}/{total}건"
+                f" | p50 {percentile(latency, 50):.0f}ms"
+                f" | p95 {percentile(latency, 95):.0f}ms"
+            )
+        return lines
+
+
+def load_storage_cookies(session, state_path):
+    """Playwright storage_state.json의 쿠키를 requests 세션에 옮겨 담습니다."""
+    state = json.loads(Path(state_path).read_text(encoding="utf-8"))
+
+    for cookie in state.get("cookies", []):
+        session.cookies.set(
+            cookie["name"],
+            cookie["value"],
+            domain=cookie.get("domain"),
+            path=cookie.get("path", "/"),
+        )
+
+
+def find_embedded_record(soup, post_id):
+    """HTML에 박혀 있는 JSON 스크립트에서 해당 게시물 레코드를 찾습니다. 없으면 None."""
+    for script in soup.find_all("script", attrs={"type": "application/json"}):
+        try:
+            payload = json.loads(script.string or "")
+        except ValueError:
             continue
-        if href not in seen:
-            seen.add(href)
-            full_hrefs.append(href)
 
-    return full_hrefs
+        for record in iter_media_records(payload):
+            if record["post_id"] == post_id:
+                return record
+
+    return None
 
 
-# ── 디버그 ───────────────────────────────────────────────────────
+def parse_detail_html(html, href, kst, window):
+    """
+    상세 페이지 HTML 문서(렌더링 전)에서 inspect_detail_slot과 같은 결과 dict를 만듭니다.
+    메타 태그는 extract_post_data와 같은 규칙(build_post_data)으로 해석합니다.
 
-def save_debug_artifact(page, url, reason, debug_dir="/tmp/insta_debug"):
-    """실패한 게시물의 스크린샷을 저장합니다."""
-    Path(debug_dir).mkdir(parents=True, exist_ok=True)
-    post_code       = url.strip("/").split("/")[-1] if url else "unknown"
-    timestamp       = datetime.now().strftime("%Y%m%d_%H%M%S")
-    screenshot_path = os.path.join(debug_dir, f"{reason}_{post_code}_{timestamp}.png")
+    렌더링 전 HTML에는 <time>과 이미지 alt가 없으므로
+      - 날짜: 내장 JSON의 taken_at → og:description 날짜 순으로 사용
+      - 태그: 내장 JSON의 usertags 사용
+    필요한 값을 못 찾으면 None을 반환하고, 호출 측이 브라우저 상세 페이지로 넘깁니다.
+    """
+    soup = BeautifulSoup(html, "lxml")
 
-    try:
-        page.screenshot(path=screenshot_path, full_page=True)
-        return screenshot_path
-    except Exception as exc:
-        print(f"⚠️ 스크린샷 저장 실패: {exc}")
+    def meta(attr, value):
+        tag = soup.find("meta", attrs={attr: value})
+        return (tag.get("content") or "") if tag else ""
+
+    meta_title = meta("property", "og:title")
+    meta_desc  = meta("property", "og:description") or meta("name", "description")
+    src        = meta("property", "og:image")
+
+    post_match = POST_URL_RE.search(href)
+    record     = find_embedded_record(soup, post_match.group(1)) if post_match else None
+
+    if record is not None and record.get("taken_at") is not None:
+        post_date = record_post_date(record, kst)
+    else:
+        post_date = parse_meta_date(meta_desc, kst)
+
+    if post_date is None:
         return None
 
+    kind = classify_post_date(post_date, window)
+    if kind != "candidate":
+        return {"kind": kind, "url": href, "post_date": post_date}
+
+    if record is None or record.get("tagged_ids") is None or not (src or record.get("img_src")):
+        return None
+
+    tags      = [f"@{name}" for name in record["tagged_ids"]]
+    post_data = build_post_data(href, meta_title, meta_desc, src or record["img_src"], tags)
+    if post_data[1] == "unknown":
+        return None
+
+    return {"kind": "candidate", "url": href, "post_date": post_date, "post_data": post_data}
+
+
+class HttpDetailFetcher:
+    """
+    /p/<shortcode>/ HTML 문서만 받아오는 가벼운 상세 조회기입니다.
+
+    storage_state.json 쿠키를 실은 requests 세션 하나(커넥션 풀)를 스레드 풀이 공유하고,
+    submit()은 바로 future를 돌려주므로 여러 게시물을 동시에 요청할 수 있습니다.
+    future 결과는 (html 또는 None, 소요 ms) 입니다.
+
+    session_pool이 주어지면 격리되지 않은 계정마다 requests 세션을 하나씩 두고,
+    요청마다 처리 중인 요청이 가장 적은 계정으로 보냅니다. 로그인으로 튕긴 계정은 풀에서 격리하고
+    이번 실행에서도 더 쓰지 않습니다.
+    """
+
+    def __init__(self, state_path, workers=4, timeout=10, scheduler=None, session_pool=None):
+        self.timeout      = timeout
+        self.scheduler    = scheduler
+        self.session_pool = session_pool
+        self.inflight     = Counter()  # {계정: 처리 중인 요청 수}
+        self._lock        = threading.Lock()
+
+        state_paths   = session_pool.healthy_sessions() if session_pool is not None else {None: state_path}
+        self.sessions = {name: self._build_session(path, workers) for name, path in state_paths.items()}
+        self._built   = list(self.sessions.values())  # 격리로 빠진 세션도 close()에서 정리
+
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="http_detail")
+
+    @staticmethod
+    def _build_session(state_path, workers):
+        session = requests.Session()
+        session.headers.update({
+            "User-Agent":      HTTP_USER_AGENT,
+            "Accept":          "text/html,application/xhtml+xml",
+            "Accept-Language": "en-US,en;q=0.9",
+        })
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=workers)
+        session.mount("https://", adapter)
+        load_storage_cookies(session, state_path)
+        return session
+
+    def submit(self, url):
+        return self.executor.submit(self._fetch, url)
+
+    def _checkout(self):
+        with self._lock:
+            if not self.sessions:
+                return None, None
+            name = min(self.sessions, key=lambda key: self.inflight[key])
+            self.inflight[name] += 1
+            return name, self.sessions[name]
+
+    def _drop(self, name, reason):
+        with self._lock:
+            dropped = self.sessions.pop(name, None) is not None
+        if dropped and self.session_pool is not None:
+            self.session_pool.quarantine(name, reason)
+
+    def _fetch(self, url):
+        started       = time.monotonic()
+        name, session = self._checkout()
+        if session is None:
+            return None, 0.0  # 모든 계정이 격리됨 → 브라우저 경로로
+
+        try:
+            if self.scheduler is not None:
+                self.scheduler.acquire()  # 워커 스레드라 그냥 잠들어도 됨
+            response = session.get(f"https://www.instagram.com{url}", timeout=self.timeout)
+            response.raise_for_status()
+            if "/accounts/login" in response.url:
+                if self.scheduler is not None:
+                    self.scheduler.report_login_redirect()
+                if name is not None:
+                    self._drop(name, "HTTP 상세 조회 로그인 리다이렉트")
+                raise RuntimeError(f"로그인으로 리다이렉트: {response.url}")
+            if self.scheduler is not None:
+                self.scheduler.report_ok()
+            if self.session_pool is not None:
+                self.session_pool.count(name, "http_ok")
+            return response.text, (time.monotonic() - started) * 1000
+        except Exception as exc:
+            print(f"⚠️ HTTP 상세 조회 실패: {url} — {exc}")
+            if self.session_pool is not None:
+                self.session_pool.count(name, "http_fail")
+            return None, (time.monotonic() - started) * 1000
+        finally:
+            with self._lock:
+                self.inflight[name] -= 1
+
+    def close(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        for session in self._built:
+            session.close()
+
 
 # ── 핵심 수집 루프 ───────────────────────────────────────────────
 
+def resolve_date_window(target_day=None, date_from=None, date_to=None):
+    """
+    수집 기간을 (date_from, date_to) 튜플로 정리합니다. 양 끝 포함, None이면 그쪽 제한 없음.
+    target_day가 있으면 그 하루짜리 기간입니다.
+    """
+    if target_day is not None:
+        if date_from is not None or date_to is not None:
+            raise ValueError("target_day와 date_from/date_to는 함께 쓸 수 없습니다")
+        return target_day, target_day
+
+    if date_from is not None and date_to is not None and date_from > date_to:
+        raise ValueError(f"date_from({date_from})이 date_to({date_to})보다 늦습니다")
+    return date_from, date_to
+
+
+def window_label(window) -> str | None:
+    """로그용 기간 표시 ('YYYY-MM-DD' 또는 'YYYY-MM-DD~YYYY-MM-DD')."""
+    date_from, date_to = window
+    if date_from == date_to:
+        return date_from
+    return f"{date_from or ''}~{date_to or ''}"
+
+
+def classify_post_date(post_date, window) -> str:
+    """
+    게시물 날짜를 수집 기간 기준으로 분류합니다.
+      - "past"      : date_from보다 오래됨 (연속 판단 대상)
+      - "other_day" : date_to보다 최근
+      - "candidate" : 기간 안
+    """
+    date_from, date_to = window
+    if date_from is not None and post_date < date_from:
+        return "past"
+    if date_to is not None and post_date > date_to:
+        return "other_day"
+    return "candidate"
+
+
+class SharedDetailCache:
+    """
+    배치 수집(run_batch)에서 브랜드 사이에 상세 조회 결과를 공유합니다.
+
+    여러 브랜드를 함께 태그한 게시물은 각 브랜드 tagged 그리드에 모두 나오는데,
+    처음 조회한 브랜드의 결과(날짜·작성자·태그·이미지)를 나머지 브랜드가 그대로 씁니다.
+    브랜드마다 다른 판단(자기 태그, 기존 적재 여부)은 결과를 가져간 쪽에서 다시 적용합니다.
+    """
+
+    def __init__(self):
+        self.results = {}         # {shortcode: 결과 dict}
+        self.owners  = {}         # {shortcode: 처음 조회한 brand_id}
+        self.hits    = Counter()  # {brand_id: 재사용 건수}
+
+    def get(self, shortcode, brand_id):
+        result = self.results.get(shortcode)
+        if result is not None:
+            self.hits[brand_id] += 1
+        return result
+
+    def put(self, shortcode, result, brand_id):
+        if shortcode not in self.results:
+            self.results[shortcode] = result
+            self.owners[shortcode]  = brand_id
+
+    def summary_lines(self) -> list[str]:
+        lines = [
+            f"공유 게시물 {len(self.results)}개 / 중복 상세 조회 생략 {sum(self.hits.values())}건"
+        ]
+        for brand_id, count in self.hits.most_common():
+            lines.append(f"  @{brand_id:<24} 다른 브랜드 결과 재사용 {count}건")
+        return lines
+
+
+def harvested_result(record, kst, window):
+    """네트워크 응답에서 모은 레코드를 inspect_detail_slot과 같은 결과 dict로 바꿉니다."""
+    url       = f"/p/{record['post_id']}/"
+    post_date = record_post_date(record, kst)
+    kind      = classify_post_date(post_date, window)
+    print(f"처리 중(네트워크): {url} | 목표: {window_label(window)} | 실제: {post_date}")
+
+    if kind != "candidate":
+        return {"kind": kind, "url": url, "post_date": post_date}
+
+    return {
+        "kind":      "candidate",
+        "url":       url,
+        "post_date": post_date,
+        "post_data": record_to_post_data(record),
+    }
+
+
+def inspect_detail_slot(slot, kst, window, debug_capture=None):
+    """
+    로드가 끝난 상세 탭 하나에서 날짜와 게시물 데이터를 읽어 결과 dict로 반환합니다.
+    탭을 다음 URL에 넘기기 전에 DOM을 읽어야 하므로 순서와 무관하게 바로 호출합니다.
+
+    반환 kind:
+      - "detail_fail" : 상세 페이지 열기/처리 실패
+      - "date_fail"   : 날짜 추출 실패
+      - "past"        : 수집 기간(window)보다 오래된 게시물
+      - "other_day"   : 수집 기간보다 최근 게시물
+      - "candidate"   : 날짜 통과 — post_data에 extract_post_data 결과
+
+    실패 시 debug_capture가 있으면 예산 안에서 디버그 아티팩트를 남깁니다.
+    """
+    url = slot.url
+    print(f"처리 중: {url}")
+
+    try:
+        if slot.error is not None:
+            raise slot.error
+
+        # 필요한 값을 evaluate 한 번으로 읽고, time이 아직 없을 때만 기다렸다가 다시 읽음
+        snapshot = read_detail_snapshot(slot.page)
+        if snapshot.datetime is None and wait_for_selector(slot.page, "post_time", "time", timeout_ms=8000):
+            snapshot = read_detail_snapshot(slot.page)
+
+        # 날짜 확인 (가장 먼저 체크 — 페이지 로드 후 빠르게 필터링)
+        post_date = snapshot_post_date(snapshot, kst)
+        if post_date is None:
+            artifact_path = debug_capture.capture(slot.page, url, "date_parse_fail") if debug_capture else None
+            print(f"⚠️ 날짜 추출 실패 → 스킵: {url}")
+            if artifact_path:
+                print(f"   디버그 아티팩트: {artifact_path}")
+            return {"kind": "date_fail", "url": url}
+
+        print(f"목표: {window_label(window)} | 실제: {post_date}")
+
+        kind = classify_post_date(post_date, window)
+        if kind != "candidate":
+            return {"kind": kind, "url": url, "post_date": post_date}
+
+        # 날짜 통과 → 상세 데이터 추출
+        return {
+            "kind":      "candidate",
+            "url":       url,
+            "post_date": post_date,
+            "post_data": snapshot_post_data(snapshot, url),
+        }
+
+    except Exception as exc:
+        artifact_path = debug_capture.capture(slot.page, url, "detail_open_fail") if debug_capture else None
+        print(f"❌ 상세 페이지 처리 실패: {url} — {exc}")
+        if artifact_path:
+            print(f"   디버그 아티팩트: {artifact_path}")
+        return {"kind": "detail_fail", "url": url}
+
+
 def collect_posts_with_scroll(
     grid_page,
     detail_page,
@@ -438,24 +1251,72 @@ def collect_posts_with_scroll(
     target_day,
     filter_self_tag=True,
     filter_business=True,
+    detail_tabs=1,
+    harvester=None,
+    http_fetcher=None,
+    business_store=None,
+    known_posts=None,
+    known_stop_streak=0,
+    date_from=None,
+    date_to=None,
+    checkpoint=None,
+    debug_capture=None,
+    profile_tabs=2,
+    profile_rate_ms=500,
+    business_cache=None,
+    shared_details=None,
+    scheduler=None,
+    on_login_redirect=None,
 ):
     """
     스크롤하며 게시물을 수집합니다.
 
+    그리드에서 찾은 신규 URL은 상세 탭 풀(DetailTabPool)의 대기열로 들어가고,
+    탭 detail_tabs개가 동시에 로드합니다. 탭별 결과는 완료 순서대로 나오지만
+    과거 게시물 연속 판단·필터·수집은 그리드 순서(seq)대로 다시 정렬해서 적용합니다.
+    비즈니스 계정 필터는 스크롤 중에 프로필을 열지 않고, 수집이 끝난 뒤 후보 게시물의 작성자를
+    모아 프로필 탭 profile_tabs개에서 동시에 확인한 다음 한 번에 걸러냅니다.
+    harvester가 주어지면 그리드 네트워크 응답에 필드가 모두 있는 게시물은 상세 탭을 열지 않습니다.
+    http_fetcher가 주어지면 나머지 게시물도 HTML 문서만 먼저 받아 보고, 해석에 실패한 것만 상세 탭으로 넘깁니다.
+
     Args:
+        detail_page      : 상세 페이지 탭 (풀의 첫 번째 탭으로 사용)
         profile_page     : 비즈니스 계정 확인 전용 탭 (filter_business=True일 때 사용)
+        profile_tabs     : 비즈니스 계정 확인에 쓸 프로필 탭 수 (profile_page 포함)
+        profile_rate_ms  : 프로필 이동 사이 최소 간격 (탭 전체 합산)
+        business_cache   : {insta_id: bool} 판정 캐시 (None이면 business_store.preload()로 시작)
+        shared_details   : SharedDetailCache — 배치 수집에서 다른 브랜드가 이미 조회한 게시물은 재사용
         filter_self_tag  : True면 브랜드 본인이 올린 게시물 제외
         filter_business  : True면 비즈니스/편집샵 계정 게시물 제외
+        detail_tabs      : 동시에 사용할 상세 탭 수 (1이면 기존처럼 한 탭씩 처리)
+        harvester        : grid_page에 attach된 NetworkPostHarvester (None이면 전부 상세 페이지)
+        http_fetcher     : HttpDetailFetcher (None이면 HTTP 경로를 쓰지 않음)
+        business_store   : 이미 preload된 BusinessVerdictStore (None이면 이번 실행 안에서만 캐시)
+        target_day       : 수집 대상 날짜 (date_from=date_to=target_day와 같음)
+        date_from/date_to: target_day 대신 기간으로 수집 (양 끝 포함) — 한 번 스크롤로 여러 날짜 수집
+        known_posts      : {post_id: 'YYYY-MM-DD'} 이미 적재된 게시물 — 날짜가 수집 기간 밖이면
+                           상세 페이지 없이 그 날짜로 판단 (과거 게시물 연속 판단에도 그대로 반영)
+        known_stop_streak: 이미 적재된 게시물이 이 횟수만큼 연속으로 나오면 종료 (0이면 사용 안 함)
+        checkpoint       : ScrapeCheckpoint — 수집 게시물을 바로 파일에 쓰고 진행 상태를 주기적으로 저장.
+                           이전 시도의 체크포인트가 있으면 처리된 URL은 건너뛰고 이어서 수집
+        debug_capture    : DebugCapture — 상세 실패 시 예산 안에서 아티팩트 저장 (None이면 저장 안 함)
+        scheduler        : NavigationScheduler — 상세·프로필 이동을 프로세스 간 공유 예산 안에서만 시작
+        on_login_redirect: 상세·프로필 탭이 로그인으로 튕겼을 때 사유 문자열로 호출 (세션 풀 격리용)
 
     종료 조건:
       - max_scrolls 횟수 초과
-      - 새 게시물이 3번 연속 없을 때 (그리드 끝 도달)
-      - target_day보다 오래된 게시물이 5번 연속 나올 때 (날짜 범위 벗어남)
+      - 새 게시물이 3번 연속 없을 때 (그리드 바닥에서는 2번 — 그리드 끝 도달)
+      - 기간 하한(date_from)보다 오래된 게시물이 5번 연속 나올 때 (날짜 범위 벗어남)
+      - 이미 적재된 게시물이 known_stop_streak번 연속 나올 때 (이전 수집 경계 도달)
     """
+    window           = resolve_date_window(target_day, date_from, date_to)
     posts            = []
     all_seen         = set()
-    business_cache   = {}    # {insta_id: bool} — 세션 내 비즈니스 계정 캐시
+    if business_cache is None:
+        business_cache = business_store.preload() if business_store else {}  # {insta_id: bool}
+    preloaded_cnt    = len(business_cache)
     past_date_streak = 0
+    known_streak     = 0
     no_change_count  = 0
     scroll_count     = 0
     detail_fail_cnt  = 0
@@ -463,110 +1324,376 @@ def collect_posts_with_scroll(
     filtered_cnt     = 0
     stop_early       = False
     stop_reason      = None
+    harvested_cnt    = 0     # 네트워크 응답만으로 처리한 게시물 수
+    detail_open_cnt  = 0     # 상세 탭으로 넘긴 게시물 수
+    known_skip_cnt   = 0     # 이미 적재돼 있어 상세 조회를 건너뛴 게시물 수
+    shared_hit_cnt   = 0     # 다른 브랜드가 이미 조회해 재사용한 게시물 수
+    fetch_stats      = FetchPathStats()
+
+    scroll_step      = scroll_y  # 새 링크가 잘 나오면 키우고, 덜 내려갔으면 더 크게
+    max_scroll_step  = scroll_y * 4
+
+    pool       = DetailTabPool(
+        detail_page.context, detail_tabs, first_page=detail_page,
+        scheduler=scheduler, on_login_redirect=on_login_redirect,
+    )
+    pending    = {}     # {seq: 결과 dict} — 순서가 맞을 때까지 대기하는 결과
+    seq_urls   = {}     # {seq: 그리드 URL}
+    next_seq   = 0      # 다음에 배정할 그리드 순번
+    apply_seq  = 0      # 다음에 순서대로 적용할 순번
+    done_urls  = set()  # 판단까지 끝난 URL (실패는 제외 — 재시도 때 다시 조회)
+    post_urls  = {}     # {post_id: 그리드 URL} — 비즈니스 필터 결과를 프로필에 남길 때 사용
+    post_ids   = set()  # 수집한 post_id (체크포인트 복원분 포함) — 같은 게시물을 두 번 담지 않음
+
+    # ── 이전 시도 체크포인트 복원 ────────────────────────────────
+    resume_scrolls = 0
+    if checkpoint is not None:
+        restored_posts, state = checkpoint.load()
+        posts.extend(restored_posts)
+        post_ids.update(post[0] for post in restored_posts)
+        done_urls.update(state.get("done_urls", []))
+        # records.jsonl에는 있지만 상태 저장 전에 끊긴 게시물도 처리된 것으로 봄
+        done_urls.update(post[5] for post in restored_posts if post[5])
+        all_seen.update(done_urls)
+        # 비즈니스 판정은 체크포인트에 두지 않음 — business_store가 저장하고 preload가 TTL을 적용
+        past_date_streak = state.get("past_date_streak", 0)
+        known_streak     = state.get("known_streak", 0)
+        resume_scrolls   = state.get("scroll_count", 0)
+
+    def save_checkpoint(force=False):
+        if checkpoint is None:
+            return
+        checkpoint.save_state(
+            {
+                "done_urls":        sorted(done_urls),
+                "scroll_count":     max(scroll_count, resume_scrolls),
+                "past_date_streak": past_date_streak,
+                "known_streak":     known_streak,
+            },
+            force=force,
+        )
 
-    while scroll_count < max_scrolls and not stop_early:
+    def apply_in_order():
+        """그리드 순서가 이어지는 결과부터 연속 과거 판단·필터·수집을 적용합니다."""
+        nonlocal past_date_streak, known_streak, filtered_cnt, stop_early, stop_reason, apply_seq
+
+        while not stop_early and apply_seq in pending:
+            result     = pending.pop(apply_seq)
+            url        = seq_urls.pop(apply_seq, result["url"])
+            apply_seq += 1
+            kind       = result["kind"]
+
+            # 이미 적재된 게시물 연속 감지 (이전 실행이 수집한 경계에 도달했는지)
+            if result.get("known"):
+                known_streak += 1
+                if known_stop_streak and known_streak >= known_stop_streak:
+                    print(f"{known_streak}번 연속 기존 적재 게시물 → 수집 종료")
+                    stop_early  = True
+                    stop_reason = f"known_streak>={known_stop_streak}"
+                    break
+            elif kind not in ("detail_fail", "date_fail"):
+                known_streak = 0
+
+            if kind in ("detail_fail", "date_fail"):
+                continue
+
+            # 배치 수집: 이 브랜드가 직접 조회한 결과는 다른 브랜드도 쓸 수 있게 공유
+            if shared_details is not None and not result.get("known") and not result.get("shared"):
+                post_match = POST_URL_RE.search(url)
+                if post_match:
+                    shared_details.put(post_match.group(1), result, brand_id)
+
+            if kind != "candidate":
+                done_urls.add(url)
+                PROFILE.mark_post(url, outcome=kind)
+
+            # 기간 하한보다 오래된 게시물 연속 감지
+            if kind == "past":
+                past_date_streak += 1
+                print(f"📌 {past_date_streak}번째 연속 과거 게시물")
+
+                if past_date_streak >= 5:
+                    print("5번 연속 과거 게시물 → 수집 종료")
+                    stop_early  = True
+                    stop_reason = "past_date_streak>=5"
+                continue
+
+            past_date_streak = 0
+
+            if kind == "other_day":
+                continue
+
+            post_id, insta_id, insta_name, full_link, src, insta_tag, tags_cnt = (
+                result["post_data"]
+            )
+
+            # ── 필터 1: 자기 태그 제외 ───────────────────────────
+            # 브랜드 계정이 자기 자신을 태그한 게시물은 수집 제외
+            if filter_self_tag and _is_self_tagged(insta_id, brand_id):
+                filtered_cnt += 1
+                done_urls.add(url)
+                PROFILE.mark_post(url, outcome="self_tag")
+                print(f"🔕 자기 태그 제외: @{insta_id}")
+                continue
+
+            # 체크포인트에서 복원했거나 이미 담은 게시물은 다시 담지 않음 (하루치 파일 post_id 중복 방지)
+            if post_id in post_ids:
+                done_urls.add(url)
+                PROFILE.mark_post(url, outcome="duplicate")
+                continue
+
+            # 필터 2(비즈니스 계정)는 스크롤이 끝난 뒤 작성자별로 한 번에 확인
+            post = (
+                post_id, insta_id, insta_name,
+                brand_name, brand_id,
+                full_link, src, result["post_date"],
+                insta_tag, tags_cnt,
+            )
+            posts.append(post)
+            post_ids.add(post_id)
+            if checkpoint is not None:
+                checkpoint.append(post)
+            done_urls.add(url)
+            post_urls[post_id] = url
+            PROFILE.mark_post(url, outcome="collected")
+            print(f"✅ 수집 완료 ({len(posts)}개): {full_link}")
+
+    def process_ready(until_backlog_empty):
+        """완료된 탭을 꺼내 처리합니다. until_backlog_empty면 대기열이 탭에 다 배정될 때까지만."""
+        nonlocal detail_fail_cnt, parsed_fail_cnt
+
+        while pool.has_work() and not stop_early:
+            if until_backlog_empty and pool.backlog() == 0:
+                return
+
+            with PROFILE.phase("tab_wait"):
+                slot = pool.next_ready()
+
+            # 탭 로드 시간: 이동 시작 → 1단계 준비 → 2단계 본문 렌더링
+            done_at  = time.monotonic()
+            ready_at = slot.ready_at or done_at
+            PROFILE.add("detail_ready", (ready_at - slot.started_at) * 1000, post=slot.url)
+            if slot.ready_at is not None:
+                PROFILE.add("detail_settle", (done_at - slot.ready_at) * 1000, post=slot.url)
+
+            with PROFILE.phase("detail_extract", post=slot.url):
+                result = inspect_detail_slot(slot, kst, window, debug_capture)
+            PROFILE.mark_post(slot.url, path="browser", outcome=result["kind"])
+
+            seq        = slot.seq
+            elapsed_ms = (time.monotonic() - slot.started_at) * 1000
+            pool.release(slot)
+
+            fetch_stats.record(
+                "browser", result["kind"] not in ("detail_fail", "date_fail"), elapsed_ms
+            )
+
+            if result["kind"] == "detail_fail":
+                detail_fail_cnt += 1
+            elif result["kind"] == "date_fail":
+                parsed_fail_cnt += 1
 
-        # ── 현재 화면의 게시물 URL 스냅샷 ──────────────────────────
-        urls         = snapshot_post_urls(grid_page)
-        new_urls     = [url for url in urls if url not in all_seen]
-        before_count = len(all_seen)
+            pending[seq] = result
+            apply_in_order()
 
-        print(f"[스크롤 {scroll_count}] 전체: {len(urls)}개 / 신규: {len(new_urls)}개")
+    def resolve_http_jobs(jobs):
+        """HTTP 상세 조회 결과를 해석하고, 실패한 게시물은 상세 탭 풀로 넘깁니다."""
+        nonlocal detail_open_cnt
 
-        # ── 신규 게시물 처리 ────────────────────────────────────────
-        for url in new_urls:
-            all_seen.add(url)
+        for seq, url, future in jobs:
+            with PROFILE.phase("http_wait"):
+                html, elapsed_ms = future.result()
+            PROFILE.add("http_fetch", elapsed_ms, post=url)
+            result = None
 
-            try:
-                print(f"처리 중: {url}")
-                open_post_detail_page(detail_page, url)
-
-                # 날짜 확인 (가장 먼저 체크 — 페이지 로드 후 빠르게 필터링)
-                post_date = parse_post_date_kst(detail_page, kst)
-                if post_date is None:
-                    parsed_fail_cnt += 1
-                    screenshot_path  = save_debug_artifact(detail_page, url, "date_parse_fail")
-                    print(f"⚠️ 날짜 추출 실패 → 스킵: {url}")
-                    if screenshot_path:
-                        print(f"   디버그 스크린샷: {screenshot_path}")
-                    continue
+            if html is not None:
+                try:
+                    with PROFILE.phase("http_parse", post=url):
+                        result = parse_detail_html(html, url, kst, window)
+                except Exception as exc:
+                    print(f"⚠️ HTTP 상세 해석 실패: {url} — {exc}")
 
-                print(f"목표: {target_day} | 실제: {post_date}")
+            fetch_stats.record("http", result is not None, elapsed_ms)
+            PROFILE.mark_post(url, path="http", outcome=result["kind"] if result else "http_fail")
 
-                # target_day보다 오래된 게시물 연속 감지
-                if target_day is not None and post_date < target_day:
-                    past_date_streak += 1
-                    print(f"📌 {past_date_streak}번째 연속 과거 게시물")
+            if result is None:
+                detail_open_cnt += 1
+                pool.submit(seq, url)
+                continue
 
-                    if past_date_streak >= 5:
-                        print("5번 연속 과거 게시물 → 수집 종료")
-                        stop_early  = True
-                        stop_reason = "past_date_streak>=5"
-                        break
+            print(f"처리 중(HTTP): {url} | 목표: {window_label(window)} | 실제: {result['post_date']}")
+            pending[seq] = result
+
+        apply_in_order()
 
+    install_post_link_collector(grid_page)
+
+    try:
+        while scroll_count < max_scrolls and not stop_early:
+
+            # ── 지난 스크롤 이후 새로 붙은 게시물 URL ──────────────────
+            with PROFILE.phase("grid_drain"):
+                links, total = drain_post_links(grid_page)
+            new_urls     = [url for url in links if url not in all_seen]
+
+            print(
+                f"[스크롤 {scroll_count}] 전체: {total}개 / 신규: {len(new_urls)}개"
+                f" / 스크롤 간격: {scroll_step}px"
+            )
+
+            if harvester is not None:
+                with PROFILE.phase("harvest_drain"):
+                    harvester.drain()
+
+            # ── 신규 게시물: 네트워크 레코드 → HTTP 조회 → 상세 탭 풀 순서로 처리 ──
+            http_jobs = []
+            for url in new_urls:
+                all_seen.add(url)
+                seq           = next_seq
+                seq_urls[seq] = url
+                next_seq     += 1
+
+                post_match = POST_URL_RE.search(url)
+                shortcode  = post_match.group(1) if post_match else None
+                known_date = known_posts.get(shortcode) if known_posts and shortcode else None
+
+                # 체크포인트에서 복원한 게시물이 다른 형태의 URL로 다시 나온 경우
+                if shortcode in post_ids:
+                    done_urls.add(url)
+                    continue
+
+                # 이미 적재된 게시물은 저장된 날짜로 판단 (수집 기간 안의 게시물만 다시 조회)
+                if known_date is not None and classify_post_date(known_date, window) != "candidate":
+                    known_skip_cnt += 1
+                    PROFILE.mark_post(url, path="known")
+                    print(f"처리 중(기존 적재): {url} | 목표: {window_label(window)} | 실제: {known_date}")
+                    pending[seq] = {
+                        "kind":      classify_post_date(known_date, window),
+                        "url":       url,
+                        "post_date": known_date,
+                        "known":     True,
+                    }
+                    apply_in_order()
+                    if stop_early:
+                        break
                     continue
 
-                past_date_streak = 0
+                shared = shared_details.get(shortcode, brand_id) if shared_details and shortcode else None
 
-                if target_day is not None and post_date != target_day:
+                if shared is not None:
+                    shared_hit_cnt += 1
+                    PROFILE.mark_post(url, path="shared")
+                    print(f"처리 중(다른 브랜드 조회 결과): {url} | 목표: {window_label(window)} | 실제: {shared['post_date']}")
+                    pending[seq] = {**shared, "url": url, "shared": True}
+                    apply_in_order()
+                    if stop_early:
+                        break
                     continue
 
-                # 날짜 통과 → 상세 데이터 추출
-                post_id, insta_id, insta_name, full_link, src, insta_tag, tags_cnt = (
-                    extract_post_data(detail_page, url)
-                )
+                record = harvester.lookup(shortcode) if harvester and shortcode else None
 
-                # ── 필터 1: 자기 태그 제외 ───────────────────────────
-                # 브랜드 계정이 자기 자신을 태그한 게시물은 수집 제외
-                if filter_self_tag and _is_self_tagged(insta_id, brand_id):
-                    filtered_cnt += 1
-                    print(f"🔕 자기 태그 제외: @{insta_id}")
+                if record is not None and not missing_fields(record):
+                    harvested_cnt += 1
+                    PROFILE.mark_post(url, path="network")
+                    pending[seq]   = harvested_result(record, kst, window)
+                    apply_in_order()
+                    if stop_early:
+                        break
                     continue
 
-                # ── 필터 2: 비즈니스/편집샵 계정 제외 ──────────────
-                # 무신사·29cm 등 플랫폼, 편집샵 계정은 일반 소비자가 아니므로 제외
-                # (처음 만나는 계정만 프로필 방문, 이후 캐시 활용)
-                if filter_business and check_is_business_account(
-                    profile_page, insta_id, business_cache
-                ):
-                    filtered_cnt += 1
+                if http_fetcher is not None:
+                    http_jobs.append((seq, url, http_fetcher.submit(url)))
                     continue
 
-                posts.append((
-                    post_id, insta_id, insta_name,
-                    brand_name, brand_id,
-                    full_link, src, post_date,
-                    insta_tag, tags_cnt,
-                ))
-                print(f"✅ 수집 완료 ({len(posts)}개): {full_link}")
+                detail_open_cnt += 1
+                pool.submit(seq, url)
 
-            except Exception as exc:
-                detail_fail_cnt += 1
-                screenshot_path  = save_debug_artifact(detail_page, url, "detail_open_fail")
-                print(f"❌ 상세 페이지 처리 실패: {url} — {exc}")
-                if screenshot_path:
-                    print(f"   디버그 스크린샷: {screenshot_path}")
-
-        if stop_early:
-            break
-
-        # ── 스크롤 종료 조건 체크 ────────────────────────────────────
-        new_count = len(all_seen) - before_count
-        if new_count == 0:
-            no_change_count += 1
-            print(f"⚠️ 새 게시물 없음 ({no_change_count}/3)")
-        else:
-            no_change_count = 0
-
-        if no_change_count >= 3:
-            print("3번 연속 새 게시물 없음 → 그리드 끝 도달, 종료")
-            break
-
-        # ── 다음 스크롤 ─────────────────────────────────────────────
-        print(f"스크롤 진행 중... (누적: {len(all_seen)}개 | 수집: {len(posts)}개)")
-        grid_page.mouse.wheel(0, scroll_y)
-        grid_page.wait_for_timeout(wait_ms)
-        scroll_count += 1
+            if http_jobs and not stop_early:
+                resolve_http_jobs(http_jobs)
+
+            # 대기열이 모두 탭에 배정될 때까지 처리하고, 나머지 탭은 스크롤 대기 중에 로드되게 둡니다
+            process_ready(until_backlog_empty=True)
+            save_checkpoint()
+
+            if stop_early:
+                break
+
+            # ── 스크롤 종료 조건 체크 + 스크롤 간격 조정 ─────────────────
+            # 새 링크가 나오면 간격을 넓혀 빠르게 내려가고,
+            # 안 나왔는데 바닥이 아니면 덜 내려간 것이므로 간격을 더 넓힙니다.
+            # 바닥에서 wait_ms 동안 아무것도 안 붙으면 2번 만에 끝으로 판단합니다.
+            # (체크포인트로 이어서 수집할 때는 이미 처리한 링크도 그리드가 내려간 것으로 셈)
+            if links:
+                no_change_count = 0
+                scroll_step     = min(int(scroll_step * 1.5), max_scroll_step)
+            else:
+                no_change_count += 1
+                at_bottom        = grid_page.evaluate(GRID_AT_BOTTOM_SCRIPT)
+                no_change_limit  = 2 if at_bottom else 3
+                scroll_step      = scroll_y if at_bottom else min(scroll_step * 2, max_scroll_step)
+                print(
+                    f"⚠️ 새 게시물 없음 ({no_change_count}/{no_change_limit})"
+                    f"{' — 그리드 바닥' if at_bottom else ''}"
+                )
+
+                if no_change_count >= no_change_limit:
+                    print(f"{no_change_count}번 연속 새 게시물 없음 → 그리드 끝 도달, 종료")
+                    break
+
+            # ── 다음 스크롤 ─────────────────────────────────────────────
+            print(f"스크롤 진행 중... (누적: {len(all_seen)}개 | 수집: {len(posts)}개)")
+            # 이전 시도가 처리한 구간은 최대 간격으로 빠르게 지나감
+            if scroll_count < resume_scrolls:
+                scroll_step = max_scroll_step
+            # 수집기 버퍼에 새 링크가 들어올 때까지만 기다림 (최대 wait_ms)
+            with PROFILE.phase("scroll_wait"):
+                grid_page.mouse.wheel(0, scroll_step)
+                wait_until(grid_page, "scroll_new_posts", GRID_COLLECTOR_PENDING_SCRIPT, timeout_ms=wait_ms)
+            PROFILE.end_scroll(scroll_count, new_links=len(new_urls), scroll_step=scroll_step)
+            scroll_count += 1
+
+        # 스크롤이 끝난 뒤 아직 로드 중인 탭 마무리
+        process_ready(until_backlog_empty=False)
+        PROFILE.end_scroll(scroll_count, final=True)
+
+    finally:
+        # 타임아웃·크래시로 빠져나가도 마지막 상태는 남김 (탭 정리가 실패해도 저장되도록 먼저)
+        save_checkpoint(force=True)
+        try:
+            pool.close()
+        finally:
+            if checkpoint is not None:
+                checkpoint.close()
+
+    # ── 필터 2: 비즈니스/편집샵 계정 제외 ──────────────────────
+    # 무신사·29cm 등 플랫폼, 편집샵 계정은 일반 소비자가 아니므로 제외
+    # (수집이 끝난 뒤 처음 보는 작성자만 프로필 방문, 나머지는 캐시 활용)
+    if filter_business and posts:
+        extra_pages = [profile_page.context.new_page() for _ in range(max(0, profile_tabs - 1))]
+        try:
+            with PROFILE.phase("business_stage"):
+                classify_business_accounts(
+                    [profile_page, *extra_pages],
+                    [post[1] for post in posts],
+                    business_cache,
+                    business_store,
+                    min_interval_ms=profile_rate_ms,
+                    scheduler=scheduler,
+                    on_login_redirect=on_login_redirect,
+                )
+        finally:
+            for page in extra_pages:
+                page.close()
+
+        kept = []
+        for post in posts:
+            if business_cache.get(post[1], False):
+                filtered_cnt += 1
+                if post[0] in post_urls:
+                    PROFILE.mark_post(post_urls[post[0]], outcome="business")
+                continue
+            kept.append(post)
+        posts = kept
 
     print(
         f"\n[수집 완료]"
@@ -574,8 +1701,19 @@ def collect_posts_with_scroll(
         f"\n  필터 제외: {filtered_cnt}건 (자기태그/비즈니스)"
         f"\n  상세 실패: {detail_fail_cnt}건"
         f"\n  날짜 실패: {parsed_fail_cnt}건"
+        f"\n  상세 탭  : {len(pool.slots)}개"
+        f"\n  네트워크 : {harvested_cnt}건 / 상세 페이지: {detail_open_cnt}건"
+        f"\n  기존 적재: {known_skip_cnt}건 (상세 조회 생략)"
+        f"\n  브랜드 공유: {shared_hit_cnt}건 (다른 브랜드 조회 결과 재사용)"
         f"\n  종료 사유: {stop_reason}"
     )
+    for line in fetch_stats.summary_lines():
+        print(f"  {line}")
+    if business_store is not None:
+        print(
+            f"  비즈니스 캐시: 저장된 판정 {preloaded_cnt}개 로드"
+            f" / 새로 확인 {len(business_store.dirty)}건"
+        )
     return posts
 
 
@@ -595,53 +1733,378 @@ def run(
     target_day=None,
     filter_self_tag=True,
     filter_business=True,
+    detail_tabs=1,
+    harvest_network=False,
+    http_detail=False,
+    http_workers=4,
+    business_cache_path=DEFAULT_CACHE_PATH,
+    known_posts=None,
+    known_stop_streak=0,
+    date_from=None,
+    date_to=None,
+    checkpoint_path=None,
+    debug_dir=DEFAULT_DEBUG_DIR,
+    debug_mode="dom",
+    debug_budget=20,
+    profile_path=None,
+    profile_top_n=10,
+    har_record_dir=None,
+    har_replay_dir=None,
+    profile_tabs=2,
+    profile_rate_ms=500,
+    session_min_ttl_hours=24,
+    browser_cdp_url=DEFAULT_CDP_URL,
+    resource_policy=None,
+    nav_per_minute=DEFAULT_NAV_PER_MINUTE,
+    nav_rate_db=DEFAULT_RATE_DB,
+    session_dir=DEFAULT_SESSION_DIR,
 ):
     """
-    브랜드 태그 페이지에서 게시물을 수집해 리스트로 반환합니다.
+    브랜드 태그 페이지에서 게시물을 수집해 리스트로 반환합니다. (브랜드 하나짜리 run_batch)
 
     Args:
         state_path       : Playwright 세션 파일 경로
         brand_id         : Instagram 계정 ID (예: "amomento.co")
         brand_name       : 브랜드 키 (예: "amomento") — DB 저장용
         target_day       : 수집 대상 날짜 'YYYY-MM-DD'. None이면 전체 수집
+        date_from/date_to: target_day 대신 기간(양 끝 포함)으로 한 번에 수집 — 백필용
         headless         : True면 브라우저 창 없이 실행
         filter_self_tag  : True면 브랜드 본인 게시물 제외 (기본값: True)
         filter_business  : True면 비즈니스/편집샵 계정 제외 (기본값: True)
+        detail_tabs      : 동시에 사용할 상세 탭 수 (기본값: 1)
+        harvest_network  : True면 그리드 네트워크 응답으로 먼저 수집하고 빠진 필드만 상세 페이지 방문
+        http_detail      : True면 상세 페이지를 브라우저 대신 HTTP로 먼저 조회 (실패 시 브라우저)
+        http_workers     : HTTP 상세 조회 동시 요청 수
+        business_cache_path : 비즈니스 판정을 실행 간에 공유할 JSON 파일 (None이면 실행 내 캐시만)
+        known_posts      : {post_id: 'YYYY-MM-DD'} 이미 적재된 게시물 (상세 조회 생략용)
+        known_stop_streak: 이미 적재된 게시물이 이 횟수만큼 연속이면 스크롤 종료 (0이면 사용 안 함)
+        checkpoint_path  : 체크포인트 파일 경로 접두어 — 재시도 시 이어서 수집 (None이면 사용 안 함).
+                           결과를 다른 곳에 저장한 뒤 ScrapeCheckpoint(checkpoint_path).clear()로 정리
+        debug_dir        : 실패 아티팩트 저장 디렉터리 (None이면 저장 안 함)
+        debug_mode       : "dom"(압축 HTML, 기본) 또는 "screenshot"(화면 크기 스크린샷)
+        debug_budget     : 실행당 저장할 아티팩트 최대 개수
+        profile_path     : 단계별 시간 프로필 JSON 저장 경로 (None이면 출력만)
+        profile_top_n    : 가장 느린 게시물 표에 보여줄 개수
+        har_record_dir   : 수집하면서 요청/응답을 HAR 번들로 녹화할 디렉터리
+        har_replay_dir   : 녹화된 번들로만 응답하는 오프라인 재생 (로그인·HTTP 상세 조회·캐시 저장 생략)
+        profile_tabs     : 수집 후 비즈니스 계정 확인에 동시에 쓸 프로필 탭 수
+        profile_rate_ms  : 프로필 이동 사이 최소 간격 ms (탭 전체 합산)
+        session_min_ttl_hours: sessionid 만료까지 이만큼 남아 있으면 홈 확인 없이 바로 tagged로 이동
+        browser_cdp_url  : 공유 브라우저 서버 CDP 주소 (기본: BROWSER_CDP_URL). 응답이 없으면 직접 실행
+        resource_policy  : "block"이면 이미지·동영상·폰트·트래커 요청 차단, "measure"면 차단 대상 집계만 (None이면 사용 안 함)
+        nav_per_minute   : 동시에 도는 모든 수집 태스크 합산 분당 이동 예산 (기본: INSTA_NAV_PER_MINUTE, None이면 제한 없음)
+        nav_rate_db      : 이동 예산 토큰 버킷을 공유하는 SQLite 파일 (기본: INSTA_RATE_DB)
+        session_dir      : 계정별 storage_state *.json 디렉터리 (기본: INSTA_SESSION_DIR).
+                           있으면 state_path 대신 세션 풀에서 부하·쿨다운 기준으로 계정을 빌려 쓰고,
+                           로그인으로 튕긴 계정은 격리한 뒤 다음 계정으로 넘어감 (ID/PW 재로그인 안 함)
+    """
+    brand = SimpleNamespace(brand_key=brand_name, instagram_id=brand_id)
+    return run_batch(
+        [brand],
+        state_path=state_path,
+        login_url=login_url,
+        username=username,
+        password=password,
+        scroll_y=scroll_y,
+        max_scrolls=max_scrolls,
+        wait_ms=wait_ms,
+        headless=headless,
+        target_day=target_day,
+        filter_self_tag=filter_self_tag,
+        filter_business=filter_business,
+        detail_tabs=detail_tabs,
+        harvest_network=harvest_network,
+        http_detail=http_detail,
+        http_workers=http_workers,
+        business_cache_path=business_cache_path,
+        known_posts_by_brand={brand_name: known_posts} if known_posts else None,
+        known_stop_streak=known_stop_streak,
+        date_from=date_from,
+        date_to=date_to,
+        checkpoint_paths={brand_name: checkpoint_path} if checkpoint_path else None,
+        debug_dir=debug_dir,
+        debug_mode=debug_mode,
+        debug_budget=debug_budget,
+        profile_path=profile_path,
+        profile_top_n=profile_top_n,
+        har_record_dir=har_record_dir,
+        har_replay_dir=har_replay_dir,
+        profile_tabs=profile_tabs,
+        profile_rate_ms=profile_rate_ms,
+        session_min_ttl_hours=session_min_ttl_hours,
+        browser_cdp_url=browser_cdp_url,
+        resource_policy=resource_policy,
+        nav_per_minute=nav_per_minute,
+        nav_rate_db=nav_rate_db,
+        session_dir=session_dir,
+    )[brand_name]
+
+
+def run_batch(
+    brands,
+    state_path="/opt/airflow/secrets/storage_state.json",
+    login_url="https://www.instagram.com/accounts/login/",
+    username=os.getenv("ID"),
+    password=os.getenv("PW"),
+    scroll_y=700,
+    max_scrolls=50,
+    wait_ms=5000,
+    headless=True,
+    target_day=None,
+    filter_self_tag=True,
+    filter_business=True,
+    detail_tabs=1,
+    harvest_network=False,
+    http_detail=False,
+    http_workers=4,
+    business_cache_path=DEFAULT_CACHE_PATH,
+    known_posts_by_brand=None,
+    known_stop_streak=0,
+    date_from=None,
+    date_to=None,
+    checkpoint_paths=None,
+    debug_dir=DEFAULT_DEBUG_DIR,
+    debug_mode="dom",
+    debug_budget=20,
+    profile_path=None,
+    profile_top_n=10,
+    har_record_dir=None,
+    har_replay_dir=None,
+    profile_tabs=2,
+    profile_rate_ms=500,
+    session_min_ttl_hours=24,
+    browser_cdp_url=DEFAULT_CDP_URL,
+    resource_policy=None,
+    nav_per_minute=DEFAULT_NAV_PER_MINUTE,
+    nav_rate_db=DEFAULT_RATE_DB,
+    session_dir=DEFAULT_SESSION_DIR,
+):
+    """
+    여러 브랜드를 한 브라우저 컨텍스트에서 차례로 수집해 {brand_key: 게시물 리스트}로 반환합니다.
+
+    로그인 확인은 한 번만 하고, 브랜드마다 tagged 그리드를 스크롤합니다.
+    여러 브랜드 그리드에 함께 나온 게시물은 처음 만난 브랜드에서만 상세 조회하고
+    (SharedDetailCache) 나머지 브랜드는 그 결과를 받아 자기 필터만 적용합니다.
+    비즈니스 판정 캐시도 브랜드 사이에 공유합니다.
+
+    Args:
+        brands               : BrandDagConfig 리스트 (brand_key, instagram_id만 사용)
+        known_posts_by_brand : {brand_key: {post_id: 'YYYY-MM-DD'}} 브랜드별 기존 적재 게시물
+        checkpoint_paths     : {brand_key: 체크포인트 경로 접두어} 브랜드별 체크포인트
+        나머지               : run()과 같음 (모든 브랜드에 공통 적용)
     """
     kst = timezone(timedelta(hours=9))
+    WAIT_STATS.reset()
+    PROFILE.reset(label=",".join(brand.instagram_id for brand in brands))
+
+    if har_replay_dir:
+        # 재생은 번들 밖으로 나가지 않도록: requests 기반 조회·공유 캐시 파일 사용 안 함
+        http_detail         = False
+        business_cache_path = None
+
+    posts_by_brand = {}
+    shared_details = SharedDetailCache() if len(brands) > 1 else None
+
+    # 세션 풀이 있으면 이 배치가 쓸 계정을 부하·쿨다운 기준으로 빌림
+    # (브라우저 실행이 실패해도 대여가 lease_ttl 동안 남지 않도록 try 안에서 빌리고 finally에서 반납)
+    session_pool = SessionPool.from_dir(session_dir) if session_dir and not har_replay_dir else None
+    lease        = None
+    quarantined  = set()
+
+    def quarantine_lease(reason):
+        # 어느 탭이든 로그인으로 튕기면 지금 쓰는 계정을 격리 (실행당 한 번)
+        if lease is not None and lease[0] not in quarantined:
+            quarantined.add(lease[0])
+            session_pool.quarantine(lease[0], reason)
 
-    with sync_playwright() as playwright:
-        browser      = playwright.chromium.launch(headless=headless)
-        context      = browser.new_context(storage_state=state_path)
-        grid_page    = context.new_page()
-        detail_page  = context.new_page()
-        profile_page = context.new_page()  # 비즈니스 계정 확인 전용
-
-        ensure_logged_in(grid_page, login_url, username, password)
-        goto_tagged(grid_page, brand_id)
-
-        posts = collect_posts_with_scroll(
-            grid_page=grid_page,
-            detail_page=detail_page,
-            profile_page=profile_page,
-            brand_id=brand_id,
-            brand_name=brand_name,
+    try:
+        if session_pool is not None:
+            lease      = session_pool.acquire()
+            state_path = lease[1]
+
+        with sync_playwright() as playwright:
+            # 공유 브라우저 서버가 있으면 연결하고 이 태스크 전용 컨텍스트만 새로 만듦
+            browser, _, browser_ms = connect_or_launch(playwright, headless=headless, cdp_url=browser_cdp_url)
+            PROFILE.add("browser_start", browser_ms)
+            # 서비스 워커가 가로챈 요청은 라우트를 거치지 않으므로 정책을 쓸 때는 막아 둠
+            context_options = {"service_workers": "block"} if resource_policy else {}
+            if har_replay_dir:
+                context = browser.new_context(**context_options)
+                attach_replay(context, har_replay_dir)
+            elif har_record_dir:
+                context = browser.new_context(
+                    storage_state=state_path, **record_context_options(har_record_dir), **context_options
+                )
+            else:
+                context = browser.new_context(storage_state=state_path, **context_options)
+
+            # 재생 라우트보다 나중에 걸어야 정책이 먼저 검사하고 통과분만 번들로 넘김
+            policy = ResourcePolicy(mode=resource_policy).attach(context) if resource_policy else None
+
+            grid_page    = context.new_page()
+            detail_page  = context.new_page()
+            profile_page = context.new_page()  # 비즈니스 계정 확인 전용
+            if policy is not None:
+                # 상세 탭 풀·추가 프로필 탭처럼 역할을 지정하지 않은 탭은 detail 규칙을 따름
+                policy.assign(grid_page, "grid")
+                policy.assign(detail_page, "detail")
+                policy.assign(profile_page, "profile")
+
+            # 첫 그리드 응답부터 받으려면 tagged 이동 전에 훅을 걸어야 합니다
+            harvester = NetworkPostHarvester().attach(grid_page) if harvest_network else None
+            session   = SessionState(state_path, min_ttl_hours=session_min_ttl_hours)
+            # 재생은 네트워크에 나가지 않으므로 이동 예산을 쓰지 않음
+            scheduler = (
+                NavigationScheduler(nav_rate_db, per_minute=nav_per_minute)
+                if nav_per_minute and not har_replay_dir else None
+            )
+
+            http_fetcher   = (
+                HttpDetailFetcher(state_path, workers=http_workers, scheduler=scheduler, session_pool=session_pool)
+                if http_detail else None
+            )
+            business_store = (
+                BusinessVerdictStore(business_cache_path)
+                if filter_business and business_cache_path else None
+            )
+            business_cache = business_store.preload() if business_store else {}
+            debug_capture  = (
+                DebugCapture(debug_dir, mode=debug_mode, max_total=debug_budget)
+                if debug_dir else None
+            )
+
+            try:
+                for index, brand in enumerate(brands):
+                    if len(brands) > 1:
+                        print(f"\n===== [{index + 1}/{len(brands)}] {brand.brand_key} (@{brand.instagram_id}) =====")
+
+                    # 로그인 확인은 첫 브랜드에서 한 번만 (재생 번들에는 세션 쿠키가 없으므로 생략)
+                    if har_replay_dir or index > 0:
+                        goto_tagged(grid_page, brand.instagram_id, scheduler)
+                    elif session_pool is not None:
+                        lease   = open_tagged_with_pool(grid_page, brand.instagram_id, session_pool, lease, scheduler)
+                        session = SessionState(lease[1], min_ttl_hours=session_min_ttl_hours)
+                    else:
+                        open_tagged_with_session(
+                            grid_page, brand.instagram_id, session, login_url, username, password, scheduler
+                        )
+
+                    checkpoint_path = (checkpoint_paths or {}).get(brand.brand_key)
+                    posts_by_brand[brand.brand_key] = collect_posts_with_scroll(
+                        grid_page=grid_page,
+                        detail_page=detail_page,
+                        profile_page=profile_page,
+                        brand_id=brand.instagram_id,
+                        brand_name=brand.brand_key,
+                        scroll_y=scroll_y,
+                        max_scrolls=max_scrolls,
+                        wait_ms=wait_ms,
+                        kst=kst,
+                        target_day=target_day,
+                        date_from=date_from,
+                        date_to=date_to,
+                        filter_self_tag=filter_self_tag,
+                        filter_business=filter_business,
+                        detail_tabs=detail_tabs,
+                        harvester=harvester,
+                        http_fetcher=http_fetcher,
+                        business_store=business_store,
+                        known_posts=(known_posts_by_brand or {}).get(brand.brand_key),
+                        known_stop_streak=known_stop_streak,
+                        checkpoint=ScrapeCheckpoint(checkpoint_path) if checkpoint_path else None,
+                        debug_capture=debug_capture,
+                        profile_tabs=profile_tabs,
+                        profile_rate_ms=profile_rate_ms,
+                        business_cache=business_cache,
+                        shared_details=shared_details,
+                        scheduler=scheduler,
+                        on_login_redirect=quarantine_lease if session_pool is not None else None,
+                    )
+                    if lease is not None:
+                        session_pool.count(lease[0], "brands")
+                        session_pool.count(lease[0], "posts", len(posts_by_brand[brand.brand_key]))
+            finally:
+                if lease is not None:
+                    session_pool.count(
+                        lease[0], "detail", sum(1 for row in PROFILE.posts.values() if row["path"] == "browser")
+                    )
+                if debug_capture is not None:
+                    debug_capture.close()
+                if http_fetcher is not None:
+                    http_fetcher.close()
+                if business_store is not None:
+                    business_store.save()
+
+            # 실행 중 갱신된 쿠키를 다음 실행이 쓰도록 저장 (성공한 실행만)
+            if not har_replay_dir:
+                # 쿠키에 sessionid가 없을 때만 만료로 보고 격리 (디스크·권한 같은 저장 실패는 계정 문제가 아님)
+                if lease is not None and not SessionState.context_has_sessionid(context):
+                    quarantine_lease("실행 후 sessionid 없음")
+                session.save(context)
+
+            profile_page.close()
+            detail_page.close()
+            grid_page.close()
+            context.close()  # HAR 녹화 파일은 컨텍스트를 닫을 때 써짐
+            browser.close()  # 공유 서버에 연결한 경우에는 연결만 끊김
+
+    finally:
+        if lease is not None:
+            session_pool.release(lease[0], lease[2])
+
+    if har_record_dir:
+        write_bundle_meta(
+            har_record_dir,
+            brand_id=brands[0].instagram_id,
+            brand_name=brands[0].brand_key,
+            brands=[brand.instagram_id for brand in brands],
+            target_day=target_day,
+            date_from=date_from,
+            date_to=date_to,
             scroll_y=scroll_y,
             max_scrolls=max_scrolls,
             wait_ms=wait_ms,
-            kst=kst,
-            target_day=target_day,
-            filter_self_tag=filter_self_tag,
-            filter_business=filter_business,
+            collected=sum(len(posts) for posts in posts_by_brand.values()),
         )
 
-        profile_page.close()
-        detail_page.close()
-        grid_page.close()
-        browser.close()
+    if policy is not None:
+        print("\n[리소스 차단]")
+        for line in policy.summary_lines():
+            print(f"  {line}")
 
-    print("수집된 샘플:", posts[0:1])
-    return posts
+    if scheduler is not None:
+        print("\n[이동 예산]")
+        for line in scheduler.summary_lines():
+            print(f"  {line}")
+
+    if session_pool is not None:
+        print("\n[세션 풀]")
+        for line in session_pool.summary_lines():
+            print(f"  {line}")
+
+    if shared_details is not None:
+        print("\n[브랜드 간 중복 제거]")
+        for line in shared_details.summary_lines():
+            print(f"  {line}")
+
+    print("\n[대기 시간 분포]")
+    for line in WAIT_STATS.summary_lines():
+        print(f"  {line}")
+
+    print("\n[단계별 시간]")
+    for line in PROFILE.summary_lines():
+        print(f"  {line}")
+
+    print(f"\n[가장 느린 게시물 top {profile_top_n}]")
+    for line in PROFILE.top_posts_lines(profile_top_n):
+        print(f"  {line}")
+
+    if profile_path:
+        PROFILE.write_json(profile_path)
+
+    for brand_key, posts in posts_by_brand.items():
+        print(f"수집된 샘플 ({brand_key}):", posts[0:1])
+    return posts_by_brand
 
 
 def main():
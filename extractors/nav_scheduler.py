@@ -0,0 +1,191 @@
+"""
+nav_scheduler.py
+
+여러 브랜드 수집 태스크가 동시에 돌 때 Instagram 이동 속도를 전체 합산으로 제한하는 토큰 버킷입니다.
+
+브랜드 DAG들은 instagram_extract_pool 하나를 나눠 쓰는데, 슬롯을 1개로 두어 수집을 한 브랜드씩
+직렬화하는 방식으로만 속도 제한을 피해 왔습니다. 이 스케줄러는 버킷 상태를 로컬 SQLite 파일 하나에 두고
+모든 프로세스가 같은 행을 트랜잭션으로 갱신하므로, 풀 슬롯을 늘려 여러 브랜드를 동시에 돌려도
+이동(tagged·상세·프로필·로그인 페이지, HTTP 상세 조회) 합계가 분당 예산을 넘지 않습니다.
+
+  - 토큰     : 분당 per_minute개씩 채워지고 최대 burst개까지 쌓임. 이동 한 번에 1개 사용
+  - 백오프   : 수집 도중 로그인 리다이렉트가 보이면 report_login_redirect()
+               → 모든 프로세스가 backoff_base_sec × 2^(단계-1) 동안(최대 backoff_max_sec) 이동을 멈춤
+               → 백오프가 끝난 뒤 첫 정상 응답(report_ok())에서 단계 초기화
+
+폴링 루프(상세 탭 풀, 프로필 확인)는 try_acquire()로 기다리지 않고 확인만 하고,
+한 번씩 이동하는 곳(tagged, 로그인)과 HTTP 워커 스레드는 acquire()로 토큰이 날 때까지 기다립니다.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+
+DEFAULT_RATE_DB        = os.getenv("INSTA_RATE_DB", "/opt/airflow/data/instagram_rate.sqlite")
+DEFAULT_NAV_PER_MINUTE = int(os.getenv("INSTA_NAV_PER_MINUTE", "0")) or None  # 0/미설정이면 사용 안 함
+
+
+class NavigationScheduler:
+    """SQLite 파일 하나를 공유하는 프로세스 간 토큰 버킷 + 로그인 리다이렉트 백오프."""
+
+    def __init__(
+        self,
+        db_path=DEFAULT_RATE_DB,
+        per_minute=DEFAULT_NAV_PER_MINUTE or 30,
+        burst=None,
+        backoff_base_sec=60,
+        backoff_max_sec=900,
+        bucket="instagram",
+    ):
+        self.db_path          = Path(db_path)
+        self.rate_per_sec     = per_minute / 60
+        self.burst            = burst or max(1, per_minute // 6)  # 기본: 10초 분량
+        self.backoff_base_sec = backoff_base_sec
+        self.backoff_max_sec  = backoff_max_sec
+        self.bucket           = bucket
+
+        self.acquired    = 0
+        self.waited_ms   = 0.0
+        self.backoffs    = 0
+        self._level_seen = 0  # 마지막으로 읽은 백오프 단계 (0이면 report_ok가 DB를 건드리지 않음)
+        self._lock       = threading.Lock()
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS nav_bucket (
+                    name          TEXT PRIMARY KEY,
+                    tokens        REAL NOT NULL,
+                    updated_at    REAL NOT NULL,
+                    backoff_until REAL NOT NULL DEFAULT 0,
+                    backoff_level INTEGER NOT NULL DEFAULT 0
+                )
+                """
+            )
+            conn.execute(
+                "INSERT OR IGNORE INTO nav_bucket (name, tokens, updated_at) VALUES (?, ?, ?)",
+                (self.bucket, float(self.burst), time.time()),
+            )
+
+    def _connect(self):
+        # 호출마다 새 연결: HTTP 워커 스레드에서도 그대로 쓸 수 있고, 이동 빈도에서는 비용이 무시할 만함
+        return sqlite3.connect(self.db_path, timeout=10, isolation_level=None)
+
+    # ── 토큰 ─────────────────────────────────────────────────────
+
+    def try_acquire(self) -> float:
+        """토큰이 있으면 하나 쓰고 0을, 없으면 다음 토큰까지 남은 초를 반환합니다 (기다리지 않음)."""
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            tokens, updated_at, backoff_until, level = conn.execute(
+                "SELECT tokens, updated_at, backoff_until, backoff_level FROM nav_bucket WHERE name = ?",
+                (self.bucket,),
+            ).fetchone()
+
+            now    = time.time()
+            tokens = min(self.burst, tokens + max(0.0, now - updated_at) * self.rate_per_sec)
+            self._level_seen = level
+
+            if now < backoff_until:
+                conn.execute("ROLLBACK")
+                return backoff_until - now
+
+            if tokens < 1:
+                conn.execute("ROLLBACK")  # 충전량은 updated_at 기준으로 다시 계산되므로 쓸 필요 없음
+                return (1 - tokens) / self.rate_per_sec
+
+            conn.execute(
+                "UPDATE nav_bucket SET tokens = ?, updated_at = ? WHERE name = ?",
+                (tokens - 1, now, self.bucket),
+            )
+            conn.execute("COMMIT")
+        finally:
+            conn.close()
+
+        with self._lock:
+            self.acquired += 1
+        return 0.0
+
+    def acquire(self, sleep=time.sleep, max_wait_sec=None) -> float:
+        """
+        토큰이 날 때까지 기다렸다가 하나 씁니다. 기다린 ms를 반환합니다.
+        sleep은 초를 받는 함수 — Playwright 페이지에서는 이벤트가 계속 처리되도록
+        lambda sec: page.wait_for_timeout(sec * 1000)을 넘깁니다.
+        """
+        started = time.monotonic()
+        while True:
+            wait_sec = self.try_acquire()
+            if wait_sec <= 0:
+                break
+            if max_wait_sec is not None and time.monotonic() - started + wait_sec > max_wait_sec:
+                raise TimeoutError(f"이동 예산 대기 시간 초과 ({max_wait_sec}초)")
+            sleep(min(wait_sec, 5.0))  # 백오프 중에도 다른 프로세스의 초기화를 놓치지 않게 나눠서 대기
+
+        waited_ms = (time.monotonic() - started) * 1000
+        with self._lock:
+            self.waited_ms += waited_ms
+        return waited_ms
+
+    def wait_page(self, page) -> float:
+        """acquire()의 Playwright 페이지용 단축형."""
+        return self.acquire(sleep=lambda sec: page.wait_for_timeout(sec * 1000))
+
+    # ── 백오프 신호 ──────────────────────────────────────────────
+
+    def report_login_redirect(self):
+        """수집 도중 로그인으로 튕김 → 모든 프로세스의 이동을 단계적으로 늘어나는 시간 동안 멈춥니다."""
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            backoff_until, level = conn.execute(
+                "SELECT backoff_until, backoff_level FROM nav_bucket WHERE name = ?", (self.bucket,)
+            ).fetchone()
+
+            now = time.time()
+            if now < backoff_until:
+                conn.execute("ROLLBACK")  # 이미 다른 탭·프로세스가 건 백오프 안의 리다이렉트
+                return
+
+            level     = level + 1
+            pause_sec = min(self.backoff_max_sec, self.backoff_base_sec * 2 ** (level - 1))
+            conn.execute(
+                "UPDATE nav_bucket SET tokens = 0, updated_at = ?, backoff_until = ?, backoff_level = ?"
+                " WHERE name = ?",
+                (now, now + pause_sec, level, self.bucket),
+            )
+            conn.execute("COMMIT")
+        finally:
+            conn.close()
+
+        self._level_seen = level
+        with self._lock:
+            self.backoffs += 1
+        print(f"⏸️ [이동 예산] 로그인 리다이렉트 감지 → 전체 이동 {pause_sec:.0f}초 중지 ({level}단계)")
+
+    def report_ok(self):
+        """정상 응답. 백오프가 끝난 뒤라면 단계를 초기화합니다."""
+        if self._level_seen == 0:
+            return
+        conn = self._connect()
+        try:
+            conn.execute(
+                "UPDATE nav_bucket SET backoff_level = 0 WHERE name = ? AND backoff_until <= ?",
+                (self.bucket, time.time()),
+            )
+        finally:
+            conn.close()
+        self._level_seen = 0
+
+    # ── 출력 ─────────────────────────────────────────────────────
+
+    def summary_lines(self) -> list[str]:
+        return [
+            f"분당 {self.rate_per_sec * 60:.0f}회 (버스트 {self.burst}) / 이 실행 이동 {self.acquired}회"
+            f" / 대기 {self.waited_ms / 1000:.1f}초 / 백오프 {self.backoffs}회 ({self.db_path})"
+        ]
@@ -0,0 +1,231 @@
+"""
+network_harvest.py
+
+tagged 그리드가 스크롤하면서 받아오는 JSON 응답에서 게시물 메타데이터를 직접 꺼냅니다.
+
+그리드 썸네일은 Instagram API 응답(GraphQL / api/v1)을 받아 그려지고, 그 응답에는
+shortcode·작성자·작성 시각·사용자 태그·썸네일이 이미 들어 있습니다.
+여기서 값을 채울 수 있는 게시물은 상세 페이지를 열지 않고 바로 수집하고,
+필드가 빠진 게시물만 기존 상세 페이지 경로로 넘깁니다.
+
+사용 흐름:
+  1. goto_tagged 전에 NetworkPostHarvester.attach(grid_page)로 응답 훅 등록
+  2. 스크롤마다 harvester.drain()으로 쌓인 응답을 파싱
+  3. harvester.lookup(shortcode)로 레코드 조회 → missing_fields()가 비어 있으면 그대로 사용
+"""
+
+from datetime import datetime, timezone
+
+
+# 게시물 데이터가 실려 오는 응답 URL 조각
+HARVEST_URL_MARKERS = ("/graphql/query", "/api/graphql", "/api/v1/")
+
+# 상세 페이지 없이 수집하려면 반드시 있어야 하는 필드
+REQUIRED_FIELDS = ("post_id", "insta_id", "taken_at", "img_src", "tagged_ids")
+
+
+# ── JSON 파싱 ────────────────────────────────────────────────────
+
+def _username(user) -> str | None:
+    if not isinstance(user, dict):
+        return None
+    username = user.get("username")
+    return username.lower() if isinstance(username, str) and username else None
+
+
+def _tagged_usernames(node) -> list[str] | None:
+    """
+    게시물 노드에서 태그된 계정 목록을 꺼냅니다.
+    태그 정보 키 자체가 없으면 None (= 알 수 없음), 있는데 비어 있으면 [] 입니다.
+    """
+    if "usertags" in node:
+        usertags = node.get("usertags") or {}
+        entries  = usertags.get("in") or []
+        names    = [_username(entry.get("user")) for entry in entries if isinstance(entry, dict)]
+    elif "edge_media_to_tagged_user" in node:
+        edges = (node.get("edge_media_to_tagged_user") or {}).get("edges") or []
+        names = [
+            _username((edge.get("node") or {}).get("user"))
+            for edge in edges
+            if isinstance(edge, dict)
+        ]
+    else:
+        return None
+
+    # 중복 제거 (순서 유지)
+    seen = set()
+    return [name for name in names if name and not (name in seen or seen.add(name))]
+
+
+def _image_url(node) -> str:
+    candidates = (node.get("image_versions2") or {}).get("candidates") or []
+    if candidates and isinstance(candidates[0], dict) and candidates[0].get("url"):
+        return candidates[0]["url"]
+
+    for key in ("display_url", "thumbnail_src"):
+        if node.get(key):
+            return node[key]
+
+    # 캐러셀 게시물은 첫 번째 슬라이드 이미지를 사용
+    carousel = node.get("carousel_media") or []
+    if carousel and isinstance(carousel[0], dict):
+        return _image_url(carousel[0])
+
+    return ""
+
+
+def parse_media_node(node) -> dict | None:
+    """
+    GraphQL / api/v1 응답의 게시물 노드 하나를 수집 레코드 dict로 바꿉니다.
+    게시물 노드가 아니면 None을 반환합니다.
+
+    반환 키: post_id, insta_id, insta_name, taken_at, img_src, tagged_ids
+    (알 수 없는 값은 None — missing_fields()로 확인)
+    """
+    if not isinstance(node, dict):
+        return None
+
+    shortcode = node.get("code") or node.get("shortcode")
+    if not isinstance(shortcode, str) or not shortcode:
+        return None
+
+    owner    = node.get("user") or node.get("owner")
+    taken_at = node.get("taken_at") or node.get("taken_at_timestamp")
+    if owner is None and taken_at is None:
+        return None  # shortcode만 있는 다른 종류의 객체
+
+    full_name = (owner or {}).get("full_name") if isinstance(owner, dict) else None
+
+    return {
+        "post_id":    shortcode,
+        "insta_id":   _username(owner),
+        "insta_name": full_name.strip() if isinstance(full_name, str) else None,
+        "taken_at":   int(taken_at) if isinstance(taken_at, (int, float)) else None,
+        "img_src":    _image_url(node) or None,
+        "tagged_ids": _tagged_usernames(node),
+    }
+
+
+def iter_media_records(payload):
+    """응답 JSON 전체를 훑으면서 게시물 레코드를 모두 꺼냅니다."""
+    stack = [payload]
+
+    while stack:
+        current = stack.pop()
+
+        if isinstance(current, list):
+            stack.extend(current)
+            continue
+
+        if not isinstance(current, dict):
+            continue
+
+        record = parse_media_node(current)
+        if record is not None:
+            yield record
+            # 캐러셀 하위 슬라이드는 같은 게시물이므로 더 내려가지 않음
+            continue
+
+        stack.extend(current.values())
+
+
+def merge_records(old, new) -> dict:
+    """같은 게시물 레코드가 여러 응답에 나오면 비어 있는 필드만 채워 합칩니다."""
+    merged = dict(old)
+    for key, value in new.items():
+        if merged.get(key) is None and value is not None:
+            merged[key] = value
+    return merged
+
+
+def missing_fields(record) -> list[str]:
+    """상세 페이지 없이 수집하기에 부족한 필드 목록을 반환합니다."""
+    if record is None:
+        return list(REQUIRED_FIELDS)
+    return [key for key in REQUIRED_FIELDS if record.get(key) is None]
+
+
+# ── 레코드 → 기존 수집 포맷 ──────────────────────────────────────
+
+def record_post_date(record, kst) -> str:
+    """taken_at(unix seconds)을 KST 기준 'YYYY-MM-DD' 문자열로 바꿉니다."""
+    post_dt_utc = datetime.fromtimestamp(record["taken_at"], tz=timezone.utc)
+    return post_dt_utc.astimezone(kst).strftime("%Y-%m-%d")
+
+
+def record_to_post_data(record):
+    """
+    레코드를 extract_post_data와 같은 형태로 바꿉니다.
+    반환: (post_id, insta_id, insta_name, full_link, img_src, tagged_ids, tags_cnt)
+    """
+    insta_id   = record["insta_id"]
+    insta_name = record.get("insta_name") or ""
+
+    # extract_insta_name과 같은 규칙: 비어 있거나 계정 ID와 같으면 unknown
+    if not insta_name or insta_name.lower() == insta_id.lower():
+        insta_name = "unknown"
+
+    tags      = [f"@{name}" for name in record["tagged_ids"]]
+    full_link = f"https://www.instagram.com/p/{record['post_id']}/"
+
+    return record["post_id"], insta_id, insta_name, full_link, record["img_src"], ",".join(tags), len(tags)
+
+
+# ── 응답 훅 ──────────────────────────────────────────────────────
+
+class NetworkPostHarvester:
+    """
+    grid_page의 response 이벤트에서 게시물 JSON을 모아 shortcode별 레코드로 보관합니다.
+
+    이벤트 핸들러 안에서는 응답 객체만 쌓아 두고, 본문 파싱은 drain()에서
+    메인 흐름이 직접 합니다 (sync API 핸들러 안에서 다른 API 호출을 피하기 위함).
+    """
+
+    def __init__(self, url_markers=HARVEST_URL_MARKERS):
+        self.url_markers   = url_markers
+        self.records       = {}  # {shortcode: record}
+        self._responses    = []
+        self.response_cnt  = 0
+        self.parse_fail    = 0
+
+    def attach(self, page):
+        page.on("response", self._on_response)
+        return self
+
+    def _on_response(self, response):
+        if response.request.resource_type not in ("xhr", "fetch"):
+            return
+        if not any(marker in response.url for marker in self.url_markers):
+            return
+        self._responses.append(response)
+
+    def drain(self) -> int:
+        """쌓인 응답을 파싱해 레코드에 반영하고, 새로 반영된 레코드 수를 반환합니다."""
+        responses, self._responses = self._responses, []
+        added = 0
+
+        for response in responses:
+            self.response_cnt += 1
+            try:
+                payload = response.json()
+            except Exception:
+                self.parse_fail += 1
+                continue
+            added += self.feed(payload)
+
+        return added
+
+    def feed(self, payload) -> int:
+        """JSON 본문 하나를 파싱해 레코드에 합칩니다."""
+        added = 0
+        for record in iter_media_records(payload):
+            shortcode = record["post_id"]
+            if shortcode in self.records:
+                self.records[shortcode] = merge_records(self.records[shortcode], record)
+            else:
+                self.records[shortcode] = record
+                added += 1
+        return added
+
+    def lookup(self, shortcode):
+        return self.records.get(shortcode)
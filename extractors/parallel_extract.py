@@ -0,0 +1,521 @@
+"""
+parallel_extract.py
+
+브랜드 하나의 상세 조회를 워커 프로세스 여러 개로 나눠 도는 병렬 수집입니다.
+
+run()은 한 프로세스가 브라우저 하나를 붙잡고 도는 구조라 상세 탭을 늘려도 CPU 코어 하나에 묶입니다.
+여기서는 코디네이터(이 프로세스)가 tagged 그리드만 스크롤하며 상세 URL을 작업 큐(work_queue.py)에 넣고,
+워커 프로세스 N개가 각자 브라우저 컨텍스트·상세 탭 풀로 큐에서 URL을 가져가 결과를 씁니다.
+
+  - 코디네이터 : 로그인 확인 → 워커 시작 → 그리드 스크롤·URL 적재 → 끝난 결과를 그리드 순서대로 보며
+                 과거/기존 적재 게시물 연속 판단 (조기 종료 시 남은 항목 취소) → 병합 → 비즈니스 필터
+  - 워커       : 자기 샤드 URL 먼저, 없으면 다른 샤드 대기 항목·리스가 지난 항목을 가져감 (스틸).
+                 상세/날짜 실패는 큐가 지연 후 다른 워커에게 다시 배정 (max_attempts번까지)
+  - 결과       : collect_posts_with_scroll과 같은 POST_COLUMNS 순서 튜플 리스트
+
+워커는 multiprocessing이 아니라 `python -m extractors.parallel_extract --worker`로 띄웁니다.
+(Airflow 태스크 프로세스는 데몬 프로세스일 수 있어 multiprocessing 자식을 만들 수 없음)
+
+네트워크 레코드·HTTP 상세 조회·배치 공유 캐시·체크포인트는 쓰지 않습니다.
+재시도 시 이어서 수집은 큐 파일이 대신합니다 (끝난 URL은 결과를 그대로 재사용).
+
+실행 (로컬 테스트):
+  python -m extractors.parallel_extract <brand_id> <brand_name> --date 2024-01-01 --workers 4
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+from datetime import timezone, timedelta
+from pathlib import Path
+
+from playwright.sync_api import sync_playwright
+
+from extractors.browser_server import DEFAULT_CDP_URL, connect_or_launch
+from extractors.business_cache import DEFAULT_CACHE_PATH, BusinessVerdictStore
+from extractors.instagram_scraper import (
+    GRID_AT_BOTTOM_SCRIPT,
+    GRID_COLLECTOR_PENDING_SCRIPT,
+    POST_URL_RE,
+    DetailTabPool,
+    _is_self_tagged,
+    classify_business_accounts,
+    classify_post_date,
+    drain_post_links,
+    inspect_detail_slot,
+    install_post_link_collector,
+    open_tagged_with_session,
+    resolve_date_window,
+    window_label,
+)
+from extractors.nav_scheduler import DEFAULT_NAV_PER_MINUTE, DEFAULT_RATE_DB, NavigationScheduler
+from extractors.readiness import wait_until
+from extractors.resource_policy import ResourcePolicy
+from extractors.session_state import SessionState
+from extractors.work_queue import WorkQueue
+
+
+PACKAGE_ROOT = Path(__file__).resolve().parent.parent  # 워커가 extractors 패키지를 import할 수 있도록
+
+
+# ── 워커 ─────────────────────────────────────────────────────────
+
+def extract_worker(
+    index,
+    workers,
+    queue_path,
+    state_path,
+    window,
+    detail_tabs=2,
+    headless=True,
+    browser_cdp_url=DEFAULT_CDP_URL,
+    resource_policy=None,
+    nav_per_minute=None,
+    nav_rate_db=DEFAULT_RATE_DB,
+    lease_sec=90,
+    max_attempts=3,
+    poll_ms=500,
+):
+    """
+    워커 프로세스 본체: 큐에서 URL을 빈 탭 수만큼 가져와 상세 탭 풀로 열고 결과를 큐에 씁니다.
+    코디네이터가 발견을 끝냈고 남은 항목이 없으면(또는 abort 표시가 있으면) 종료합니다.
+    """
+    kst    = timezone(timedelta(hours=9))
+    name   = f"w{index}"
+    queue  = WorkQueue(queue_path, lease_sec=lease_sec, max_attempts=max_attempts)
+    stats  = Counter()
+    window = tuple(window)
+
+    with sync_playwright() as playwright:
+        browser, _, _   = connect_or_launch(playwright, headless=headless, cdp_url=browser_cdp_url)
+        context_options = {"service_workers": "block"} if resource_policy else {}
+        context         = browser.new_context(storage_state=state_path, **context_options)
+        if resource_policy:
+            ResourcePolicy(mode=resource_policy).attach(context)
+
+        scheduler = NavigationScheduler(nav_rate_db, per_minute=nav_per_minute) if nav_per_minute else None
+        pool      = DetailTabPool(context, detail_tabs, scheduler=scheduler)
+        started   = time.monotonic()
+
+        try:
+            while not queue.get_meta("abort"):
+                free = sum(not slot.busy for slot in pool.slots) - pool.backlog()
+                if free > 0:
+                    for seq, url in queue.claim(name, index, workers, limit=free):
+                        pool.submit(seq, url)
+
+                if not pool.has_work():
+                    if queue.finished():
+                        break
+                    pool.slots[0].page.wait_for_timeout(poll_ms)
+                    continue
+
+                slot   = pool.next_ready()
+                result = inspect_detail_slot(slot, kst, window)
+                seq    = slot.seq
+                pool.release(slot)
+
+                if result["kind"] in ("detail_fail", "date_fail"):
+                    outcome = queue.fail(seq, name, result["kind"], result)
+                    stats[outcome] += 1
+                    if outcome == "retry":
+                        print(f"🔁 [{name}] 재시도 대기: {result['url']}")
+                elif queue.complete(seq, name, result):
+                    stats["done"] += 1
+                else:
+                    stats["lost"] += 1  # 리스가 다른 워커로 넘어갔거나 조기 종료로 취소됨
+        finally:
+            pool.close()
+            context.close()
+            browser.close()
+            queue.close()
+
+    elapsed_min = (time.monotonic() - started) / 60
+    print(
+        f"[워커 {name}] 완료 {stats['done']} / 재시도 {stats['retry']} / 포기 {stats['dead']}"
+        f" / 결과 버림 {stats['lost']} / {stats['done'] / elapsed_min if elapsed_min else 0:.1f} posts/min"
+    )
+
+
+def start_workers(workers, **worker_kwargs):
+    """워커 프로세스 N개를 띄웁니다. 출력은 코디네이터(Airflow 태스크 로그)에 그대로 섞여 나옵니다."""
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, [str(PACKAGE_ROOT), os.getenv("PYTHONPATH")]))}
+    return [
+        subprocess.Popen(
+            [
+                sys.executable, "-m", "extractors.parallel_extract", "--worker",
+                json.dumps({"index": index, "workers": workers, **worker_kwargs}),
+            ],
+            env=env,
+        )
+        for index in range(workers)
+    ]
+
+
+# ── 병합 ─────────────────────────────────────────────────────────
+
+def merge_results(rows, brand_id, brand_name, filter_self_tag=True):
+    """
+    큐 결과 [(seq, url, result)]를 그리드 순서대로 POST_COLUMNS 튜플 리스트로 합칩니다.
+    반환 (posts, Counter) — Counter는 결과 종류별 건수와 자기 태그·post_id 중복 제외 건수.
+    큐는 URL로만 중복을 막으므로 /<user>/p/<code>/ 와 /p/<code>/ 가 둘 다 들어올 수 있어 post_id로 한 번 더 거릅니다.
+    """
+    posts  = []
+    counts = Counter()
+    seen   = set()
+
+    for _, _, result in rows:
+        kind = result["kind"] if result else "detail_fail"  # 결과 없이 포기된 항목
+        counts[kind] += 1
+        if kind != "candidate":
+            continue
+
+        post_id, insta_id, insta_name, full_link, src, insta_tag, tags_cnt = result["post_data"]
+
+        if post_id in seen:
+            counts["duplicate"] += 1
+            continue
+        seen.add(post_id)
+
+        if filter_self_tag and _is_self_tagged(insta_id, brand_id):
+            counts["self_tag"] += 1
+            continue
+
+        posts.append((
+            post_id, insta_id, insta_name,
+            brand_name, brand_id,
+            full_link, src, result["post_date"],
+            insta_tag, tags_cnt,
+        ))
+
+    return posts, counts
+
+
+# ── 코디네이터 ───────────────────────────────────────────────────
+
+def run_parallel(
+    state_path="/opt/airflow/secrets/storage_state.json",
+    login_url="https://www.instagram.com/accounts/login/",
+    username=os.getenv("ID"),
+    password=os.getenv("PW"),
+    brand_name=None,
+    brand_id=None,
+    workers=4,
+    detail_tabs=2,
+    scroll_y=700,
+    max_scrolls=50,
+    wait_ms=5000,
+    headless=True,
+    target_day=None,
+    date_from=None,
+    date_to=None,
+    filter_self_tag=True,
+    filter_business=True,
+    business_cache_path=DEFAULT_CACHE_PATH,
+    known_posts=None,
+    known_stop_streak=0,
+    queue_path=None,
+    profile_tabs=2,
+    profile_rate_ms=500,
+    session_min_ttl_hours=24,
+    browser_cdp_url=DEFAULT_CDP_URL,
+    resource_policy=None,
+    nav_per_minute=DEFAULT_NAV_PER_MINUTE,
+    nav_rate_db=DEFAULT_RATE_DB,
+    lease_sec=90,
+    max_attempts=3,
+):
+    """
+    브랜드 태그 페이지의 게시물을 워커 프로세스 workers개로 나눠 수집해 리스트로 반환합니다.
+
+    Args:
+        workers          : 워커 프로세스 수 (각자 브라우저 컨텍스트 하나)
+        detail_tabs      : 워커 하나가 동시에 쓰는 상세 탭 수
+        queue_path       : 작업 큐 SQLite 파일 — 재시도 시 끝난 URL은 다시 열지 않음.
+                           결과를 다른 곳에 저장한 뒤 WorkQueue(queue_path).clear()로 정리
+                           (None이면 임시 파일을 쓰고 끝나면 지움)
+        lease_sec        : 워커가 가져간 URL을 이 시간 안에 못 끝내면 다른 워커가 가져감
+        max_attempts     : URL 하나당 최대 시도 횟수 (상세·날짜 실패 시 재시도)
+        나머지           : run()과 같음
+
+    종료 조건은 collect_posts_with_scroll과 같습니다 (max_scrolls, 그리드 끝,
+    과거 게시물 5번 연속, 기존 적재 게시물 known_stop_streak번 연속). 연속 판단은 워커 결과가
+    그리드 순서대로 이어지는 구간까지만 보므로, 조기 종료 시점에는 뒤쪽 URL 몇 개가 이미 조회돼 있을 수 있습니다.
+    """
+    kst        = timezone(timedelta(hours=9))
+    window     = resolve_date_window(target_day, date_from, date_to)
+    temp_queue = queue_path is None
+    if temp_queue:
+        queue_path = os.path.join(tempfile.gettempdir(), f"{brand_name}_{os.getpid()}.queue.sqlite")
+
+    queue = WorkQueue(queue_path, lease_sec=lease_sec, max_attempts=max_attempts)
+    queue.reopen()
+    resumed = queue.progress()
+    if resumed:
+        print(f"[작업 큐] 이전 시도 이어서: {dict(resumed)}")
+
+    started          = time.monotonic()
+    discovered_at    = started
+    past_date_streak = 0
+    known_streak     = 0
+    known_skip_cnt   = 0
+    apply_seq        = 0      # 다음에 연속 판단할 순번
+    stop_seq         = None   # 조기 종료한 순번 (그 뒤 결과는 병합하지 않음)
+    stop_reason      = None
+    processes        = []
+    clean_exit       = False
+
+    def advance():
+        """그리드 순서가 이어지는 결과까지 과거/기존 적재 연속을 판단합니다. 조기 종료하면 True."""
+        nonlocal past_date_streak, known_streak, apply_seq, stop_seq, stop_reason
+
+        if stop_seq is not None:
+            return True
+
+        for seq, _, result in queue.results_from(apply_seq):
+            apply_seq = seq + 1
+            kind      = result["kind"] if result else "detail_fail"
+
+            if result and result.get("known"):
+                known_streak += 1
+                if known_stop_streak and known_streak >= known_stop_streak:
+                    print(f"{known_streak}번 연속 기존 적재 게시물 → 수집 종료")
+                    stop_reason = f"known_streak>={known_stop_streak}"
+            elif kind not in ("detail_fail", "date_fail"):
+                known_streak = 0
+
+            if kind == "past":
+                past_date_streak += 1
+                if past_date_streak >= 5 and stop_reason is None:
+                    print("5번 연속 과거 게시물 → 수집 종료")
+                    stop_reason = "past_date_streak>=5"
+            elif kind not in ("detail_fail", "date_fail"):
+                past_date_streak = 0
+
+            if stop_reason is not None:
+                stop_seq  = seq
+                cancelled = queue.cancel_after(seq)
+                print(f"[작업 큐] 조기 종료: 순번 {seq} 뒤 {cancelled}건 취소")
+                return True
+        return False
+
+    def check_workers():
+        """워커가 모두 죽었는데 남은 일이 있으면 실패 처리합니다."""
+        if processes and all(process.poll() is not None for process in processes) and not queue.drained():
+            codes = [process.returncode for process in processes]
+            raise RuntimeError(f"워커 프로세스가 모두 종료됨 (종료 코드 {codes}) — 남은 작업: {dict(queue.progress())}")
+
+    with sync_playwright() as playwright:
+        browser, _, _   = connect_or_launch(playwright, headless=headless, cdp_url=browser_cdp_url)
+        context_options = {"service_workers": "block"} if resource_policy else {}
+        context         = browser.new_context(storage_state=state_path, **context_options)
+        policy          = ResourcePolicy(mode=resource_policy).attach(context) if resource_policy else None
+
+        grid_page    = context.new_page()
+        profile_page = context.new_page()
+        if policy is not None:
+            policy.assign(grid_page, "grid")
+            policy.assign(profile_page, "profile")
+
+        session   = SessionState(state_path, min_ttl_hours=session_min_ttl_hours)
+        scheduler = NavigationScheduler(nav_rate_db, per_minute=nav_per_minute) if nav_per_minute else None
+
+        try:
+            open_tagged_with_session(grid_page, brand_id, session, login_url, username, password, scheduler)
+            # 로그인을 새로 했으면 워커들이 그 쿠키로 시작하도록 먼저 저장
+            session.save(context)
+
+            processes = start_workers(
+                workers,
+                queue_path=str(queue_path),
+                state_path=str(state_path),
+                window=list(window),
+                detail_tabs=detail_tabs,
+                headless=headless,
+                browser_cdp_url=browser_cdp_url,
+                resource_policy=resource_policy,
+                nav_per_minute=nav_per_minute,
+                nav_rate_db=nav_rate_db,
+                lease_sec=lease_sec,
+                max_attempts=max_attempts,
+            )
+            print(f"[병렬 수집] 워커 {workers}개 시작 (워커당 상세 탭 {detail_tabs}개)")
+
+            # ── 그리드 스크롤 → 작업 큐 적재 ────────────────────
+            install_post_link_collector(grid_page)
+            scroll_step     = scroll_y
+            max_scroll_step = scroll_y * 4
+            no_change_count = 0
+            scroll_count    = 0
+            queued_cnt      = 0
+
+            while scroll_count < max_scrolls:
+                links, total = drain_post_links(grid_page)
+
+                for url in links:
+                    post_match = POST_URL_RE.search(url)
+                    shortcode  = post_match.group(1) if post_match else None
+                    known_date = known_posts.get(shortcode) if known_posts and shortcode else None
+
+                    # 이미 적재된 게시물은 워커 없이 저장된 날짜로 바로 판단
+                    if known_date is not None and classify_post_date(known_date, window) != "candidate":
+                        known_skip_cnt += queue.add(url, {
+                            "kind":      classify_post_date(known_date, window),
+                            "url":       url,
+                            "post_date": known_date,
+                            "known":     True,
+                        })
+                    else:
+                        queued_cnt += queue.add(url)
+
+                print(
+                    f"[스크롤 {scroll_count}] 전체: {total}개 / 신규: {len(links)}개"
+                    f" / 큐: {dict(queue.progress())}"
+                )
+
+                check_workers()
+                if advance():
+                    break
+
+                if links:
+                    no_change_count = 0
+                    scroll_step     = min(int(scroll_step * 1.5), max_scroll_step)
+                else:
+                    no_change_count += 1
+                    at_bottom        = grid_page.evaluate(GRID_AT_BOTTOM_SCRIPT)
+                    no_change_limit  = 2 if at_bottom else 3
+                    scroll_step      = scroll_y if at_bottom else min(scroll_step * 2, max_scroll_step)
+                    print(
+                        f"⚠️ 새 게시물 없음 ({no_change_count}/{no_change_limit})"
+                        f"{' — 그리드 바닥' if at_bottom else ''}"
+                    )
+                    if no_change_count >= no_change_limit:
+                        print(f"{no_change_count}번 연속 새 게시물 없음 → 그리드 끝 도달, 종료")
+                        break
+
+                grid_page.mouse.wheel(0, scroll_step)
+                wait_until(grid_page, "scroll_new_posts", GRID_COLLECTOR_PENDING_SCRIPT, timeout_ms=wait_ms)
+                scroll_count += 1
+
+            # ── 남은 작업이 끝날 때까지 연속 판단 ─────────────────
+            queue.set_meta("discovery_done", True)
+            discovered_at = time.monotonic()
+            while stop_seq is None and not queue.drained():
+                check_workers()
+                if advance():
+                    break
+                grid_page.wait_for_timeout(500)
+            advance()
+
+            for process in processes:
+                process.wait(timeout=120)
+            clean_exit = True
+        finally:
+            if not clean_exit:
+                queue.set_meta("abort", True)
+            for process in processes:
+                if process.poll() is None:
+                    try:
+                        process.wait(timeout=30)
+                    except subprocess.TimeoutExpired:
+                        process.kill()
+
+        # ── 병합 + 필터 2: 비즈니스/편집샵 계정 제외 ─────────
+        rows = [row for row in queue.results_from(0) if stop_seq is None or row[0] <= stop_seq]
+        posts, counts = merge_results(rows, brand_id, brand_name, filter_self_tag)
+        worker_stats  = queue.worker_stats()
+        progress      = queue.progress()
+
+        business_store = BusinessVerdictStore(business_cache_path) if filter_business and business_cache_path else None
+        business_cache = business_store.preload() if business_store else {}
+        business_cnt   = 0
+        if filter_business and posts:
+            extra_pages = [context.new_page() for _ in range(max(0, profile_tabs - 1))]
+            try:
+                classify_business_accounts(
+                    [profile_page, *extra_pages],
+                    [post[1] for post in posts],
+                    business_cache,
+                    business_store,
+                    min_interval_ms=profile_rate_ms,
+                    scheduler=scheduler,
+                )
+            finally:
+                for page in extra_pages:
+                    page.close()
+                if business_store is not None:
+                    business_store.save()
+
+            kept         = [post for post in posts if not business_cache.get(post[1], False)]
+            business_cnt = len(posts) - len(kept)
+            posts        = kept
+
+        session.save(context)
+        profile_page.close()
+        grid_page.close()
+        context.close()
+        browser.close()
+
+    if temp_queue:
+        queue.clear()
+    else:
+        queue.close()
+
+    elapsed_min = (time.monotonic() - started) / 60
+    print(
+        f"\n[병렬 수집 완료] {brand_name} ({window_label(window)})"
+        f"\n  수집    : {len(posts)}개"
+        f"\n  필터 제외: 자기태그 {counts['self_tag']}건 / 중복 {counts['duplicate']}건 / 비즈니스 {business_cnt}건"
+        f"\n  상세 실패: {counts['detail_fail']}건 (재시도 {max_attempts}회 후 포기)"
+        f"\n  날짜 실패: {counts['date_fail']}건"
+        f"\n  기존 적재: {known_skip_cnt}건 (상세 조회 생략)"
+        f"\n  큐 상태 : {dict(progress)}"
+        f"\n  종료 사유: {stop_reason}"
+        f"\n  소요    : {elapsed_min:.1f}분 (발견 이후 {(time.monotonic() - discovered_at) / 60:.1f}분)"
+    )
+    print("\n[워커별 처리]")
+    for name, stat in worker_stats.items():
+        print(
+            f"  {name:<4} 처리 {stat['done']} / 스틸 {stat['stolen']} / 재시도 거침 {stat['retried']}"
+            f" / {stat['done'] / elapsed_min if elapsed_min else 0:.1f} posts/min"
+        )
+    return posts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="브랜드 태그 게시물 병렬 수집")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)  # 코디네이터가 워커를 띄울 때만 사용
+    parser.add_argument("brand_id", nargs="?")
+    parser.add_argument("brand_name", nargs="?")
+    parser.add_argument("--date", help="수집 대상 날짜 YYYY-MM-DD")
+    parser.add_argument("--workers", type=int, default=4, help="워커 프로세스 수")
+    parser.add_argument("--detail-tabs", type=int, default=2, help="워커당 상세 탭 수")
+    parser.add_argument("--state-path", default="/opt/airflow/secrets/storage_state.json")
+    parser.add_argument("--headed", action="store_true", help="브라우저 창 표시")
+    args = parser.parse_args()
+
+    if args.worker:
+        extract_worker(**json.loads(args.worker))
+        return
+
+    if not args.brand_id or not args.brand_name:
+        parser.error("brand_id와 brand_name이 필요합니다")
+
+    run_parallel(
+        state_path=args.state_path,
+        brand_id=args.brand_id,
+        brand_name=args.brand_name,
+        target_day=args.date,
+        workers=args.workers,
+        detail_tabs=args.detail_tabs,
+        headless=not args.headed,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""
+profiler.py
+
+스크래퍼 핫 루프의 단계별 소요 시간을 게시물·스크롤 단위로 모으는 프로파일러입니다.
+
+수집 끝의 건수 요약만으로는 시간이 네비게이션, 준비 대기, evaluate, 프로필 확인,
+스크롤 중 어디에 쓰였는지 알 수 없어서, 단계(phase)마다 시간을 잽니다.
+
+  - phase()/add()  : 단계 시간 기록 (post를 주면 게시물별 내역에도 합산)
+  - end_scroll()   : 직전 스크롤 이후 쌓인 단계 시간을 스크롤 기록 하나로 마감
+  - write_json()   : 실행 프로필을 JSON으로 저장 (CSV 옆에 두고 실행 간 비교)
+  - top_posts_lines(): 가장 느린 게시물 top-N 표
+
+WAIT_STATS처럼 모듈 전역 PROFILE 하나를 run() 시작 시 reset()해서 씁니다.
+"""
+
+import json
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+from extractors.readiness import percentile
+
+
+class RunProfile:
+    """단계별 시간(ms)을 전체·게시물·스크롤 단위로 모읍니다."""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self, label=None):
+        self.label         = label
+        self.started_at    = datetime.now().isoformat(timespec="seconds")
+        self._started      = time.monotonic()
+        self.phases        = defaultdict(list)  # {phase: [ms, ...]}
+        self.posts         = {}                 # {url: {"path", "outcome", "phases": {phase: ms}}}
+        self.scrolls       = []
+        self._scroll_acc   = defaultdict(float)
+        self._scroll_start = time.monotonic()
+
+    # ── 기록 ─────────────────────────────────────────────────────
+
+    def add(self, name, elapsed_ms, post=None):
+        """이미 잰 시간을 단계 name에 더합니다. post(URL)를 주면 그 게시물 내역에도 합산합니다."""
+        self.phases[name].append(elapsed_ms)
+        self._scroll_acc[name] += elapsed_ms
+        if post is not None:
+            phases       = self._post(post)["phases"]
+            phases[name] = phases.get(name, 0.0) + elapsed_ms
+
+    @contextmanager
+    def phase(self, name, post=None):
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self.add(name, (time.monotonic() - started) * 1000, post)
+
+    def mark_post(self, post, **fields):
+        """게시물 처리 경로(path)·결과(outcome) 같은 속성을 기록합니다."""
+        self._post(post).update(fields)
+
+    def end_scroll(self, index, **fields):
+        """직전 스크롤 이후의 단계 시간을 스크롤 기록 하나로 마감합니다."""
+        now = time.monotonic()
+        self.scrolls.append({
+            "index":   index,
+            "wall_ms": round((now - self._scroll_start) * 1000, 1),
+            "phases":  {name: round(ms, 1) for name, ms in self._scroll_acc.items()},
+            **fields,
+        })
+        self._scroll_acc   = defaultdict(float)
+        self._scroll_start = now
+
+    def _post(self, post):
+        return self.posts.setdefault(post, {"path": None, "outcome": None, "phases": {}})
+
+    # ── 출력 ─────────────────────────────────────────────────────
+
+    def _post_rows(self):
+        rows = []
+        for url, info in self.posts.items():
+            total = sum(info["phases"].values())
+            rows.append({"url": url, "total_ms": round(total, 1), **info})
+        return sorted(rows, key=lambda row: row["total_ms"], reverse=True)
+
+    def to_dict(self) -> dict:
+        return {
+            "label":      self.label,
+            "started_at": self.started_at,
+            "wall_ms":    round((time.monotonic() - self._started) * 1000, 1),
+            "phases": {
+                name: {
+                    "count":    len(values),
+                    "total_ms": round(sum(values), 1),
+                    "p50_ms":   round(percentile(values, 50), 1),
+                    "p95_ms":   round(percentile(values, 95), 1),
+                }
+                for name, values in sorted(self.phases.items())
+            },
+            "scrolls": self.scrolls,
+            "posts":   self._post_rows(),
+        }
+
+    def write_json(self, path):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.to_dict(), ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"[프로필 저장] {path}")
+
+    def summary_lines(self) -> list[str]:
+        """
+        단계별 합계와 실행 벽시계 대비 비율.
+        상세 탭 단계(detail_ready/detail_settle)는 탭끼리 겹쳐 흐르므로 100%를 넘을 수 있습니다.
+        """
+        wall  = (time.monotonic() - self._started) * 1000
+        lines = []
+        for name, values in sorted(self.phases.items(), key=lambda item: -sum(item[1])):
+            total = sum(values)
+            lines.append(
+                f"{name:<16} n={len(values):<4} 합계 {total:>8.0f}ms ({total / max(wall, 1e-6):>5.1%})"
+                f" p50 {percentile(values, 50):>6.0f}ms p95 {percentile(values, 95):>6.0f}ms"
+            )
+        return lines
+
+    def top_posts_lines(self, n=10) -> list[str]:
+        lines = []
+        for row in self._post_rows()[:n]:
+            phases = " ".join(
+                f"{name}:{ms:.0f}"
+                for name, ms in sorted(row["phases"].items(), key=lambda item: -item[1])
+            )
+            lines.append(
+                f"{row['total_ms']:>7.0f}ms  {row['path'] or '-':<8} {row['outcome'] or '-':<11}"
+                f" {row['url']}  | {phases}"
+            )
+        return lines
+
+
+# 스크래퍼 실행 하나 동안의 프로필 (run() 시작 시 reset)
+PROFILE = RunProfile()
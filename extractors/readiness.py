@@ -0,0 +1,127 @@
+"""
+readiness.py
+
+고정 sleep 대신 "구체적인 DOM 조건이 만족될 때까지, 최대 deadline까지" 기다리는 대기 계층입니다.
+
+모든 대기는 종류(name)별로 실제 걸린 시간과 조건 충족 여부를 WAIT_STATS에 남기고,
+실행이 끝나면 summary_lines()로 p50/p95와 구간별 분포를 출력합니다.
+타임아웃 값은 이 분포를 보고 조정합니다.
+"""
+
+import time
+
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+
+
+# 히스토그램 구간 경계 (ms)
+HISTOGRAM_BUCKETS_MS = (100, 250, 500, 1000, 2000, 5000)
+
+
+def percentile(values, pct):
+    """nearest-rank 백분위수. 값이 없으면 0."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index   = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+class WaitStats:
+    """대기 종류별 소요 시간(ms)과 조건 충족/타임아웃 횟수를 모읍니다."""
+
+    def __init__(self):
+        self.waits = {}  # {name: {"met": int, "timeout": int, "elapsed_ms": [float]}}
+
+    def reset(self):
+        self.waits = {}
+
+    def record(self, name, elapsed_ms, met=True):
+        stats = self.waits.setdefault(name, {"met": 0, "timeout": 0, "elapsed_ms": []})
+        stats["met" if met else "timeout"] += 1
+        stats["elapsed_ms"].append(elapsed_ms)
+
+    def histogram(self, name) -> list[int]:
+        """HISTOGRAM_BUCKETS_MS 경계 기준 구간별 건수 (마지막 칸은 최댓값 경계 초과)."""
+        counts = [0] * (len(HISTOGRAM_BUCKETS_MS) + 1)
+        for elapsed in self.waits.get(name, {}).get("elapsed_ms", []):
+            index = next(
+                (i for i, bound in enumerate(HISTOGRAM_BUCKETS_MS) if elapsed < bound),
+                len(HISTOGRAM_BUCKETS_MS),
+            )
+            counts[index] += 1
+        return counts
+
+    def summary_lines(self) -> list[str]:
+        labels = [f"<{bound}" for bound in HISTOGRAM_BUCKETS_MS] + [f">={HISTOGRAM_BUCKETS_MS[-1]}"]
+        lines  = []
+
+        for name, stats in sorted(self.waits.items()):
+            elapsed   = stats["elapsed_ms"]
+            histogram = " ".join(
+                f"{label}:{count}" for label, count in zip(labels, self.histogram(name)) if count
+            )
+            lines.append(
+                f"{name:<16} n={len(elapsed):<4}"
+                f" 타임아웃 {stats['timeout']:<3}"
+                f" p50 {percentile(elapsed, 50):>6.0f}ms"
+                f" p95 {percentile(elapsed, 95):>6.0f}ms"
+                f" | {histogram}"
+            )
+        return lines
+
+
+# 스크래퍼 실행 하나 동안의 대기 통계 (run() 시작 시 reset)
+WAIT_STATS = WaitStats()
+
+
+def evaluate_ready(page, script) -> bool:
+    """
+    script(JS 함수)를 한 번 실행해 준비 여부만 봅니다. 기다리지 않고 통계도 남기지 않습니다.
+    여러 탭을 번갈아 확인하는 폴링 루프용 (네비게이션 중 실행 컨텍스트가 사라지면 False).
+    """
+    try:
+        return bool(page.evaluate(script))
+    except Exception:
+        return False
+
+
+def wait_until(page, name, script, timeout_ms, arg=None, polling=100) -> bool:
+    """
+    page에서 script(JS 함수)가 truthy를 반환할 때까지 최대 timeout_ms 기다립니다.
+    조건이 만족되면 True, 시간이 다 되면 예외 없이 False를 반환합니다.
+    """
+    started = time.monotonic()
+    try:
+        page.wait_for_function(script, arg=arg, timeout=timeout_ms, polling=polling)
+        met = True
+    except PlaywrightTimeoutError:
+        met = False
+
+    WAIT_STATS.record(name, (time.monotonic() - started) * 1000, met)
+    return met
+
+
+def wait_for_selector(page, name, selector, timeout_ms, state="visible") -> bool:
+    """selector가 state가 될 때까지 최대 timeout_ms 기다립니다. 결과는 wait_until과 같습니다."""
+    started = time.monotonic()
+    try:
+        page.wait_for_selector(selector, state=state, timeout=timeout_ms)
+        met = True
+    except PlaywrightTimeoutError:
+        met = False
+
+    WAIT_STATS.record(name, (time.monotonic() - started) * 1000, met)
+    return met
+
+
+def wait_for_locator(locator, name, timeout_ms, state="visible") -> bool:
+    """locator가 state가 될 때까지 최대 timeout_ms 기다립니다. 결과는 wait_until과 같습니다."""
+    started = time.monotonic()
+    try:
+        locator.wait_for(state=state, timeout=timeout_ms)
+        met = True
+    except PlaywrightTimeoutError:
+        met = False
+
+    WAIT_STATS.record(name, (time.monotonic() - started) * 1000, met)
+    return met
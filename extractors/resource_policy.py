@@ -0,0 +1,127 @@
+"""
+resource_policy.py
+
+스크래핑 중 쓰지 않는 무거운 리소스(원본 이미지, 동영상, 폰트, 트래킹 스크립트)를
+Playwright 라우팅으로 막는 정책입니다.
+
+스크래퍼가 읽는 것은 메타 태그, <time>, img alt, 그리드 링크, API JSON뿐이라
+이미지 본문이나 동영상을 받을 필요가 없습니다. 그리드·상세·프로필 탭 모두 이미지를 쓰지 않으므로
+(썸네일은 thumbnail_cache가 img_src로 따로 받음) 차단 규칙은 하나이고, 컨텍스트 하나에 라우트 하나로 적용합니다.
+페이지 역할(grid / detail / profile)은 어느 탭에서 얼마나 막았는지 통계를 나눠 보는 데만 씁니다.
+
+모드:
+  - "block"   : 정책에 걸린 요청을 abort (네트워크에 나가지 않으므로 요청 수만 집계, 바이트는 모름)
+  - "measure" : 막지 않고 통과시키면서, 정책에 걸렸을 요청의 수와 응답 바이트(content-length)를 집계
+                (block으로 바꾸면 얼마나 아낄지 확인용)
+
+역할을 지정하지 않은 탭(상세 탭 풀이 여는 탭 등)은 default_role로 집계합니다.
+"""
+
+import re
+from collections import Counter
+
+
+# 트래킹·로깅 요청 (수집과 무관)
+TRACKER_PATTERNS = (
+    r"connect\.facebook\.net",
+    r"facebook\.com/tr",
+    r"google-analytics\.com",
+    r"googletagmanager\.com",
+    r"doubleclick\.net",
+    r"/logging_client_events",
+    r"/ajax/bz",
+)
+
+# 차단할 리소스 종류. stylesheet·script·xhr/fetch는 그리드 레이아웃과 SPA 동작에 필요하므로 막지 않음
+BLOCKED_TYPES = ("image", "media", "font")
+
+POLICY_MODES = ("block", "measure")
+
+
+class ResourcePolicy:
+    """리소스 차단 규칙 + 페이지 역할별 차단 통계."""
+
+    def __init__(self, mode="block", types=BLOCKED_TYPES, patterns=TRACKER_PATTERNS, default_role="detail"):
+        if mode not in POLICY_MODES:
+            raise ValueError(f"지원하지 않는 정책 모드: {mode} (가능: {', '.join(POLICY_MODES)})")
+
+        self.mode         = mode
+        self.default_role = default_role
+        self.types        = frozenset(types)
+        self.pattern      = re.compile("|".join(patterns)) if patterns else None
+        self.roles        = {}         # {page: role}
+        self.blocked      = Counter()  # {(role, 종류): 요청 수}
+        self.allowed      = Counter()  # {role: 요청 수}
+        self.saved_bytes  = Counter()  # {role: 바이트} — measure 모드에서만
+        self._matched     = {}         # {request: role} — measure 모드 응답 크기 집계용 (응답·실패 때 제거)
+
+    # ── 적용 ─────────────────────────────────────────────────────
+
+    def attach(self, context):
+        """컨텍스트의 모든 요청에 정책을 겁니다. (HAR 재생 라우트보다 나중에 걸어야 먼저 검사됨)"""
+        context.route("**/*", self._handle)
+        if self.mode == "measure":
+            context.on("response", self._on_response)
+            context.on("requestfailed", self._on_request_failed)
+        return self
+
+    def assign(self, page, role):
+        self.roles[page] = role
+        return page
+
+    def _match(self, request):
+        if request.resource_type in self.types:
+            return request.resource_type
+        if self.pattern is not None and self.pattern.search(request.url):
+            return "tracker"
+        return None
+
+    def _handle(self, route):
+        request = route.request
+        try:
+            role = self.roles.get(request.frame.page, self.default_role)
+        except Exception:
+            role = self.default_role  # 서비스 워커 등 프레임이 없는 요청
+
+        kind = self._match(request)
+        if kind is None:
+            self.allowed[role] += 1
+            route.fallback()
+            return
+
+        self.blocked[(role, kind)] += 1
+        if self.mode == "block":
+            route.abort("blockedbyclient")
+        else:
+            self._matched[request] = role
+            route.fallback()
+
+    def _on_response(self, response):
+        role = self._matched.pop(response.request, None)
+        if role is None:
+            return
+        length = response.headers.get("content-length")
+        if length and length.isdigit():
+            self.saved_bytes[role] += int(length)
+
+    def _on_request_failed(self, request):
+        self._matched.pop(request, None)  # 응답 없이 끝난 요청 (중단·네트워크 오류)
+
+    # ── 출력 ─────────────────────────────────────────────────────
+
+    def summary_lines(self) -> list[str]:
+        verb  = "차단" if self.mode == "block" else "차단 대상(측정만)"
+        lines = []
+        for role in sorted({role for role, _ in self.blocked} | set(self.allowed)):
+            kinds   = {kind: count for (r, kind), count in self.blocked.items() if r == role}
+            total   = sum(kinds.values())
+            detail  = " ".join(f"{kind}:{count}" for kind, count in sorted(kinds.items(), key=lambda item: -item[1]))
+            size    = (
+                f" / {self.saved_bytes[role] / 1024 / 1024:.1f}MB" if self.mode == "measure"
+                else " / 크기 미집계(measure 모드에서만)"
+            )
+            lines.append(
+                f"{role:<8} {verb} {total}건{size} / 통과 {self.allowed[role]}건"
+                f"{f' | {detail}' if detail else ''}"
+            )
+        return lines
@@ -0,0 +1,225 @@
+"""
+session_pool.py
+
+storage_state 파일 여러 개(계정 여러 개)를 나눠 쓰는 세션 풀입니다.
+
+storage_state.json 하나, 계정 하나로 모든 수집이 돌면 계정별 요청 제한이 전체 처리량의 상한이 됩니다.
+세션 디렉터리의 *.json을 각각 한 계정으로 보고, 상태를 로컬 SQLite 파일 하나에 두어
+동시에 도는 수집 태스크들이 같은 풀을 나눠 씁니다.
+
+  - 배정     : 격리되지 않은 세션 중 쿨다운이 끝난 것 → 지금 빌려 간 태스크 수(부하)가 적은 것
+               → 오래 쉰 것 순서. 모두 쿨다운 중이면 그중 부하가 가장 적은 세션을 그대로 씀
+  - 쿨다운   : 반납(release) 후 cooldown_sec 동안은 다른 세션을 먼저 배정
+  - 격리     : 로그인 리다이렉트 또는 sessionid 없음 → quarantine_sec 동안 배정 제외
+               (계정마다 비밀번호가 달라 자동 재로그인은 하지 않음 — secrets/save_state.py로 다시 저장)
+  - 카운터   : 세션별 이번 실행의 브랜드·게시물·상세 이동·HTTP 조회 수를 모아 요약에 출력
+
+태스크가 죽어 반납하지 못한 대여는 lease_ttl_sec이 지나면 부하 계산에서 빠집니다.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from collections import Counter, defaultdict
+from pathlib import Path
+
+from extractors.session_state import SessionState
+
+
+DEFAULT_SESSION_DIR  = os.getenv("INSTA_SESSION_DIR")  # 없으면 storage_state.json 하나만 사용
+DEFAULT_SESSION_DB   = os.getenv("INSTA_SESSION_POOL_DB", "/opt/airflow/data/instagram_sessions.sqlite")
+
+
+class NoHealthySession(RuntimeError):
+    """배정할 수 있는 세션이 하나도 없음 (전부 격리됨)."""
+
+
+class SessionPool:
+    """계정별 storage_state 파일의 부하·쿨다운·격리 상태를 프로세스 간에 공유합니다."""
+
+    def __init__(
+        self,
+        state_paths,
+        db_path=DEFAULT_SESSION_DB,
+        cooldown_sec=300,
+        quarantine_sec=6 * 3600,
+        lease_ttl_sec=3600,
+    ):
+        self.paths          = {Path(path).stem: str(path) for path in state_paths}
+        self.db_path        = Path(db_path)
+        self.cooldown_sec   = cooldown_sec
+        self.quarantine_sec = quarantine_sec
+        self.lease_ttl_sec  = lease_ttl_sec
+        self.counters       = defaultdict(Counter)  # {name: Counter} 이번 실행 카운터
+        self.started        = {}                    # {lease_id: 대여 시작 monotonic}
+        self.elapsed_sec    = Counter()             # {name: 대여 시간 합계}
+        self._lock          = threading.Lock()
+
+        if not self.paths:
+            raise ValueError("세션 풀에 storage_state 파일이 없습니다")
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS sessions (
+                    name              TEXT PRIMARY KEY,
+                    cooldown_until    REAL NOT NULL DEFAULT 0,
+                    quarantined_until REAL NOT NULL DEFAULT 0,
+                    reason            TEXT,
+                    last_used         REAL NOT NULL DEFAULT 0
+                )
+                """
+            )
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS leases (
+                    lease_id   TEXT PRIMARY KEY,
+                    name       TEXT NOT NULL,
+                    started_at REAL NOT NULL
+                )
+                """
+            )
+            conn.executemany(
+                "INSERT OR IGNORE INTO sessions (name) VALUES (?)", [(name,) for name in self.paths]
+            )
+
+    @classmethod
+    def from_dir(cls, session_dir, **kwargs):
+        return cls(sorted(Path(session_dir).glob("*.json")), **kwargs)
+
+    def _connect(self):
+        return sqlite3.connect(self.db_path, timeout=10, isolation_level=None)
+
+    # ── 대여 / 반납 ──────────────────────────────────────────────
+
+    def acquire(self, exclude=()):
+        """
+        세션 하나를 빌려 (name, state_path, lease_id)를 반환합니다.
+        sessionid가 없는 파일은 이 자리에서 격리하고 다음 후보로 넘어갑니다.
+        """
+        while True:
+            conn = self._connect()
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+                now  = time.time()
+                rows = conn.execute(
+                    f"""
+                    SELECT s.name, s.cooldown_until, s.last_used,
+                           (SELECT COUNT(*) FROM leases l WHERE l.name = s.name AND l.started_at > ?) AS load
+                    FROM sessions s
+                    WHERE s.quarantined_until <= ?
+                      AND s.name IN ({",".join("?" * len(self.paths))})
+                    """,
+                    (now - self.lease_ttl_sec, now, *self.paths),
+                ).fetchall()
+                candidates = [row for row in rows if row[0] not in exclude]
+                if not candidates:
+                    conn.execute("ROLLBACK")
+                    raise NoHealthySession(f"배정 가능한 세션 없음 (전체 {len(self.paths)}개, 격리·제외됨)")
+
+                # 쿨다운 끝난 것 → 부하 적은 것 → 오래 쉰 것
+                name, *_ = min(candidates, key=lambda row: (row[1] > now, row[3], row[2]))
+                lease_id = uuid.uuid4().hex
+                conn.execute(
+                    "INSERT INTO leases (lease_id, name, started_at) VALUES (?, ?, ?)", (lease_id, name, now)
+                )
+                conn.execute("UPDATE sessions SET last_used = ? WHERE name = ?", (now, name))
+                conn.execute("COMMIT")
+            finally:
+                conn.close()
+
+            if SessionState(self.paths[name]).has_sessionid():
+                break
+            self.release(name, lease_id)
+            self.quarantine(name, "sessionid 없음")
+
+        self.started[lease_id] = time.monotonic()
+        print(f"[세션 풀] {name} 배정 ({self.paths[name]})")
+        return name, self.paths[name], lease_id
+
+    def release(self, name, lease_id):
+        """대여를 끝내고 쿨다운을 겁니다."""
+        now  = time.time()
+        conn = self._connect()
+        try:
+            conn.execute("DELETE FROM leases WHERE lease_id = ?", (lease_id,))
+            conn.execute(
+                "UPDATE sessions SET cooldown_until = ?, last_used = ? WHERE name = ?",
+                (now + self.cooldown_sec, now, name),
+            )
+        finally:
+            conn.close()
+
+        started = self.started.pop(lease_id, None)
+        if started is not None:
+            self.elapsed_sec[name] += time.monotonic() - started
+
+    # ── 상태 ─────────────────────────────────────────────────────
+
+    def quarantine(self, name, reason, seconds=None):
+        seconds = self.quarantine_sec if seconds is None else seconds
+        conn    = self._connect()
+        try:
+            conn.execute(
+                "UPDATE sessions SET quarantined_until = ?, reason = ? WHERE name = ?",
+                (time.time() + seconds, reason, name),
+            )
+        finally:
+            conn.close()
+
+        self.count(name, "quarantined")
+        print(f"🚫 [세션 풀] {name} 격리 {seconds / 3600:.1f}시간 — {reason}")
+
+    def healthy_sessions(self) -> dict:
+        """지금 격리되지 않은 {name: state_path} (HTTP 상세 조회 분산용)."""
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                "SELECT name FROM sessions WHERE quarantined_until <= ?", (time.time(),)
+            ).fetchall()
+        finally:
+            conn.close()
+        return {name: self.paths[name] for (name,) in rows if name in self.paths}
+
+    def count(self, name, key, amount=1):
+        with self._lock:
+            self.counters[name][key] += amount
+
+    # ── 출력 ─────────────────────────────────────────────────────
+
+    def summary_lines(self) -> list[str]:
+        conn = self._connect()
+        try:
+            status = {
+                name: (cooldown_until, quarantined_until, reason)
+                for name, cooldown_until, quarantined_until, reason in conn.execute(
+                    "SELECT name, cooldown_until, quarantined_until, reason FROM sessions"
+                )
+            }
+        finally:
+            conn.close()
+
+        now   = time.time()
+        lines = []
+        for name in self.paths:
+            cooldown_until, quarantined_until, reason = status.get(name, (0, 0, None))
+            if quarantined_until > now:
+                state = f"격리 {(quarantined_until - now) / 3600:.1f}h ({reason})"
+            elif cooldown_until > now:
+                state = f"쿨다운 {cooldown_until - now:.0f}s"
+            else:
+                state = "정상"
+
+            counter  = self.counters.get(name, Counter())
+            minutes  = self.elapsed_sec[name] / 60
+            per_min  = f" / {counter['posts'] / minutes:.1f} posts/min" if minutes > 0 else ""
+            lines.append(
+                f"{name:<16} {state:<20} 브랜드 {counter['brands']} / 게시물 {counter['posts']}"
+                f" / 상세 {counter['detail']} / HTTP {counter['http_ok']}성공·{counter['http_fail']}실패"
+                f"{per_min}"
+            )
+        return lines
@@ -0,0 +1,95 @@
+"""
+session_state.py
+
+Playwright storage_state.json 세션을 로컬에서 확인하고, 실행이 끝나면 갱신된 쿠키를 다시 저장합니다.
+
+ensure_logged_in은 매 실행마다 홈 페이지를 열어 로그인 상태를 확인하는데,
+sessionid 쿠키 만료 시각은 파일에 이미 들어 있으므로 충분히 남아 있으면 홈 이동 없이
+바로 tagged 페이지로 갑니다 (빠른 경로). tagged가 로그인으로 튕기면 그때 로그인합니다.
+
+실행 중 Instagram이 갱신해 준 쿠키는 성공한 실행 끝에 storage_state로 다시 저장해
+세션이 낡아서 느린 login()을 타는 일을 줄입니다. 저장은 임시 파일 → rename으로 교체해
+여러 브랜드 태스크가 동시에 저장해도 깨진 파일이 남지 않습니다.
+"""
+
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+
+
+SESSION_COOKIE = "sessionid"
+
+
+class SessionState:
+    """storage_state.json의 sessionid 만료 확인 + 원자적 저장."""
+
+    def __init__(self, state_path, min_ttl_hours=24):
+        self.path        = Path(state_path)
+        self.min_ttl_sec = min_ttl_hours * 3600
+
+    def _session_cookie(self):
+        try:
+            state = json.loads(self.path.read_text(encoding="utf-8"))
+        except (FileNotFoundError, ValueError):
+            return None
+        return next(
+            (
+                cookie for cookie in state.get("cookies", [])
+                if cookie.get("name") == SESSION_COOKIE and "instagram.com" in cookie.get("domain", "")
+            ),
+            None,
+        )
+
+    def has_sessionid(self) -> bool:
+        return self._session_cookie() is not None
+
+    def check(self):
+        """
+        (fresh, 사유)를 반환합니다.
+        sessionid 만료까지 min_ttl_hours 이상 남아 있을 때만 fresh=True (만료 시각이 없는 세션 쿠키는 확인 불가로 봄).
+        """
+        cookie = self._session_cookie()
+        if cookie is None:
+            return False, "sessionid 없음"
+
+        expires = cookie.get("expires", -1)
+        if expires is None or expires <= 0:
+            return False, "sessionid 만료 시각 없음"
+
+        remaining = expires - time.time()
+        if remaining < self.min_ttl_sec:
+            return False, f"sessionid 만료 임박 ({remaining / 3600:.1f}시간 남음)"
+        return True, f"sessionid {remaining / 86400:.1f}일 남음"
+
+    @staticmethod
+    def context_has_sessionid(context) -> bool:
+        """로그인된 컨텍스트의 쿠키에 sessionid가 남아 있는지 (실행 뒤 세션 만료 판정용)."""
+        return any(cookie.get("name") == SESSION_COOKIE for cookie in context.cookies())
+
+    def save(self, context) -> bool:
+        """
+        로그인된 컨텍스트의 storage_state를 파일에 원자적으로 덮어씁니다.
+        sessionid가 없거나 파일 쓰기에 실패하면 저장하지 않고 False (세션 만료 판정은 context_has_sessionid로).
+        """
+        state = context.storage_state()
+        if not any(cookie.get("name") == SESSION_COOKIE for cookie in state.get("cookies", [])):
+            print("⚠️ sessionid 없는 상태라 storage_state 저장 생략")
+            return False
+
+        tmp_path = None
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, prefix=f".{self.path.name}.")
+            with os.fdopen(fd, "w", encoding="utf-8") as file:
+                json.dump(state, file, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except OSError as exc:
+            print(f"⚠️ storage_state 저장 실패: {self.path} ({exc})")
+            if tmp_path is not None:
+                Path(tmp_path).unlink(missing_ok=True)
+            return False
+
+        print(f"[세션] storage_state 갱신 저장: {self.path}")
+        return True
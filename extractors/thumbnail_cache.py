@@ -0,0 +1,245 @@
+"""
+thumbnail_cache.py
+
+수집한 게시물의 img_src(Instagram CDN URL)를 작은 JPEG로 받아 로컬 디스크에 저장하는 썸네일 캐시입니다.
+
+CDN URL은 서명이 만료되고 우리 리전에서 느리게 열리므로, 대시보드가 태거 상세를 열 때마다
+CDN을 치지 않도록 수집 직후 한 번 받아 둡니다. TagScope 백엔드(routers/thumbnails.py)가
+같은 디렉터리를 읽어 긴 캐시 헤더로 서빙합니다.
+
+저장 구조 (root 아래):
+  - {digest[:2]}/{digest}.jpg : 리사이즈한 JPEG. 파일 이름이 내용의 sha256이라 같은 이미지는 한 번만 저장되고,
+                                내용이 바뀌지 않으므로 브라우저가 영구 캐시해도 됨
+  - index.sqlite              : thumbs(post_id → digest), blobs(digest → 크기·마지막 참조 시각)
+
+  - 조회     : asyncio + 세마포어로 동시 요청 수를 concurrency개로 제한 (requests 호출은 스레드에서)
+  - 저장     : 파일·인덱스 쓰기는 이벤트 루프 스레드 한 곳에서만 (SQLite 동시 쓰기 없음)
+  - 정리     : 전체 크기가 max_bytes를 넘으면 마지막 참조가 오래된 이미지부터 90%까지 삭제
+
+실행 (DAG 밖에서 수집 파일로 직접 채울 때):
+  python -m extractors.thumbnail_cache <parquet 또는 csv 경로> [...] [--concurrency 8]
+"""
+
+import argparse
+import asyncio
+import csv
+import hashlib
+import io
+import os
+import sqlite3
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+
+import duckdb
+import requests
+from requests.adapters import HTTPAdapter
+from PIL import Image
+
+
+# TagScope 백엔드(services/thumbnail_store.py)와 같은 환경변수 — 한쪽만 바꾸면 백엔드가 캐시를 못 찾음
+DEFAULT_THUMB_DIR = os.getenv("THUMBNAIL_DIR", "/opt/airflow/data/thumbnails")
+INDEX_FILE_NAME   = "index.sqlite"
+
+
+def thumbnail_path(root, digest) -> Path:
+    return Path(root) / digest[:2] / f"{digest}.jpg"
+
+
+def resize_jpeg(data, size=320, quality=80) -> bytes:
+    """긴 변이 size 픽셀이 되도록 줄여 JPEG 바이트로 반환합니다. (원본이 더 작으면 크기 유지)"""
+    with Image.open(io.BytesIO(data)) as image:
+        image.thumbnail((size, size))
+        buffer = io.BytesIO()
+        image.convert("RGB").save(buffer, format="JPEG", quality=quality, optimize=True)
+    return buffer.getvalue()
+
+
+class ThumbnailCache:
+    """게시물 img_src → 리사이즈 JPEG를 내용 주소(sha256)로 저장하고 크기 상한을 유지합니다."""
+
+    def __init__(
+        self,
+        root=DEFAULT_THUMB_DIR,
+        size=320,
+        quality=80,
+        max_bytes=512 * 1024 * 1024,
+        concurrency=8,
+        timeout=10,
+    ):
+        self.root        = Path(root)
+        self.size        = size
+        self.quality     = quality
+        self.max_bytes   = max_bytes
+        self.concurrency = concurrency
+        self.timeout     = timeout
+        self.stats       = Counter()
+
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(self.root / INDEX_FILE_NAME, timeout=10, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS thumbs (
+                post_id    TEXT PRIMARY KEY,
+                digest     TEXT NOT NULL,
+                src        TEXT,
+                fetched_at REAL NOT NULL
+            )
+            """
+        )
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS blobs (
+                digest    TEXT PRIMARY KEY,
+                bytes     INTEGER NOT NULL,
+                last_seen REAL NOT NULL
+            )
+            """
+        )
+
+        self.session = requests.Session()
+        self.session.headers.update({"User-Agent": "Mozilla/5.0"})
+        self.session.mount("https://", HTTPAdapter(pool_maxsize=concurrency))
+
+    # ── 조회 ─────────────────────────────────────────────────────
+
+    def missing(self, items):
+        """[(post_id, img_src)] 중 아직 썸네일이 없는 것만 (post_id 중복 제거)."""
+        wanted = {post_id: src for post_id, src in items if post_id and src and src != "unknown"}
+        if not wanted:
+            return []
+        placeholders = ",".join("?" * len(wanted))
+        cached = {
+            post_id for (post_id,) in self.conn.execute(
+                f"SELECT post_id FROM thumbs WHERE post_id IN ({placeholders})", list(wanted)
+            )
+        }
+        return [(post_id, src) for post_id, src in wanted.items() if post_id not in cached]
+
+    def _download(self, src):
+        """워커 스레드에서 실행: 원본 바이트를 받아 리사이즈합니다. 반환 (jpeg 바이트, 원본 크기)."""
+        response = self.session.get(src, timeout=self.timeout)
+        response.raise_for_status()
+        return resize_jpeg(response.content, self.size, self.quality), len(response.content)
+
+    async def _fetch_all(self, items):
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def fetch(post_id, src):
+            async with semaphore:
+                try:
+                    return post_id, src, *(await asyncio.to_thread(self._download, src)), None
+                except Exception as exc:
+                    return post_id, src, None, 0, exc
+
+        for task in asyncio.as_completed([fetch(post_id, src) for post_id, src in items]):
+            post_id, src, data, original_bytes, error = await task
+            if error is not None:
+                self.stats["failed"] += 1
+                print(f"⚠️ 썸네일 조회 실패: {post_id} — {error}")
+                continue
+            self._store(post_id, src, data)
+            self.stats["fetched"]        += 1
+            self.stats["original_bytes"] += original_bytes
+            self.stats["stored_bytes"]   += len(data)
+
+    def fetch(self, items) -> Counter:
+        """[(post_id, img_src)] 중 캐시에 없는 것만 받아 저장하고, 상한을 넘으면 정리합니다."""
+        started    = time.monotonic()
+        todo       = self.missing(items)
+        self.stats = Counter(skipped=len(items) - len(todo))
+
+        if todo:
+            asyncio.run(self._fetch_all(todo))
+            self.evict()
+
+        print(
+            f"[썸네일] 신규 {self.stats['fetched']} / 실패 {self.stats['failed']} / 캐시됨 {self.stats['skipped']}"
+            f" / {self.stats['original_bytes'] / 1024:.0f}KB → {self.stats['stored_bytes'] / 1024:.0f}KB"
+            f" / {time.monotonic() - started:.1f}s (동시 {self.concurrency})"
+        )
+        return self.stats
+
+    def fetch_posts(self, posts) -> Counter:
+        """collect 결과 튜플 리스트 (post_id, insta_id, insta_name, full_link, img_src, ...)를 받습니다."""
+        return self.fetch([(post[0], post[4]) for post in posts])
+
+    # ── 저장 / 정리 ──────────────────────────────────────────────
+
+    def _store(self, post_id, src, data):
+        digest = hashlib.sha256(data).hexdigest()
+        path   = thumbnail_path(self.root, digest)
+        now    = time.time()
+
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{digest}.")
+            with os.fdopen(fd, "wb") as file:
+                file.write(data)
+            os.replace(tmp_path, path)
+        else:
+            self.stats["deduplicated"] += 1
+
+        self.conn.execute(
+            "INSERT INTO blobs (digest, bytes, last_seen) VALUES (?, ?, ?)"
+            " ON CONFLICT(digest) DO UPDATE SET last_seen = excluded.last_seen",
+            (digest, len(data), now),
+        )
+        self.conn.execute(
+            "INSERT OR REPLACE INTO thumbs (post_id, digest, src, fetched_at) VALUES (?, ?, ?, ?)",
+            (post_id, digest, src, now),
+        )
+        return digest
+
+    def evict(self):
+        """전체 크기가 max_bytes를 넘으면 마지막 참조가 오래된 이미지부터 max_bytes의 90%까지 지웁니다."""
+        (total,) = self.conn.execute("SELECT COALESCE(SUM(bytes), 0) FROM blobs").fetchone()
+        if total <= self.max_bytes:
+            return
+
+        target = int(self.max_bytes * 0.9)
+        freed  = 0
+        for digest, size in self.conn.execute(
+            "SELECT digest, bytes FROM blobs ORDER BY last_seen"
+        ).fetchall():
+            if total - freed <= target:
+                break
+            thumbnail_path(self.root, digest).unlink(missing_ok=True)
+            self.conn.execute("DELETE FROM thumbs WHERE digest = ?", (digest,))
+            self.conn.execute("DELETE FROM blobs WHERE digest = ?", (digest,))
+            freed += size
+            self.stats["evicted"] += 1
+
+        print(f"[썸네일] 정리: {self.stats['evicted']}개 / {freed / 1024 / 1024:.1f}MB 삭제 (상한 {self.max_bytes / 1024 / 1024:.0f}MB)")
+
+    def close(self):
+        self.session.close()
+        self.conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="수집 파일의 img_src로 썸네일 캐시 채우기")
+    parser.add_argument("file_paths", nargs="+", help="extract 태스크가 만든 Parquet 파일 (예전 CSV도 가능)")
+    parser.add_argument("--root", default=DEFAULT_THUMB_DIR, help="썸네일 저장 디렉터리")
+    parser.add_argument("--concurrency", type=int, default=8, help="동시 요청 수")
+    args = parser.parse_args()
+
+    items = []
+    for file_path in args.file_paths:
+        if file_path.endswith(".parquet"):
+            items.extend(duckdb.execute("SELECT post_id, img_src FROM read_parquet(?)", [file_path]).fetchall())
+            continue
+        with open(file_path, encoding="utf-8-sig", newline="") as file:
+            items.extend((row["post_id"], row["img_src"]) for row in csv.DictReader(file))
+
+    cache = ThumbnailCache(args.root, concurrency=args.concurrency)
+    try:
+        cache.fetch(items)
+    finally:
+        cache.close()
+
+
+if __name__ == "__main__":
+    main()
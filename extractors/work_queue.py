@@ -0,0 +1,215 @@
+"""
+work_queue.py
+
+병렬 수집(parallel_extract.py)에서 코디네이터와 워커 프로세스들이 나눠 쓰는 상세 URL 작업 큐입니다.
+
+로컬 SQLite 파일 하나에 URL 하나당 한 행을 두고, 프로세스마다 자기 연결로 트랜잭션을 겁니다.
+파일로 남으므로 태스크가 재시도되면 끝난 URL의 결과는 그대로 두고 남은 것만 다시 처리합니다.
+
+  - seq      : 그리드 등장 순서 (INTEGER PRIMARY KEY). 결과 병합·연속 판단은 이 순서로
+  - 샤드     : seq % 워커 수가 자기 번호인 항목을 먼저 가져가고, 없으면 다른 샤드 항목을 가져감 (스틸)
+  - 리스     : 가져간 항목은 lease_sec 동안 그 워커 소유. 워커가 죽거나 멈춰 리스가 지나면
+               한가한 워커가 다시 가져감 (늦게 끝난 원래 워커의 결과는 버림)
+  - 재시도   : 실패는 retry_delay_sec × 시도 횟수 뒤에 다시 대기열로, max_attempts번 실패하면 dead
+  - 상태     : pending → running → done / dead, 수집 조기 종료 시 남은 것은 cancelled
+"""
+
+import json
+import sqlite3
+import time
+from collections import Counter
+from pathlib import Path
+
+
+class WorkQueue:
+    """SQLite 기반 상세 URL 작업 큐 (샤드 + 스틸 + 리스 + 재시도)."""
+
+    def __init__(self, path, lease_sec=90, max_attempts=3, retry_delay_sec=5):
+        self.path            = Path(path)
+        self.lease_sec       = lease_sec
+        self.max_attempts    = max_attempts
+        self.retry_delay_sec = retry_delay_sec
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS items (
+                seq          INTEGER PRIMARY KEY,
+                url          TEXT NOT NULL UNIQUE,
+                status       TEXT NOT NULL DEFAULT 'pending',
+                attempts     INTEGER NOT NULL DEFAULT 0,
+                owner        TEXT,
+                lease_until  REAL NOT NULL DEFAULT 0,
+                available_at REAL NOT NULL DEFAULT 0,
+                stolen       INTEGER NOT NULL DEFAULT 0,
+                result       TEXT,
+                error        TEXT
+            )
+            """
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS items_status ON items (status, available_at)")
+        self.conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+
+    # ── 코디네이터 쪽 ────────────────────────────────────────────
+
+    def add(self, url, result=None) -> bool:
+        """URL을 큐 끝에 넣습니다. result를 주면 워커 없이 바로 done (이미 적재된 게시물 등). 새로 넣었으면 True."""
+        if result is None:
+            cursor = self.conn.execute("INSERT OR IGNORE INTO items (url) VALUES (?)", (url,))
+        else:
+            cursor = self.conn.execute(
+                "INSERT OR IGNORE INTO items (url, status, result) VALUES (?, 'done', ?)",
+                (url, json.dumps(result, ensure_ascii=False)),
+            )
+        return cursor.rowcount > 0
+
+    def set_meta(self, key, value):
+        self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, json.dumps(value)))
+
+    def get_meta(self, key, default=None):
+        row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def reopen(self):
+        """
+        재시도 시작: 이전 시도의 종료 표시를 지우고, 조기 종료로 취소한 항목과
+        이전 워커가 처리 중이던 항목은 다시 대기열로 (끝난 항목은 그대로).
+        """
+        self.conn.execute("DELETE FROM meta WHERE key IN ('discovery_done', 'stop_seq', 'abort')")
+        self.conn.execute(
+            "UPDATE items SET status = 'pending', owner = NULL WHERE status IN ('cancelled', 'running')"
+        )
+
+    def cancel_after(self, seq) -> int:
+        """조기 종료: seq 뒤의 아직 끝나지 않은 항목을 취소합니다. (처리 중인 것은 결과만 버려짐)"""
+        self.set_meta("stop_seq", seq)
+        cursor = self.conn.execute(
+            "UPDATE items SET status = 'cancelled' WHERE seq > ? AND status IN ('pending', 'running')", (seq,)
+        )
+        return cursor.rowcount
+
+    def results_from(self, seq):
+        """seq부터 순서대로 끝난(done/dead) 항목을 돌려주다가, 처음 끝나지 않은 항목에서 멈춥니다."""
+        rows = []
+        for item_seq, url, status, result in self.conn.execute(
+            "SELECT seq, url, status, result FROM items WHERE seq >= ? ORDER BY seq", (seq,)
+        ):
+            if status not in ("done", "dead"):
+                break
+            rows.append((item_seq, url, json.loads(result) if result else None))
+        return rows
+
+    def drained(self) -> bool:
+        (left,) = self.conn.execute(
+            "SELECT COUNT(*) FROM items WHERE status IN ('pending', 'running')"
+        ).fetchone()
+        return left == 0
+
+    def progress(self) -> Counter:
+        return Counter(dict(self.conn.execute("SELECT status, COUNT(*) FROM items GROUP BY status").fetchall()))
+
+    def worker_stats(self) -> dict:
+        """{워커: Counter(done, stolen, retried)} — 항목을 마지막으로 끝낸 워커 기준."""
+        stats = {}
+        for owner, done, stolen, retried in self.conn.execute(
+            """
+            SELECT owner, COUNT(*), SUM(stolen), SUM(attempts > 1)
+            FROM items WHERE status IN ('done', 'dead') AND owner IS NOT NULL
+            GROUP BY owner ORDER BY owner
+            """
+        ):
+            stats[owner] = Counter(done=done, stolen=stolen or 0, retried=retried or 0)
+        return stats
+
+    # ── 워커 쪽 ──────────────────────────────────────────────────
+
+    def claim(self, worker, index, workers, limit=1):
+        """
+        처리할 항목을 최대 limit개 가져갑니다. 반환 [(seq, url)].
+        자기 샤드 → 다른 샤드 대기 항목 → 리스가 지난 처리 중 항목 순서로 고릅니다.
+        """
+        now = time.time()
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            rows = self.conn.execute(
+                """
+                SELECT seq, url, status FROM items
+                WHERE (status = 'pending' AND available_at <= :now)
+                   OR (status = 'running' AND lease_until < :now)
+                ORDER BY status = 'running', seq % :workers != :index, seq
+                LIMIT :limit
+                """,
+                {"now": now, "workers": workers, "index": index, "limit": limit},
+            ).fetchall()
+            for seq, _, status in rows:
+                stolen = status == "running" or seq % workers != index
+                self.conn.execute(
+                    """
+                    UPDATE items SET status = 'running', owner = ?, lease_until = ?,
+                                     attempts = attempts + 1, stolen = ?
+                    WHERE seq = ?
+                    """,
+                    (worker, now + self.lease_sec, int(stolen), seq),
+                )
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+        return [(seq, url) for seq, url, _ in rows]
+
+    def complete(self, seq, worker, result) -> bool:
+        """결과를 기록합니다. 그사이 리스가 넘어갔거나 취소됐으면 False (결과 버림)."""
+        cursor = self.conn.execute(
+            "UPDATE items SET status = 'done', result = ?, error = NULL"
+            " WHERE seq = ? AND owner = ? AND status = 'running'",
+            (json.dumps(result, ensure_ascii=False), seq, worker),
+        )
+        return cursor.rowcount > 0
+
+    def fail(self, seq, worker, error, result=None) -> str:
+        """
+        실패를 기록합니다. 시도가 남았으면 지연 후 다시 대기열로("retry"),
+        max_attempts번 실패했으면 마지막 result와 함께 "dead". 리스를 잃었으면 "lost".
+        """
+        # claim과 같은 트랜잭션 안에서 확인·갱신해야 그사이 다른 워커가 가져간 리스를 덮어쓰지 않음
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = self.conn.execute(
+                "SELECT attempts FROM items WHERE seq = ? AND owner = ? AND status = 'running'", (seq, worker)
+            ).fetchone()
+            if row is None:
+                outcome = "lost"
+            elif row[0] >= self.max_attempts:
+                self.conn.execute(
+                    "UPDATE items SET status = 'dead', error = ?, result = ? WHERE seq = ?",
+                    (str(error), json.dumps(result, ensure_ascii=False) if result else None, seq),
+                )
+                outcome = "dead"
+            else:
+                self.conn.execute(
+                    "UPDATE items SET status = 'pending', error = ?, available_at = ? WHERE seq = ?",
+                    (str(error), time.time() + self.retry_delay_sec * row[0], seq),
+                )
+                outcome = "retry"
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+        return outcome
+
+    def finished(self) -> bool:
+        """워커 종료 조건: 코디네이터가 발견을 끝냈고 남은 항목이 없음."""
+        return bool(self.get_meta("discovery_done")) and self.drained()
+
+    # ── 정리 ─────────────────────────────────────────────────────
+
+    def close(self):
+        self.conn.close()
+
+    def clear(self):
+        """결과를 다른 곳에 옮긴 뒤 큐 파일을 지웁니다."""
+        self.close()
+        for suffix in ("", "-wal", "-shm"):
+            Path(f"{self.path}{suffix}").unlink(missing_ok=True)
@@ -1,7 +1,7 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from routers import brands, co_brands, freshness, taggers
+from routers import brands, co_brands, freshness, taggers, thumbnails
 
 app = FastAPI(title="TagScope API")
 
@@ -16,6 +16,7 @@ app.include_router(brands.router)
 app.include_router(freshness.router)
 app.include_router(taggers.router)
 app.include_router(co_brands.router)
+app.include_router(thumbnails.router)
 
 
 @app.get("/health")
@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import re
+
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import FileResponse, RedirectResponse
+
+from services.thumbnail_store import find_digest, thumbnail_file
+
+router = APIRouter(prefix="/api/thumbnails", tags=["thumbnails"])
+
+_DIGEST_RE = re.compile(r"^[0-9a-f]{64}$")
+
+# 파일 이름이 내용의 sha256이라 같은 URL의 내용은 바뀌지 않음 → 1년 + immutable
+_IMMUTABLE_CACHE = "public, max-age=31536000, immutable"
+# post_id → digest 매핑은 썸네일이 다시 받아지면 바뀔 수 있으므로 짧게
+_LOOKUP_CACHE = "public, max-age=3600"
+
+
+@router.get("/post/{post_id}")
+def get_post_thumbnail(post_id: str) -> RedirectResponse:
+    digest = find_digest(post_id)
+    if digest is None:
+        raise HTTPException(status_code=404, detail="thumbnail not cached")
+    return RedirectResponse(
+        f"{router.prefix}/{digest}.jpg",
+        status_code=302,
+        headers={"Cache-Control": _LOOKUP_CACHE},
+    )
+
+
+@router.get("/{digest}.jpg")
+def get_thumbnail(digest: str) -> FileResponse:
+    if not _DIGEST_RE.match(digest):
+        raise HTTPException(status_code=404, detail="thumbnail not found")
+
+    path = thumbnail_file(digest)
+    if not path.exists():
+        raise HTTPException(status_code=404, detail="thumbnail not found")
+
+    return FileResponse(
+        path,
+        media_type="image/jpeg",
+        headers={"Cache-Control": _IMMUTABLE_CACHE, "ETag": f'"{digest}"'},
+    )
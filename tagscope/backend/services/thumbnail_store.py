@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+import os
+import sqlite3
+from pathlib import Path
+
+# extractors/thumbnail_cache.py가 채우는 디렉터리 ({digest[:2]}/{digest}.jpg + index.sqlite)
+# 수집 쪽과 같은 환경변수 THUMBNAIL_DIR를 읽음
+THUMBNAIL_DIR = os.getenv("THUMBNAIL_DIR", "/opt/airflow/data/thumbnails")
+
+
+def thumbnail_file(digest: str) -> Path:
+    return Path(THUMBNAIL_DIR) / digest[:2] / f"{digest}.jpg"
+
+
+def find_digest(post_id: str) -> str | None:
+    index_path = Path(THUMBNAIL_DIR) / "index.sqlite"
+    if not index_path.exists():
+        return None
+
+    conn = sqlite3.connect(f"file:{index_path}?mode=ro", uri=True)
+    try:
+        row = conn.execute("SELECT digest FROM thumbs WHERE post_id = ?", (post_id,)).fetchone()
+        return row[0] if row else None
+    finally:
+        conn.close()
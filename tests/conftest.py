@@ -0,0 +1,72 @@
+"""
+테스트 공용 fixture.
+
+local_server: 실제 Instagram·CDN 대신 쓰는 로컬 HTTP 서버입니다.
+  server.route(path, body, content_type=..., status=200, delay=0)로 응답을 등록하고
+  server.url(path)로 주소를 얻습니다. 등록하지 않은 경로는 404.
+"""
+
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+
+FIXTURE_DIR = Path(__file__).resolve().parent / "fixtures"
+
+
+class LocalServer:
+    def __init__(self):
+        self.routes   = {}   # {path: (status, content_type, body, delay)}
+        self.requests = []   # 받은 요청 경로 (순서대로)
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                server.requests.append(self.path)
+                status, content_type, body, delay = server.routes.get(
+                    self.path.split("?", 1)[0], (404, "text/plain", b"not found", 0)
+                )
+                if delay:
+                    time.sleep(delay)
+                try:
+                    self.send_response(status)
+                    self.send_header("Content-Type", content_type)
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+                except (BrokenPipeError, ConnectionResetError):
+                    pass  # 클라이언트가 타임아웃으로 먼저 끊은 경우
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd  = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.httpd.daemon_threads = True
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    def route(self, path, body, content_type="application/json", status=200, delay=0):
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        self.routes[path] = (status, content_type, body, delay)
+
+    def url(self, path="/"):
+        host, port = self.httpd.server_address
+        return f"http://{host}:{port}{path}"
+
+    def hits(self, path) -> int:
+        return sum(1 for requested in self.requests if requested.split("?", 1)[0] == path)
+
+
+@pytest.fixture
+def local_server():
+    server = LocalServer()
+    server.thread.start()
+    try:
+        yield server
+    finally:
+        server.httpd.shutdown()
+        server.httpd.server_close()
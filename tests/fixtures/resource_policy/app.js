@@ -0,0 +1,7 @@
+// SPA 번들 대신: 게시 시각 <time>을 스크립트가 그려 넣음 (스크립트가 막히지 않아야 날짜를 읽을 수 있음)
+document.addEventListener("DOMContentLoaded", () => {
+  const time = document.createElement("time");
+  time.setAttribute("datetime", "2026-01-08T03:00:00.000Z");
+  time.textContent = "January 8, 2026";
+  document.getElementById("post-meta").appendChild(time);
+});
@@ -0,0 +1 @@
+window.fbq = function () {};
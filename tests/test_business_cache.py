@@ -0,0 +1,54 @@
+"""
+business_cache: 여러 브랜드 태스크(프로세스)가 동시에 save()해도 서로의 판정이 사라지지 않는지 확인합니다.
+"""
+
+import json
+import multiprocessing
+
+from extractors.business_cache import BusinessVerdictStore
+
+
+def save_verdicts(path, worker, count, rounds):
+    store = BusinessVerdictStore(path)
+    for round_index in range(rounds):
+        store.preload()
+        for index in range(count):
+            store.put(f"w{worker}_r{round_index}_{index}", is_business=index % 2 == 0)
+        store.save()
+
+
+def test_concurrent_saves_keep_every_verdict(tmp_path):
+    path    = tmp_path / "business_account_cache.json"
+    workers = 6
+    rounds  = 5
+    count   = 20
+
+    processes = [
+        multiprocessing.Process(target=save_verdicts, args=(str(path), worker, count, rounds))
+        for worker in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join(timeout=60)
+        assert process.exitcode == 0
+
+    saved = json.loads(path.read_text(encoding="utf-8"))
+    assert len(saved) == workers * rounds * count
+    assert saved["w0_r0_0"]["is_business"] is True
+    assert saved["w5_r4_1"]["is_business"] is False
+
+
+def test_newer_verdict_wins(tmp_path):
+    path = tmp_path / "business_account_cache.json"
+
+    older = BusinessVerdictStore(path)
+    newer = BusinessVerdictStore(path)
+    newer.put("shop.account", is_business=True)
+    older.put("shop.account", is_business=False)
+    older.entries["shop.account"]["checked_at"] -= 60
+
+    newer.save()
+    older.save()
+
+    assert BusinessVerdictStore(path).preload() == {"shop.account": True}
@@ -0,0 +1,164 @@
+"""
+network_harvest: 로컬 서버에 녹화한 tagged 그리드 JSON 응답(tests/fixtures/network_harvest)을 올리고
+Chromium 페이지가 fetch로 받게 해서, attach(page) → response 이벤트 → drain()을 거친 레코드가
+기존 10컬럼 수집 튜플에 들어갈 값으로 해석되는지 확인합니다.
+
+  tagged_grid.html      : 스크롤마다 피드를 fetch하는 그리드 페이지 (마커 밖 요청·비 fetch 요청 포함)
+  usertags_feed_v1.json : api/v1 usertags 피드 (일반·캐러셀·태그 정보 없는 게시물)
+  usertags_graphql.json : GraphQL edge 형식 (api/v1에서 빠진 태그를 채우는 응답 포함)
+
+Chromium이 설치되지 않은 환경에서는 건너뜁니다 (python -m playwright install chromium).
+"""
+
+from datetime import timedelta, timezone
+
+import pytest
+from playwright.sync_api import Error as PlaywrightError, sync_playwright
+
+from extractors.instagram_scraper import harvested_result, resolve_date_window
+from extractors.network_harvest import (
+    NetworkPostHarvester,
+    missing_fields,
+    record_post_date,
+    record_to_post_data,
+)
+from conftest import FIXTURE_DIR
+
+
+KST       = timezone(timedelta(hours=9))
+GRID_HREF = "/sample.brand/tagged/"
+FEED_V1   = "/api/v1/usertags/1234567890/feed/"
+GRAPHQL   = "/graphql/query"
+
+
+@pytest.fixture(scope="module")
+def browser():
+    with sync_playwright() as playwright:
+        try:
+            browser = playwright.chromium.launch()
+        except PlaywrightError as exc:
+            pytest.skip(f"Chromium 실행 불가: {str(exc).splitlines()[0]}")
+        try:
+            yield browser
+        finally:
+            browser.close()
+
+
+@pytest.fixture
+def grid(browser, local_server):
+    """그리드 페이지를 열고 하베스터를 붙인 (page, harvester)를 돌려줍니다."""
+    fixture_dir = FIXTURE_DIR / "network_harvest"
+    local_server.route(GRID_HREF, (fixture_dir / "tagged_grid.html").read_bytes(), content_type="text/html; charset=utf-8")
+    local_server.route("/api/v1/web/bootstrap.js", b"window.__bootstrap = true;", content_type="text/javascript")
+    local_server.route("/static/config.json", b'{"items": []}')
+    local_server.route(FEED_V1, (fixture_dir / "usertags_feed_v1.json").read_bytes())
+    local_server.route(GRAPHQL, (fixture_dir / "usertags_graphql.json").read_bytes())
+
+    context = browser.new_context()
+    try:
+        page      = context.new_page()
+        harvester = NetworkPostHarvester().attach(page)
+        with page.expect_response(lambda response: "/static/config.json" in response.url):
+            page.goto(local_server.url(GRID_HREF), wait_until="load")
+        yield page, harvester
+    finally:
+        context.close()
+
+
+def scroll(grid, path) -> int:
+    """페이지가 path를 fetch하게 하고 (그리드 스크롤 1회), 응답 이벤트가 들어온 뒤 drain() 결과를 돌려줍니다."""
+    page, harvester = grid
+    with page.expect_response(lambda response: path in response.url):
+        page.evaluate("path => loadMore(path)", path)
+    return harvester.drain()
+
+
+def test_feed_v1_parses_posts(grid):
+    _, harvester = grid
+
+    assert scroll(grid, FEED_V1) == 3
+    # 페이지 로드 때의 <script>(마커 일치)와 /static/config.json(마커 불일치)은 모으지 않음
+    assert harvester.response_cnt == 1
+    assert harvester.parse_fail == 0
+
+    record = harvester.lookup("DAbc123xyz1")
+    assert missing_fields(record) == []
+    assert record_post_date(record, KST) == "2026-01-08"
+    assert record_to_post_data(record) == (
+        "DAbc123xyz1",
+        "sample.user",
+        "샘플 사용자",
+        "https://www.instagram.com/p/DAbc123xyz1/",
+        "https://scontent.example.invalid/v/t51.29350-15/1001_n.jpg?stp=dst-jpg_e35&oh=00_sanitized",
+        "@amomento.co,@friend_one",
+        2,
+    )
+
+
+def test_carousel_and_kst_day_boundary(grid):
+    _, harvester = grid
+    scroll(grid, FEED_V1)
+
+    record = harvester.lookup("DAbc123xyz2")
+    # UTC 2026-01-08 15:30 → KST 2026-01-09 00:30
+    assert record_post_date(record, KST) == "2026-01-09"
+
+    post_id, insta_id, insta_name, _, img_src, tags, tags_cnt = record_to_post_data(record)
+    assert (post_id, insta_id, insta_name) == ("DAbc123xyz2", "carousel_user", "unknown")
+    assert img_src.endswith("/1002_n.jpg?stp=dst-jpg_e35&oh=00_sanitized")
+    assert (tags, tags_cnt) == ("", 0)
+
+
+def test_missing_tags_filled_by_later_response(grid):
+    _, harvester = grid
+    scroll(grid, FEED_V1)
+
+    # api/v1 응답에는 태그 정보 키가 없음 → 상세 페이지로 넘겨야 하는 게시물
+    assert missing_fields(harvester.lookup("DAbc123xyz3")) == ["tagged_ids"]
+
+    # GraphQL 응답: 새 게시물 1개 + 기존 게시물의 빈 필드 채움
+    assert scroll(grid, f"{GRAPHQL}?doc_id=1234&variables=%7B%7D") == 1
+    assert harvester.response_cnt == 2
+
+    record = harvester.lookup("DAbc123xyz3")
+    assert missing_fields(record) == []
+    assert record["tagged_ids"] == ["late_tag"]
+    assert record["insta_name"] == "태그 정보 없음"
+    assert record_post_date(record, KST) == "2026-01-07"
+
+    graph_record = harvester.lookup("DAbc123xyz4")
+    assert record_post_date(graph_record, KST) == "2026-01-09"
+    assert record_to_post_data(graph_record)[1:3] == ("graph_user", "unknown")
+    assert record_to_post_data(graph_record)[5:] == ("@amomento.co", 1)
+
+
+def test_drain_is_empty_without_new_responses(grid):
+    _, harvester = grid
+    scroll(grid, FEED_V1)
+
+    # 이미 비운 뒤라 다시 부르면 0, 같은 응답을 다시 받아도 새 레코드는 없음
+    assert harvester.drain() == 0
+    assert scroll(grid, FEED_V1) == 0
+    assert len(harvester.records) == 3
+
+
+def test_harvested_result_classifies_against_window(grid):
+    _, harvester = grid
+    scroll(grid, FEED_V1)
+    scroll(grid, GRAPHQL)
+    window = resolve_date_window(target_day="2026-01-08")
+
+    kinds = {
+        shortcode: harvested_result(harvester.lookup(shortcode), KST, window)["kind"]
+        for shortcode in ("DAbc123xyz1", "DAbc123xyz2", "DAbc123xyz3", "DAbc123xyz4")
+    }
+    assert kinds == {
+        "DAbc123xyz1": "candidate",
+        "DAbc123xyz2": "other_day",
+        "DAbc123xyz3": "past",
+        "DAbc123xyz4": "other_day",
+    }
+
+    result = harvested_result(harvester.lookup("DAbc123xyz1"), KST, window)
+    assert result["post_date"] == "2026-01-08"
+    assert result["post_data"][0] == "DAbc123xyz1"
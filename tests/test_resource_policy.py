@@ -0,0 +1,108 @@
+"""
+resource_policy: 로컬 서버의 게시물 상세 페이지(tests/fixtures/resource_policy)에 정책을 걸고
+이미지·동영상·폰트·트래커가 막혀도 상세 추출(read_detail_snapshot)이 같은 값을 돌려주는지 확인합니다.
+
+Chromium이 설치되지 않은 환경에서는 건너뜁니다 (python -m playwright install chromium).
+"""
+
+import io
+from datetime import timedelta, timezone
+
+import pytest
+from PIL import Image
+from playwright.sync_api import Error as PlaywrightError, sync_playwright
+
+from extractors.instagram_scraper import read_detail_snapshot, snapshot_post_data, snapshot_post_date
+from extractors.resource_policy import ResourcePolicy
+from conftest import FIXTURE_DIR
+
+
+KST       = timezone(timedelta(hours=9))
+POST_HREF = "/sample.user/p/DAbc123xyz1/"
+HEAVY     = ("/static/media/1001_n.jpg", "/static/media/profile_pic.jpg", "/connect.facebook.net/en_US/fbevents.js")
+
+EXPECTED_POST = (
+    "DAbc123xyz1",
+    "sample.user",
+    "샘플 사용자",
+    "https://www.instagram.com/sample.user/p/DAbc123xyz1/",
+    "https://scontent.example.invalid/v/t51.29350-15/1001_n.jpg?stp=dst-jpg_e35&oh=00_sanitized",
+    "@amomento.co,@friend_one",
+    2,
+)
+
+
+@pytest.fixture(scope="module")
+def browser():
+    with sync_playwright() as playwright:
+        try:
+            browser = playwright.chromium.launch()
+        except PlaywrightError as exc:
+            pytest.skip(f"Chromium 실행 불가: {str(exc).splitlines()[0]}")
+        try:
+            yield browser
+        finally:
+            browser.close()
+
+
+@pytest.fixture
+def post_page_server(local_server):
+    fixture_dir = FIXTURE_DIR / "resource_policy"
+    jpeg        = io.BytesIO()
+    Image.new("RGB", (1080, 1350), (10, 20, 30)).save(jpeg, format="JPEG")
+
+    local_server.route(POST_HREF, (fixture_dir / "post_detail.html").read_bytes(), content_type="text/html; charset=utf-8")
+    local_server.route("/static/app.js", (fixture_dir / "app.js").read_bytes(), content_type="text/javascript")
+    local_server.route(HEAVY[2], (fixture_dir / "fbevents.js").read_bytes(), content_type="text/javascript")
+    local_server.route(HEAVY[0], jpeg.getvalue(), content_type="image/jpeg")
+    local_server.route(HEAVY[1], jpeg.getvalue(), content_type="image/jpeg")
+    local_server.route("/static/media/clip.mp4", b"\x00" * 4096, content_type="video/mp4")
+    local_server.route("/static/fonts/ig_sans.woff2", b"\x00" * 4096, content_type="font/woff2")
+    return local_server
+
+
+def extract(browser, server, policy=None):
+    context = browser.new_context()
+    try:
+        if policy is not None:
+            policy.attach(context)
+        page = context.new_page()
+        if policy is not None:
+            policy.assign(page, "detail")
+        page.goto(server.url(POST_HREF), wait_until="load")
+        page.wait_for_selector("time", state="attached", timeout=5000)
+        snapshot = read_detail_snapshot(page)
+        return snapshot_post_date(snapshot, KST), snapshot_post_data(snapshot, POST_HREF)
+    finally:
+        context.close()
+
+
+def test_extraction_without_policy(browser, post_page_server):
+    assert extract(browser, post_page_server) == ("2026-01-08", EXPECTED_POST)
+    assert post_page_server.hits(HEAVY[0]) == 1
+
+
+def test_block_policy_keeps_extraction(browser, post_page_server):
+    policy = ResourcePolicy(mode="block")
+
+    assert extract(browser, post_page_server, policy) == ("2026-01-08", EXPECTED_POST)
+
+    # 무거운 리소스는 서버까지 가지 않고, 페이지 스크립트는 그대로 실행됨
+    for path in HEAVY:
+        assert post_page_server.hits(path) == 0, path
+    assert post_page_server.hits("/static/app.js") == 1
+
+    assert policy.blocked[("detail", "image")] >= 2
+    assert policy.blocked[("detail", "tracker")] == 1
+    assert policy.allowed["detail"] >= 2  # 문서 + app.js
+    assert any(line.startswith("detail") and "크기 미집계" in line for line in policy.summary_lines())
+
+
+def test_measure_policy_counts_without_blocking(browser, post_page_server):
+    policy = ResourcePolicy(mode="measure")
+
+    assert extract(browser, post_page_server, policy) == ("2026-01-08", EXPECTED_POST)
+
+    assert post_page_server.hits(HEAVY[0]) == 1
+    assert policy.blocked[("detail", "image")] >= 2
+    assert policy.saved_bytes["detail"] > 0
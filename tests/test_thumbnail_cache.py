@@ -0,0 +1,123 @@
+"""
+thumbnail_cache + TagScope 썸네일 라우트: 로컬 이미지 서버를 CDN 대신 써서
+받기 → 캐시 재사용, 404·타임아웃 처리, 백엔드의 post_id → digest 조회와 서빙을 확인합니다.
+"""
+
+import hashlib
+import io
+from pathlib import Path
+
+import pytest
+from PIL import Image
+
+from extractors.thumbnail_cache import ThumbnailCache, thumbnail_path
+
+
+BACKEND_DIR = Path(__file__).resolve().parents[1] / "tagscope" / "backend"
+
+
+def make_jpeg(width=800, height=600) -> bytes:
+    buffer = io.BytesIO()
+    Image.new("RGB", (width, height), (200, 120, 40)).save(buffer, format="JPEG")
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = ThumbnailCache(tmp_path / "thumbs", size=320, concurrency=4, timeout=1)
+    try:
+        yield cache
+    finally:
+        cache.close()
+
+
+def test_download_then_served_from_cache(local_server, cache):
+    local_server.route("/img/a.jpg", make_jpeg(), content_type="image/jpeg")
+    items = [("POST_A", local_server.url("/img/a.jpg?stp=dst-jpg&oh=sig"))]
+
+    stats = cache.fetch(items)
+    assert (stats["fetched"], stats["failed"]) == (1, 0)
+
+    (digest,) = cache.conn.execute("SELECT digest FROM thumbs WHERE post_id = 'POST_A'").fetchone()
+    path = thumbnail_path(cache.root, digest)
+    assert hashlib.sha256(path.read_bytes()).hexdigest() == digest
+    with Image.open(path) as image:
+        assert max(image.size) == 320
+
+    # 두 번째 실행은 CDN을 다시 치지 않음
+    stats = cache.fetch(items)
+    assert (stats["fetched"], stats["skipped"]) == (0, 1)
+    assert local_server.hits("/img/a.jpg") == 1
+
+
+def test_same_image_stored_once(local_server, cache):
+    body = make_jpeg()
+    local_server.route("/img/a.jpg", body, content_type="image/jpeg")
+    local_server.route("/img/b.jpg", body, content_type="image/jpeg")
+
+    cache.fetch([("POST_A", local_server.url("/img/a.jpg")), ("POST_B", local_server.url("/img/b.jpg"))])
+
+    digests = {digest for (digest,) in cache.conn.execute("SELECT digest FROM thumbs")}
+    assert len(digests) == 1
+    assert cache.stats["deduplicated"] == 1
+
+
+def test_not_found_and_timeout_are_skipped(local_server, cache):
+    local_server.route("/img/ok.jpg", make_jpeg(), content_type="image/jpeg")
+    local_server.route("/img/slow.jpg", make_jpeg(), content_type="image/jpeg", delay=2)
+
+    stats = cache.fetch([
+        ("POST_OK",      local_server.url("/img/ok.jpg")),
+        ("POST_MISSING", local_server.url("/img/missing.jpg")),
+        ("POST_SLOW",    local_server.url("/img/slow.jpg")),
+    ])
+
+    assert (stats["fetched"], stats["failed"]) == (1, 2)
+    cached = {post_id for (post_id,) in cache.conn.execute("SELECT post_id FROM thumbs")}
+    assert cached == {"POST_OK"}
+
+    # 실패한 게시물은 캐시에 없으므로 다음 실행에서 다시 시도
+    assert {post_id for post_id, _ in cache.missing([
+        ("POST_OK",      local_server.url("/img/ok.jpg")),
+        ("POST_MISSING", local_server.url("/img/missing.jpg")),
+    ])} == {"POST_MISSING"}
+
+
+@pytest.fixture
+def backend_client(monkeypatch, cache):
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+
+    monkeypatch.syspath_prepend(str(BACKEND_DIR))
+    from routers import thumbnails
+    from services import thumbnail_store
+
+    monkeypatch.setattr(thumbnail_store, "THUMBNAIL_DIR", str(cache.root))
+    app = FastAPI()
+    app.include_router(thumbnails.router)
+    return TestClient(app)
+
+
+def test_backend_serves_cached_thumbnail_by_digest(local_server, cache, backend_client):
+    local_server.route("/img/a.jpg", make_jpeg(), content_type="image/jpeg")
+    cache.fetch([("POST_A", local_server.url("/img/a.jpg"))])
+
+    from services.thumbnail_store import find_digest
+
+    digest = find_digest("POST_A")
+    assert digest == hashlib.sha256(thumbnail_path(cache.root, digest).read_bytes()).hexdigest()
+    assert find_digest("POST_UNKNOWN") is None
+
+    lookup = backend_client.get("/api/thumbnails/post/POST_A", follow_redirects=False)
+    assert lookup.status_code == 302
+    assert lookup.headers["location"] == f"/api/thumbnails/{digest}.jpg"
+
+    image = backend_client.get(lookup.headers["location"])
+    assert image.status_code == 200
+    assert image.headers["content-type"] == "image/jpeg"
+    assert "immutable" in image.headers["cache-control"]
+    assert hashlib.sha256(image.content).hexdigest() == digest
+
+    assert backend_client.get("/api/thumbnails/post/POST_UNKNOWN").status_code == 404
+    assert backend_client.get(f"/api/thumbnails/{'0' * 64}.jpg").status_code == 404
+    assert backend_client.get("/api/thumbnails/not-a-digest.jpg").status_code == 404